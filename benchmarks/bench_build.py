@@ -0,0 +1,75 @@
+"""
+Index build time: build_index against the former per-word build.
+
+    python -m benchmarks.bench_build [sizes...]   # default: 50000 500000 5000000
+
+Vocabularies beyond words_pl.txt are synthetic inflections (prefix + word +
+suffix), standing in for a full inflected dictionary. Each run is a fresh
+subprocess; reported: wall time and peak RSS.
+    per-word        build_entry per word into WordStore.from_entries (no
+                    batching)
+    build_index     entries normalized a chunk at a time (batched normalize)
+                    and streamed into WordStore.from_entries
+"""
+import os
+import resource
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+PREFIXES = ["", "prze", "po", "za", "wy", "na", "od", "roz", "przy", "do", "nie", "u"]
+SUFFIXES = ["", "ami", "ach", "om", "owi", "em", "ie", "y", "ów", "ą", "ę", "ski", "ska", "nie", "ość", "ek", "ka"]
+
+
+def vocabulary(size: int) -> list:
+    with open(os.path.join(BASE_DIR, "words_pl.txt"), encoding="utf-8") as f:
+        base = [line.strip().lower() for line in f if len(line.strip()) > 2]
+    words = dict.fromkeys(base)
+    for suffix in SUFFIXES:
+        for prefix in PREFIXES:
+            if len(words) >= size:
+                return list(words)[:size]
+            words.update(dict.fromkeys(prefix + w + suffix for w in base))
+    return list(words)[:size]
+
+
+def child(method: str, size: int):
+    from phonetic_engine import PhoneticEngine
+    from word_store import WordStore
+    words = vocabulary(size)
+    engine = PhoneticEngine()
+    t0 = time.perf_counter()
+    if method == "build_index":
+        engine.build_index(words)
+    else:
+        engine.store = WordStore.from_entries(map(engine.build_entry, words))
+    elapsed = time.perf_counter() - t0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{elapsed:.3f} {peak:.0f} {len(engine.word_map)}")
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [50_000, 500_000, 5_000_000]
+    methods = ["per-word", "build_index"]
+    print(f"{'words':>9} {'method':12} {'time':>8} {'peak RSS':>9}")
+    for size in sizes:
+        for method in methods:
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_build", "--child", method, str(size)],
+                cwd=BASE_DIR, capture_output=True, text=True,
+            )
+            if out.returncode:
+                print(f"{size:9d} {method:12} failed: {out.stderr.strip().splitlines()[-1:]}")
+                continue
+            elapsed, peak, n = out.stdout.split()
+            print(f"{int(n):9d} {method:12} {float(elapsed):7.2f}s {float(peak):7.0f}MB")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(sys.argv[2], int(sys.argv[3]))
+    else:
+        main()
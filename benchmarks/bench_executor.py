@@ -0,0 +1,119 @@
+"""
+Latency under concurrency per EXECUTOR_MODE.
+
+    python -m benchmarks.bench_executor [concurrency] [requests_per_client]
+
+Each mode runs in a fresh uvicorn subprocess with result caches and rate
+limiting disabled. `concurrency` clients post word-mode requests for common
+tails (large assonance buckets) while a probe polls the `/` health check; p50/p99
+are reported for both. Inline mode shows the health check queued behind engine
+work; thread/process keep it responsive. On a single core process mode cannot
+add throughput, only isolation.
+"""
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODES = ("inline", "thread", "process")
+TARGETS = ["granie", "kochanie", "śpiewanie", "krowa", "głowa", "domowa", "kawa", "noce", "miasto", "ulica"]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def percentile(values, p):
+    values = sorted(values)
+    if not values:
+        return float("nan")
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+def start_server(mode: str, port: int) -> subprocess.Popen:
+    env = dict(
+        os.environ, EXECUTOR_MODE=mode, RATE_LIMIT_PER_MINUTE=str(10**9),
+        WORD_MODE_CACHE_ENTRIES="0", CANDIDATE_CACHE_ENTRIES="0",
+    )
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "server:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/", timeout=1)
+            return proc
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError(f"server ({mode}) did not start")
+
+
+async def load(port: int, concurrency: int, per_client: int) -> dict:
+    url = f"http://127.0.0.1:{port}"
+    generate, health, rejected = [], [], 0
+    done = asyncio.Event()
+
+    async with httpx.AsyncClient(base_url=url, timeout=60, limits=httpx.Limits(max_connections=concurrency + 2)) as client:
+        for word in TARGETS:  # warm-up (process pool start, page cache)
+            await client.post("/generate", json={"verse": word})
+
+        async def worker(i):
+            nonlocal rejected
+            for j in range(per_client):
+                t0 = time.perf_counter()
+                r = await client.post("/generate", json={"verse": TARGETS[(i + j) % len(TARGETS)]})
+                if r.status_code == 503:
+                    rejected += 1
+                else:
+                    generate.append(time.perf_counter() - t0)
+
+        async def probe():
+            while not done.is_set():
+                t0 = time.perf_counter()
+                await client.get("/")
+                health.append(time.perf_counter() - t0)
+                await asyncio.sleep(0.01)
+
+        prober = asyncio.ensure_future(probe())
+        t0 = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - t0
+        done.set()
+        await prober
+
+    return {
+        "rps": len(generate) / elapsed, "rejected": rejected,
+        "generate": (percentile(generate, 50), percentile(generate, 99)),
+        "health": (percentile(health, 50), percentile(health, 99)),
+    }
+
+
+def main():
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    per_client = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    print(f"{concurrency} clients x {per_client} word-mode requests, {os.cpu_count()} CPU(s)")
+    print(f"{'mode':8} {'req/s':>7} {'503s':>5} {'gen p50':>9} {'gen p99':>9} {'/ p50':>9} {'/ p99':>9}")
+    for mode in MODES:
+        port = free_port()
+        proc = start_server(mode, port)
+        try:
+            res = asyncio.run(load(port, concurrency, per_client))
+        finally:
+            proc.terminate()
+            proc.wait()
+        (g50, g99), (h50, h99) = res["generate"], res["health"]
+        print(f"{mode:8} {res['rps']:7.1f} {res['rejected']:5d} {g50 * 1000:7.1f}ms {g99 * 1000:7.1f}ms "
+              f"{h50 * 1000:7.1f}ms {h99 * 1000:7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
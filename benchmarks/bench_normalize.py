@@ -0,0 +1,73 @@
+"""
+PhoneticEngine.normalize throughput, regex chain vs single pass.
+
+    python -m benchmarks.bench_normalize [repeats]
+
+"chain" is the pre-compilation normalize: ~a dozen sequential regex /
+str.replace passes plus a str.maketrans rebuilt per call. "single" is the
+current one regex scan + one precomputed translate table. Inputs are every
+words_pl.txt entry and every word of lyrics_corrected.txt (what build_index
+and count_syllables feed it); outputs are checked to be identical.
+"""
+import os
+import re
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from phonetic_engine import PhoneticEngine  # noqa: E402
+
+RE_DZI = re.compile(r'dzi')
+RE_DZ_ZH = re.compile(r'dż|rz')
+RE_CH = re.compile(r'ch')
+RE_SOFTEN = {c: re.compile(c + r'(?=[aeąęioóuy])') for c in ('ci', 'si', 'zi', 'ni')}
+RE_NASAL_END_A = re.compile(r'ą$')
+RE_NASAL_END_E = re.compile(r'ę$')
+
+
+def chain_normalize(engine, word):
+    w = word.lower()
+    w = engine.en_digraphs.get(w, w)
+    w = RE_DZI.sub('dź', w)
+    w = RE_DZ_ZH.sub('ż', w)
+    w = RE_CH.sub('h', w)
+    for char, reg in RE_SOFTEN.items():
+        w = reg.sub(char[0] + 'i', w)
+    w = w.replace('ó', 'u').replace('y', 'i')
+    w = RE_NASAL_END_A.sub('om', w)
+    w = RE_NASAL_END_E.sub('em', w)
+    return w.translate(str.maketrans('łńśćźż', 'lnsczz'))
+
+
+def load_words():
+    with open(os.path.join(BASE_DIR, "words_pl.txt"), encoding="utf-8") as f:
+        vocab = [line.strip().lower() for line in f if len(line.strip()) > 2]
+    with open(os.path.join(BASE_DIR, "lyrics_corrected.txt"), encoding="utf-8") as f:
+        lyrics = re.sub(r'[^\w\s]', '', f.read().lower()).split()
+    return vocab, lyrics
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    engine = PhoneticEngine()
+    vocab, lyrics = load_words()
+
+    for name, words in (("words_pl.txt", vocab), ("lyrics words", lyrics)):
+        assert [engine.normalize(w) for w in words] == [chain_normalize(engine, w) for w in words]
+        results = {}
+        for label, fn in (("chain", lambda w: chain_normalize(engine, w)), ("single", engine.normalize)):
+            best = float("inf")
+            for _ in range(repeats):
+                t0 = time.perf_counter()
+                for w in words:
+                    fn(w)
+                best = min(best, time.perf_counter() - t0)
+            results[label] = len(words) / best
+        print(f"{name:13} {len(words):6d} words  chain {results['chain']:10,.0f} w/s  "
+              f"single {results['single']:10,.0f} w/s  ({results['single'] / results['chain']:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
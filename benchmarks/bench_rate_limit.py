@@ -0,0 +1,110 @@
+"""
+Rate limiter cost per request and memory under many distinct client IPs.
+
+    python -m benchmarks.bench_rate_limit [ips] [requests]   # default: 100000 IPs, 300000 requests
+
+Requests arrive over a simulated 5 minutes (the clock is injected), half
+from a 1% "hot" set of IPs and half spread over all of them. Reported per
+limiter: mean cost per request, keys still held at the end, and Python heap
+retained (tracemalloc, separate run).
+    lists     the old middleware: a list of timestamps per IP, filtered on
+              every request and never dropped
+    memory    token buckets in process, idle keys swept every 10s
+    sqlite    token buckets in a WAL SQLite file (what workers share)
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from rate_limiter import MemoryBackend, RateLimiter, SQLiteBackend  # noqa: E402
+
+PER_MINUTE = 30
+DURATION = 300.0  # simulated seconds
+
+
+class ListLimiter:
+    """The per-IP timestamp lists the server used before rate_limiter.py."""
+
+    def __init__(self, per_minute, clock):
+        self.per_minute, self.clock = per_minute, clock
+        self.data = defaultdict(list)
+
+    def allow(self, key):
+        now = self.clock()
+        self.data[key] = [t for t in self.data[key] if t > now - 60]
+        if len(self.data[key]) >= self.per_minute:
+            return 1.0
+        self.data[key].append(now)
+        return 0.0
+
+    def __len__(self):
+        return len(self.data)
+
+
+class Clock:
+    now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make(name, clock, tmp):
+    if name == "lists":
+        return ListLimiter(PER_MINUTE, clock)
+    if name == "memory":
+        return RateLimiter(PER_MINUTE, MemoryBackend(sweep_interval=10), clock=clock)
+    path = os.path.join(tmp, f"bench-{time.monotonic_ns()}.sqlite3")
+    return RateLimiter(PER_MINUTE, SQLiteBackend(path, sweep_interval=10), clock=clock)
+
+
+def traffic(ips: int, requests: int):
+    rng = random.Random(7)
+    hot = max(1, ips // 100)
+    keys = [f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(ips)]
+    return [keys[rng.randrange(hot) if rng.random() < 0.5 else rng.randrange(ips)] for _ in range(requests)]
+
+
+def run(limiter, clock, keys):
+    step = DURATION / len(keys)
+    blocked = 0
+    t0 = time.perf_counter()
+    for i, key in enumerate(keys):
+        clock.now = i * step
+        if limiter.allow(key):
+            blocked += 1
+    return time.perf_counter() - t0, blocked
+
+
+def main():
+    ips = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 300_000
+    keys = traffic(ips, requests)
+    print(f"{ips} IPs, {requests} requests over {DURATION:.0f}s simulated, {PER_MINUTE}/min per IP")
+    print(f"{'limiter':8} {'per req':>9} {'blocked':>8} {'keys held':>10} {'heap':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ("lists", "memory", "sqlite"):
+            clock = Clock()
+            limiter = make(name, clock, tmp)
+            elapsed, blocked = run(limiter, clock, keys)
+            held = len(limiter) if name == "lists" else len(limiter.backend)
+            heap = "-"
+            if name != "sqlite":  # its buckets live in SQLite's page cache, not the Python heap
+                clock = Clock()
+                tracemalloc.start()
+                traced = make(name, clock, tmp)
+                run(traced, clock, keys)
+                heap = f"{tracemalloc.get_traced_memory()[0] / 2**20:.1f}MB"
+                tracemalloc.stop()
+                del traced
+            print(f"{name:8} {elapsed / requests * 1e6:7.2f}us {blocked:8} {held:10} {heap:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+WORD_SCORES load time, memory and lookup cost per format.
+
+    python -m benchmarks.bench_scores [repeats]
+
+Each format loads in a fresh subprocess (the engine is mapped first, as in
+config, and excluded from the numbers). Reported: load wall time and RSS
+growth, Python heap retained (tracemalloc, separate load), then the per-word
+score lookup as the server does it for every candidate:
+    json      json.load of word_scores.json into ~54k dicts; lookup is
+              the old word_meta: dict get + isinstance + .get("s")
+    columns   ScoreTable.from_scores: the JSON parsed once into float32 /
+              bitmask columns by word id; lookup is scores.score(wid)
+    mapped    ScoreTable over word_scores.bin (mmap); same lookup, and the
+              pages are shared by every worker on the host
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+FORMATS = ("json", "columns", "mapped")
+
+
+def rss_kb() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def child(fmt: str, repeats: int):
+    from phonetic_index import file_digest, load_engine
+    from score_store import ScoreTable, compile_scores
+
+    scores_path = os.path.join(BASE_DIR, "word_scores.json")
+    vocab_path = os.path.join(BASE_DIR, "words_pl.txt")
+    table_path = os.path.join(BASE_DIR, "word_scores.bin")
+    engine = load_engine(os.path.join(BASE_DIR, "phonetic_index.bin"), file_digest(vocab_path))
+    if fmt == "mapped":
+        compile_scores(scores_path, vocab_path, table_path)
+    words = list(engine.word_map)
+    wids = list(range(len(words)))
+
+    def load_table():
+        if fmt == "json":
+            with open(scores_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        if fmt == "columns":
+            with open(scores_path, "r", encoding="utf-8") as f:
+                return ScoreTable.from_scores(json.load(f), engine.word_map)
+        return ScoreTable(table_path, engine.word_map, file_digest(scores_path), file_digest(vocab_path))
+
+    rss0 = rss_kb()
+    t0 = time.perf_counter()
+    table = load_table()
+    load = time.perf_counter() - t0
+    rss = rss_kb() - rss0
+    # Second, traced load for the heap it retains (tracing skews the timing)
+    tracemalloc.start()
+    traced = load_table()
+    heap = tracemalloc.get_traced_memory()[0] / 1024
+    tracemalloc.stop()
+    del traced
+
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        if fmt == "json":
+            for w in words:
+                meta = table.get(w, {})
+                if isinstance(meta, float):
+                    continue
+                meta.get("s", 0.5)
+        else:
+            score = table.score
+            for wid in wids:
+                score(wid)
+        best = min(best, time.perf_counter() - t0)
+    print(f"{load * 1000:.1f} {rss} {heap:.0f} {best / len(words) * 1e9:.0f}")
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"{'format':8} {'load':>9} {'RSS +':>9} {'heap +':>9} {'lookup':>9}")
+    for fmt in FORMATS:
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_scores", "--child", fmt, str(repeats)],
+            cwd=BASE_DIR, capture_output=True, text=True,
+        )
+        if out.returncode:
+            print(f"{fmt:8} failed: {out.stderr.strip().splitlines()[-1:]}")
+            continue
+        load, rss, heap, lookup = out.stdout.split()
+        print(f"{fmt:8} {float(load):7.1f}ms {int(rss) / 1024:7.1f}MB {float(heap) / 1024:7.1f}MB {lookup:>7}ns")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(sys.argv[2], int(sys.argv[3]))
+    else:
+        main()
@@ -0,0 +1,61 @@
+"""
+Syllable counting per line: the former uncached counter (normalize every
+word of every line) against SyllableCounter.line and SyllableCounter.lines (all lines in one call).
+
+    python -m benchmarks.bench_syllables [lines]   # default: 50000 lines
+
+Lines come from the lyrics corpus, repeated up to the requested count; lyrics
+reuse their vocabulary heavily, so most words are memo hits after the first
+pass. Each counter starts with an empty memo and all three must agree.
+"""
+import os
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from corpus import clean_line  # noqa: E402
+from phonetic_engine import PhoneticEngine  # noqa: E402
+from syllables import RE_NON_WORD, SyllableCounter  # noqa: E402
+
+
+def legacy_count(text, engine):
+    """corpus.count_syllables before the memo."""
+    total = 0
+    for word in text.split():
+        clean = RE_NON_WORD.sub('', word.lower())
+        if not clean:
+            continue
+        total += max(len(engine.get_vowel_positions(engine.normalize(clean))), 1)
+    return total
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    with open(os.path.join(BASE_DIR, "lyrics_corrected.txt"), "r", encoding="utf-8") as f:
+        lines = [line for line in map(clean_line, f) if line]
+    lines = (lines * (count // len(lines) + 1))[:count]
+    words = sum(len(line.split()) for line in lines)
+    print(f"{count} lines, {words} words, {len({w for line in lines for w in line.split()})} distinct tokens")
+
+    engine = PhoneticEngine()
+    per_line, batch = SyllableCounter(), SyllableCounter()  # a batch looks each distinct token up once
+    expected = None
+    for name, run, counter in (
+        ("uncached", lambda: [legacy_count(line, engine) for line in lines], None),
+        ("memo line", lambda: [per_line.line(line) for line in lines], per_line),
+        ("memo batch", lambda: batch.lines(lines), None),
+    ):
+        t0 = time.perf_counter()
+        counts = run()
+        elapsed = time.perf_counter() - t0
+        if expected is None:
+            expected = counts
+        assert counts == expected, name
+        hit_rate = f"  hit rate {counter.stats()['hit_rate']:.1%}" if counter else ""
+        print(f"{name:11} {elapsed * 1000:8.1f}ms  {elapsed / count * 1e6:6.2f}us/line{hit_rate}")
+
+
+if __name__ == "__main__":
+    main()
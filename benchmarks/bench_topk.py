@@ -0,0 +1,68 @@
+"""
+Full sort vs bounded per-grade heaps for word-mode selection.
+
+    python -m benchmarks.bench_topk [repeats]
+
+"full" is the pre-top-k word-mode path: find_candidates sorts every hit, then
+the server re-scores, re-sorts and keeps 15 per grade. "topk" passes
+k_per_grade + a by-id priority table so only the kept candidates are ever ordered. Targets are
+common tails (-anie, -owa, ...) whose assonance buckets hold thousands of words.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import ENGINE, WORD_SCORES  # noqa: E402
+from server import WORD_MODE_LIMIT, WORD_PRIORITY, is_clean_word  # noqa: E402
+
+TARGETS = ["granie", "kochanie", "śpiewanie", "krowa", "głowa", "domowa", "kawa", "noce", "miasto", "ulica"]
+
+
+def full_sort(word):
+    processed = []
+    for w, grade, base in ENGINE._find_candidates(word):
+        if not is_clean_word(w):
+            continue
+        meta = WORD_SCORES.get(w, {})
+        priority = meta if isinstance(meta, float) else meta.get("s", 0.5)
+        processed.append((w, grade, base * priority))
+    processed.sort(key=lambda x: (x[1] != "PERFECT", x[1] != "DOMINANT", -x[2]))
+    kept, counts = [], {}
+    for w, grade, score in processed:
+        if counts.get(grade, 0) < WORD_MODE_LIMIT:
+            counts[grade] = counts.get(grade, 0) + 1
+            kept.append((w, grade, score))
+    return kept
+
+
+def top_k(word):
+    return ENGINE.find_candidates(word, k_per_grade=WORD_MODE_LIMIT, priority_by_id=WORD_PRIORITY)
+
+
+def bench(fn, word, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn(word)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    ENGINE.cache = None  # time the scans, not cache hits
+    grade_order = {"PERFECT": 0, "DOMINANT": 1, "NEAR": 2}
+    print(f"{'word':<12} {'hits':>6} {'full ms':>8} {'topk ms':>8} {'speedup':>8}")
+    for word in TARGETS:
+        hits = len(ENGINE._find_candidates(word))
+        expected = full_sort(word)
+        got = sorted(top_k(word), key=lambda x: grade_order[x[1]])  # stable: keeps score order
+        assert got == expected, f"top-k mismatch for {word}"
+        full, topk = bench(full_sort, word, repeats), bench(top_k, word, repeats)
+        print(f"{word:<12} {hits:>6} {full:>8.2f} {topk:>8.2f} {full / topk:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Rhyme-scheme verification throughput: the former one-stanza-at-a-time
+verify_rhyme_scheme against verify_stanzas on one batch.
+
+    python -m benchmarks.bench_verify [stanzas]   # default: 5000 four-line stanzas
+
+Stanzas are consecutive lines of the lyrics corpus, repeated up to the
+requested count, so last words recur the way they do across many songs.
+"""
+import os
+import re
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from corpus import clean_line  # noqa: E402
+from polish_rhyme_util import _PHONETICS, get_phonetic_suffix, verify_stanzas  # noqa: E402
+
+
+def legacy_verify(stanza, scheme="AABB"):
+    """verify_rhyme_scheme before verify_stanzas: two normalizations per line."""
+    suffixes = []
+    for line in stanza:
+        words = line.strip().split()
+        if not words:
+            suffixes.append("")
+            continue
+        suffixes.append(get_phonetic_suffix(re.sub(r'[^\w]', '', words[-1])))
+    if len(suffixes) < 4:
+        return False, suffixes
+
+    def tail1(s):
+        vp = _PHONETICS.get_vowel_positions(s)
+        return s[vp[-1]:] if vp else s
+
+    t = [tail1(s) for s in suffixes]
+    if scheme == "AABB":
+        ok = (t[0] == t[1]) and (t[2] == t[3])
+    elif scheme == "ABAB":
+        ok = (t[0] == t[2]) and (t[1] == t[3])
+    elif scheme == "ABBA":
+        ok = (t[0] == t[3]) and (t[1] == t[2])
+    else:
+        ok = False
+    return ok, suffixes
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    with open(os.path.join(BASE_DIR, "lyrics_corrected.txt"), "r", encoding="utf-8") as f:
+        lines = [line for line in map(clean_line, f) if line]
+    stanzas = [lines[i:i + 4] for i in range(0, len(lines) - 3, 4)]
+    stanzas = (stanzas * (count // len(stanzas) + 1))[:count]
+    distinct = len({line.split()[-1] for stanza in stanzas for line in stanza})
+    print(f"{count} stanzas, {4 * count} lines, {distinct} distinct last words")
+
+    for name, run in (
+        ("per stanza", lambda: [legacy_verify(stanza) for stanza in stanzas]),
+        ("batch", lambda: verify_stanzas(stanzas)),
+    ):
+        t0 = time.perf_counter()
+        results = run()
+        elapsed = time.perf_counter() - t0
+        print(f"{name:11} {elapsed * 1000:8.1f}ms  {count / elapsed:9.0f} stanzas/s  "
+              f"{sum(ok for ok, _ in results)} matched")
+
+
+if __name__ == "__main__":
+    main()
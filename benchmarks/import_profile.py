@@ -0,0 +1,70 @@
+"""
+Import-time profile: what importing each module costs, and what the first
+use that materializes the lazy singletons costs on top.
+
+    python -m benchmarks.import_profile [top]   # default: 8 slowest modules
+
+Each case is a fresh interpreter. "artifacts" maps phonetic_index.bin /
+word_scores.bin; "sources" points config at missing artifacts so the engine
+is built from words_pl.txt and the scores parsed from JSON (a cold container
+without the build step). The listing at the end is `python -X importtime
+-c "import server"`, heaviest cumulative imports first.
+"""
+import os
+import subprocess
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = (
+    ("config", "import config", "config.get_scores()"),
+    ("polish_rhyme_util", "import polish_rhyme_util", "polish_rhyme_util.RhymeFinder()"),
+    ("server", "import server", "server.snapshot()"),
+)
+
+TIMER = """
+import time
+t0 = time.perf_counter()
+{load}
+t1 = time.perf_counter()
+{use}
+t2 = time.perf_counter()
+print(f"{{(t1 - t0) * 1000:.1f}} {{(t2 - t1) * 1000:.1f}}")
+"""
+
+
+def run(code: str, env: dict, *flags) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *flags, "-c", code], cwd=BASE_DIR, env=env,
+                          capture_output=True, text=True)
+
+
+def main():
+    top = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    layouts = {
+        "artifacts": dict(os.environ),
+        "sources": dict(os.environ, PHONETIC_INDEX_PATH="/nonexistent/index.bin", SCORE_TABLE_PATH="/nonexistent/scores.bin"),
+    }
+    print(f"{'module':18} {'layout':10} {'import':>9} {'first use':>10}")
+    for name, load, use in CASES:
+        for layout, env in layouts.items():
+            out = run(TIMER.format(load=load, use=use), env)
+            if out.returncode:
+                print(f"{name:18} {layout:10} failed: {out.stderr.strip().splitlines()[-1:]}")
+                continue
+            imp, first = out.stdout.split()[-2:]
+            print(f"{name:18} {layout:10} {float(imp):7.1f}ms {float(first):8.1f}ms")
+
+    out = run("import server", layouts["artifacts"], "-X", "importtime")
+    rows = []
+    for line in out.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, module = line[len("import time:"):].split("|")
+            if cumulative.strip().isdigit():
+                rows.append((int(cumulative), module.rstrip()))
+    print(f"\nimport server, top {top} by cumulative time:")
+    for cumulative, module in sorted(rows, reverse=True)[:top]:
+        print(f"  {cumulative / 1000:8.1f}ms {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+RSS before/after building the phonetic index, per storage layout.
+
+    python -m benchmarks.memory_report [vocabulary_path]
+
+Each layout is measured in a fresh subprocess. RSS after a build also holds
+allocator arenas freed by the build itself, so the live Python heap retained
+by the index (tracemalloc, after gc) is reported next to it:
+    legacy  one WordEntry namedtuple per word + three dict-of-lists (pre-WordStore)
+    store   PhoneticEngine's columnar WordStore, built in memory
+    mapped  WordStore mmap-ed from a compiled phonetic_index.bin
+"""
+import gc
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+LAYOUTS = ("legacy", "store", "mapped")
+
+
+def rss_mb() -> float:
+    """Current resident set size (Linux /proc, ru_maxrss elsewhere)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss / 2**20 if sys.platform == "darwin" else rss / 1024
+
+
+def _load_vocabulary(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip().lower() for line in f if len(line.strip()) > 2]
+
+
+def measure(layout: str, vocab_path: str, index_path: str) -> dict:
+    from phonetic_engine import PhoneticEngine
+    from phonetic_index import load_engine
+
+    vocabulary = _load_vocabulary(vocab_path) if layout != "mapped" else []
+    before = rss_mb()
+    tracemalloc.start()
+    if layout == "legacy":
+        from collections import defaultdict
+        engine = PhoneticEngine()
+        word_map, d2, d1, vowels = {}, defaultdict(list), defaultdict(list), defaultdict(list)
+        for word in vocabulary:
+            entry = engine.build_entry(word)
+            word_map[word] = entry
+            d2[entry.tail_d2].append(entry)
+            d1[entry.tail_d1].append(entry)
+            if entry.vowel_seq:
+                vowels[entry.vowel_seq].append(entry)
+        words = len(word_map)
+    elif layout == "store":
+        engine = PhoneticEngine(vocabulary)
+        words = len(engine.store)
+    else:
+        engine = load_engine(index_path)
+        engine.find_candidates("kawa")  # touch a few pages
+        words = len(engine.store)
+    gc.collect()
+    heap = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    after = rss_mb()
+    return {"layout": layout, "words": words, "rss_before_mb": round(before, 1),
+            "rss_after_mb": round(after, 1), "heap_mb": round(heap / 2**20, 1)}
+
+
+def main():
+    vocab_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(BASE_DIR, "words_pl.txt")
+
+    if len(sys.argv) > 3 and sys.argv[2] == "--child":
+        print(json.dumps(measure(sys.argv[3], vocab_path, sys.argv[4])))
+        return
+
+    from phonetic_index import compile_index
+    with tempfile.TemporaryDirectory() as tmp:
+        index_path = os.path.join(tmp, "phonetic_index.bin")
+        compile_index(vocab_path, index_path)
+        print(f"Vocabulary: {vocab_path}  (artifact {os.path.getsize(index_path) / 2**20:.1f} MB)")
+        print(f"{'layout':<8} {'words':>8} {'RSS before':>11} {'RSS after':>10} {'heap MB':>8}")
+        for layout in LAYOUTS:
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.memory_report", vocab_path, "--child", layout, index_path],
+                cwd=BASE_DIR, capture_output=True, text=True, check=True,
+            )
+            r = json.loads(out.stdout)
+            print(f"{r['layout']:<8} {r['words']:>8} {r['rss_before_mb']:>11} {r['rss_after_mb']:>10} {r['heap_mb']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+Benchmark suite: index build, word lookups, verse search and the HTTP layer,
+saved as JSON and optionally compared with a baseline run.
+
+    python -m benchmarks.suite [--quick] [--out FILE] [--baseline FILE] [--tolerance 0.25]
+
+Cases (wall clock; inputs are fixed by seed, so runs are comparable):
+    normalize         PhoneticEngine.normalize per word, best of 3 (us)
+    build_index       build_index of words_pl.txt, best of 3 (ms)
+    lookup_pNN        word-mode find_candidates (k=15, by-id priority) for
+                      words whose tail_d2 bucket size sits at the NNth
+                      percentile of the vocabulary; median over 25 words (ms)
+    verse             generate() on corpus lines (verse mode); median (ms)
+    slant_dN          find_slant_rhymes (k=15, max_distance=N) on random words
+                      after a first pass has built the BK-trees; median (ms),
+                      with a latency target (SLANT_TARGETS_MS)
+    http_generate     POST /generate through httpx's in-process ASGI
+                      transport, distinct words, 8 concurrent clients, word
+                      mode cache cleared first (requests/s)
+    http_generate_cached  the same words again, served from the cache
+
+--quick uses a 10k-word build and fewer samples. --baseline prints the
+change per case and exits 1 if any case is worse than the tolerance; a case
+over its latency target also exits 1.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+from statistics import median
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+PERCENTILES = (50, 90, 99, 100)
+SLANT_TARGETS_MS = {1: 2.5, 2: 6.0}  # median per lookup, trees built
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+def result(value, unit, better="lower", **extra) -> dict:
+    return {"value": round(value, 4), "unit": unit, "better": better, **extra}
+
+
+def best_of(repeats, fn, *args) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def samples_ms(fn, inputs) -> list:
+    out = []
+    for item in inputs:
+        t0 = time.perf_counter()
+        fn(item)
+        out.append((time.perf_counter() - t0) * 1000)
+    return out
+
+
+def case_normalize(words) -> dict:
+    from phonetic_engine import PhoneticEngine
+
+    engine = PhoneticEngine()
+    normalize = engine.normalize
+    elapsed = best_of(3, lambda: [normalize(w) for w in words])
+    return {"normalize": result(elapsed / len(words) * 1e6, "us", words=len(words))}
+
+
+def case_build(words) -> dict:
+    from phonetic_engine import PhoneticEngine
+
+    elapsed = best_of(3, lambda: PhoneticEngine().build_index(words))
+    return {"build_index": result(elapsed * 1000, "ms", words=len(words))}
+
+
+def case_lookup(snap, per_percentile: int) -> dict:
+    # Cost grows with the target's buckets; tail_d2 frequency ranks them
+    original, _, _, tails_d2, _, _ = snap.engine.store.columns()
+    sizes = Counter(tails_d2)
+    ranked = sorted(range(len(original)), key=lambda wid: (sizes[tails_d2[wid]], original[wid]))
+    cases = {}
+    for p in PERCENTILES:
+        at = min(len(ranked) - per_percentile, int(p / 100 * len(ranked)))
+        words = [original[wid] for wid in ranked[max(at, 0):at + per_percentile]]
+        times = samples_ms(
+            lambda w: snap.engine.find_candidates(w, k_per_grade=15, priority_by_id=snap.priority), words,
+        )
+        cases[f"lookup_p{p}"] = result(median(times), "ms", p99=round(percentile(times, 99), 4),
+                                       tail_d2_bucket=sizes[snap.engine.build_entry(words[0]).tail_d2],
+                                       words=len(words))
+    return cases
+
+
+def case_verse(server, snap, count: int) -> dict:
+    rng = random.Random(7)
+    lines = [line.text for line in rng.sample(snap.all_lines, min(count, len(snap.all_lines)))]
+    random.seed(7)  # find_rhyming_verses shuffles
+    times = samples_ms(lambda text: server.generate(text, set(), snap=snap), lines)
+    return {"verse": result(median(times), "ms", p99=round(percentile(times, 99), 4), lines=len(lines))}
+
+
+def case_slant(snap, count: int) -> dict:
+    rng = random.Random(7)
+    words = sorted(rng.sample(list(snap.engine.word_map), count))
+    cold = samples_ms(lambda w: snap.engine.find_slant_rhymes(w, 15, 1, priority_by_id=snap.priority), words)
+    cases = {}
+    for distance, target in SLANT_TARGETS_MS.items():
+        times = samples_ms(
+            lambda w: snap.engine.find_slant_rhymes(w, 15, distance, priority_by_id=snap.priority), words,
+        )
+        cases[f"slant_d{distance}"] = result(median(times), "ms", target=target,
+                                             p99=round(percentile(times, 99), 4), words=len(words))
+    cases["slant_d1"]["cold_p99"] = round(percentile(cold, 99), 4)  # first lookups build their trees
+    return cases
+
+
+async def _http_pass(client, words, concurrency) -> tuple:
+    queue = list(reversed(words))
+    latencies = []
+
+    async def worker():
+        while queue:
+            word = queue.pop()
+            t0 = time.perf_counter()
+            r = await client.post("/generate", json={"verse": word})
+            latencies.append((time.perf_counter() - t0) * 1000)
+            r.raise_for_status()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - t0, latencies
+
+
+def case_http(server, snap, count: int, concurrency: int = 8) -> dict:
+    import httpx
+    from rate_limiter import make_rate_limiter
+
+    rng = random.Random(7)
+    words = rng.sample([w for w in snap.engine.word_map if server.is_clean_word(w)], count)
+    limiter, server.RATE_LIMITER = server.RATE_LIMITER, make_rate_limiter(0)  # 0 disables
+    snap.word_mode_cache.clear()
+    snap.engine.cache.clear()  # the lookup case may have ranked some of these words
+
+    async def run():
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            return [await _http_pass(client, words, concurrency) for _ in range(2)]
+
+    try:
+        passes = asyncio.run(run())
+    finally:
+        server.RATE_LIMITER = limiter
+    cases = {}
+    for name, (elapsed, latencies) in zip(("http_generate", "http_generate_cached"), passes):
+        cases[name] = result(len(words) / elapsed, "req/s", better="higher",
+                             p50_ms=round(percentile(latencies, 50), 4), p99_ms=round(percentile(latencies, 99), 4),
+                             requests=len(words), concurrency=concurrency)
+    return cases
+
+
+def meta(quick: bool) -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR, capture_output=True,
+                                text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "commit": commit, "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "quick": quick,
+        "python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count(),
+    }
+
+
+def run_suite(quick: bool = False) -> dict:
+    import server
+    from phonetic_index import read_vocabulary
+
+    words = [w for w in read_vocabulary(os.path.join(BASE_DIR, "words_pl.txt")) if len(w) > 2]
+    sample = random.Random(7).sample(words, min(len(words), 5000 if quick else 20000))
+    snap = server.snapshot()
+    server.REQUEST_LOG.sample_rate = 0  # keep the output to results
+
+    cases = {}
+    steps = (
+        ("normalize", lambda: case_normalize(sample)),
+        ("build_index", lambda: case_build(words[:10000] if quick else words)),
+        ("lookup", lambda: case_lookup(snap, 10 if quick else 25)),
+        ("verse", lambda: case_verse(server, snap, 50 if quick else 200)),
+        ("slant", lambda: case_slant(snap, 100 if quick else 400)),
+        ("http", lambda: case_http(server, snap, 100 if quick else 400)),
+    )
+    for name, step in steps:
+        print(f"  {name}...", file=sys.stderr, flush=True)
+        cases.update(step())
+    return {"meta": meta(quick), "cases": cases}
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list:
+    """(case, baseline value, current value, relative change, regressed) for cases in both runs."""
+    rows = []
+    for name, now in current["cases"].items():
+        base = baseline.get("cases", {}).get(name)
+        if base is None or not base["value"]:
+            continue
+        change = now["value"] / base["value"] - 1
+        worse = change > tolerance if now["better"] == "lower" else change < -tolerance
+        rows.append((name, base["value"], now["value"], change, worse))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--quick", action="store_true")
+    parser.add_argument("--out", default=os.path.join(BASE_DIR, "bench_results.json"))
+    parser.add_argument("--baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown (default 0.25)")
+    args = parser.parse_args()
+
+    results = run_suite(args.quick)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=1)
+
+    print(f"{'case':22} {'value':>12} {'unit':6}")
+    over = [name for name, case in results["cases"].items() if case["value"] > case.get("target", float("inf"))]
+    for name, case in results["cases"].items():
+        target = f"  OVER TARGET {case['target']}" if name in over else ""
+        print(f"{name:22} {case['value']:12.3f} {case['unit']:6}{target}")
+    print(f"→ {args.out}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"\nvs {args.baseline} (commit {baseline.get('meta', {}).get('commit', '?')}):")
+        if baseline.get("meta", {}).get("quick") != args.quick:
+            print("warning: comparing a --quick run with a full one")
+        rows = compare(results, baseline, args.tolerance)
+        for name, base, now, change, worse in rows:
+            print(f"{name:22} {base:12.3f} → {now:12.3f} {change:+7.1%}{'  REGRESSION' if worse else ''}")
+        if any(worse for *_, worse in rows):
+            sys.exit(1)
+    if over:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Per-worker memory with private vs shared (mmap-ed) engine data.
+
+    python -m benchmarks.worker_rss [worker counts...]   # default: 1 4 16
+
+Each "worker" is a fresh interpreter that imports server:app and loads its
+snapshot, which is what a uvicorn --workers process does on its first request
+(or at startup with WARMUP). Layouts:
+    private  compiled artifacts ignored: every worker builds the index and
+             parses word_scores.json into its own heap
+    shared   phonetic_index.bin / word_scores.bin written once up front (as
+             `WORKERS=N python server.py` does); workers mmap them read-only
+
+RSS counts shared pages in full for every process; PSS splits them between
+the processes mapping them, so the PSS total is the real host footprint.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+# Importing the server loads nothing since the snapshot is lazy
+WORKER = "import server, sys; server.snapshot(); sys.stdout.write('ready\\n'); sys.stdout.flush(); sys.stdin.read()"
+
+
+def memory_kb(pid: int) -> dict:
+    """Rss/Pss of a process from /proc/<pid>/smaps_rollup (Linux only)."""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ("Rss:", "Pss:"):
+                values[parts[0][:-1].lower()] = int(parts[1])
+    return values
+
+
+def measure(workers: int, env: dict) -> list:
+    procs = [
+        subprocess.Popen([sys.executable, "-c", WORKER], cwd=BASE_DIR, env=env, text=True,
+                         stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        for _ in range(workers)
+    ]
+    try:
+        for p in procs:
+            while p.stdout.readline().strip() != "ready":
+                if p.poll() is not None:
+                    raise RuntimeError("worker failed to start")
+        return [memory_kb(p.pid) for p in procs]
+    finally:
+        for p in procs:
+            p.stdin.close()
+            p.wait()
+
+
+def main():
+    counts = [int(a) for a in sys.argv[1:]] or [1, 4, 16]
+    with tempfile.TemporaryDirectory() as tmp:
+        # Point config at empty paths before importing it: this process builds
+        # in memory once and writes the artifacts, like the server parent
+        shared_env = dict(
+            os.environ,
+            PHONETIC_INDEX_PATH=os.path.join(tmp, "phonetic_index.bin"),
+            SCORE_TABLE_PATH=os.path.join(tmp, "word_scores.bin"),
+        )
+        os.environ.update(shared_env)
+        import config
+        assert len(config.write_shared_artifacts()) == 2
+
+        private_env = dict(
+            os.environ,
+            PHONETIC_INDEX_PATH=os.path.join(tmp, "missing.bin"),
+            SCORE_TABLE_PATH=os.path.join(tmp, "missing.bin"),
+        )
+
+        print(f"{'layout':8} {'workers':>7} {'RSS/worker':>11} {'PSS/worker':>11} {'PSS total':>10}")
+        for n in counts:
+            for layout, env in (("private", private_env), ("shared", shared_env)):
+                mem = measure(n, env)
+                rss = sum(m["rss"] for m in mem) / n / 1024
+                pss = sum(m["pss"] for m in mem) / 1024
+                print(f"{layout:8} {n:7d} {rss:9.1f}MB {pss / n:9.1f}MB {pss:8.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,41 +1,212 @@
 """
 Centralized configuration and shared singleton instances.
+
+ENGINE and WORD_SCORES are built on first access (`config.ENGINE`,
+`from config import ENGINE`, get_engine()), not at import, so tools that
+only need settings or normalization never pay for the index.
 """
 import os
+import threading
 from phonetic_engine import PhoneticEngine
+from phonetic_index import MappedIndex, file_digest, load_engine, read_vocabulary, write_index
+from result_cache import LRUCache
+from score_store import ScoreTable
 
 # --- Paths ---
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 VOCABULARY_PATH = os.getenv("VOCABULARY_PATH", os.path.join(BASE_DIR, "words_pl.txt"))
 LYRICS_PATH = os.getenv("LYRICS_PATH", os.path.join(BASE_DIR, "lyrics_corrected.txt"))
+# Compiled by `python phonetic_index.py`; rebuilt in memory if missing or stale
+PHONETIC_INDEX_PATH = os.getenv("PHONETIC_INDEX_PATH", os.path.join(BASE_DIR, "phonetic_index.bin"))
+SCORES_PATH = os.getenv("SCORES_PATH", os.path.join(BASE_DIR, "word_scores.json"))
+# Compiled by `python score_store.py` (ids of VOCABULARY_PATH); parsed from
+# SCORES_PATH if missing or stale
+SCORE_TABLE_PATH = os.getenv("SCORE_TABLE_PATH", os.path.join(BASE_DIR, "word_scores.bin"))
 
 # --- Server ---
 HOST = os.getenv("HOST", "0.0.0.0")
 PORT = int(os.getenv("PORT", "8000"))
 CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:5173").split(",")
-
-# --- Scores ---
-WORD_SCORES = {}
-try:
-    import json
-    with open(os.path.join(BASE_DIR, "word_scores.json"), "r", encoding="utf-8") as f:
-        WORD_SCORES = json.load(f)
-except Exception:
-    pass
+# `python server.py` with WORKERS > 1 writes the compiled index and score
+# table first, so every worker mmaps one shared copy
+WORKERS = int(os.getenv("WORKERS", "1"))
+# When a server process loads the engine, scores and corpus:
+#   background  on a thread at startup; `/` answers "warming" until done
+#   lazy        on the first request that needs them
+#   eager       before the server accepts requests
+WARMUP = os.getenv("WARMUP", "background")
 
 # --- Limits ---
 MAX_INPUT_LENGTH = int(os.getenv("MAX_INPUT_LENGTH", "500"))
-RATE_LIMIT_PER_MINUTE = int(os.getenv("RATE_LIMIT_PER_MINUTE", "30"))
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "64"))  # verses per /generate/batch
+RATE_LIMIT_PER_MINUTE = int(os.getenv("RATE_LIMIT_PER_MINUTE", "30"))  # per client IP; 0 disables
+STANZA_BUDGET_MS = float(os.getenv("STANZA_BUDGET_MS", "50"))  # search time per /generate/stanza
+MAX_VERIFY_LINES = int(os.getenv("MAX_VERIFY_LINES", "20000"))  # lines per POST /verify
+# Token buckets per client IP (rate_limiter.py): "memory" is per worker,
+# "sqlite" shares the buckets in RATE_LIMIT_DB_PATH across workers on a host.
+# Buckets idle for a minute are swept every RATE_LIMIT_SWEEP_INTERVAL seconds
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_DB_PATH = os.getenv("RATE_LIMIT_DB_PATH", "")  # default: <tmp>/rymowanka_rate_limit.sqlite3
+RATE_LIMIT_SWEEP_INTERVAL = float(os.getenv("RATE_LIMIT_SWEEP_INTERVAL", "10"))
+
+# --- Observability ---
+# Share of requests logged (per-request lines go through request_log.py's
+# queue, off the request path); GET /metrics is always on
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "0.01"))
+
+# --- Engine executor (engine_executor.py) ---
+# inline | thread | process; saturated workers answer 503 + Retry-After
+EXECUTOR_MODE = os.getenv("EXECUTOR_MODE", "thread")
+EXECUTOR_WORKERS = int(os.getenv("EXECUTOR_WORKERS", "4"))
+EXECUTOR_MAX_PENDING = int(os.getenv("EXECUTOR_MAX_PENDING", "64"))  # queued + running
+EXECUTOR_RETRY_AFTER = int(os.getenv("EXECUTOR_RETRY_AFTER", "1"))  # seconds
+
+# --- Result caches (0 entries disables) ---
+# Size is counted in candidates held, so a few huge assonance lists cannot
+# crowd out everything else
+CANDIDATE_CACHE_ENTRIES = int(os.getenv("CANDIDATE_CACHE_ENTRIES", "1024"))
+CANDIDATE_CACHE_MAX_CANDIDATES = int(os.getenv("CANDIDATE_CACHE_MAX_CANDIDATES", "250000"))
+WORD_MODE_CACHE_ENTRIES = int(os.getenv("WORD_MODE_CACHE_ENTRIES", "4096"))
+SYLLABLE_CACHE_WORDS = int(os.getenv("SYLLABLE_CACHE_WORDS", "100000"))  # syllables.SYLLABLES memo, in words
+
+# --- Hot reload (server.reload_sources) ---
+# POST /admin/reload needs X-Admin-Token: ADMIN_TOKEN (unset disables it).
+# RELOAD_WATCH_INTERVAL > 0 also polls the source files every N seconds;
+# each uvicorn worker watches and reloads itself
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+RELOAD_WATCH_INTERVAL = float(os.getenv("RELOAD_WATCH_INTERVAL", "0"))
+
+# --- Reload hooks ---
+# Called with "vocabulary", "scores" or "lyrics" after that source is reloaded
+RELOAD_HOOKS = []
+
+
+def register_reload_hook(hook):
+    RELOAD_HOOKS.append(hook)
+    return hook
+
+
+def run_reload_hooks(source: str):
+    for hook in RELOAD_HOOKS:
+        hook(source)
 
 
 def _load_vocabulary() -> list[str]:
     try:
-        with open(VOCABULARY_PATH, "r", encoding="utf-8") as f:
-            return [line.strip().lower() for line in f if len(line.strip()) > 2]
+        return read_vocabulary(VOCABULARY_PATH)
     except FileNotFoundError:
         return []
 
 
-# --- Singleton shared engine ---
-VOCABULARY = _load_vocabulary()
-ENGINE = PhoneticEngine(VOCABULARY)
+def _load_compiled_engine() -> PhoneticEngine:
+    return load_engine(PHONETIC_INDEX_PATH, expected_digest=file_digest(VOCABULARY_PATH))
+
+
+def _load_engine() -> PhoneticEngine:
+    try:
+        engine = _load_compiled_engine()
+    except (OSError, ValueError):
+        engine = PhoneticEngine(_load_vocabulary())
+    engine.cache = LRUCache(CANDIDATE_CACHE_ENTRIES, CANDIDATE_CACHE_MAX_CANDIDATES)
+    return engine
+
+
+def reload_engine(engine: PhoneticEngine):
+    """
+    A new engine for the current vocabulary file; `engine` is left untouched.
+    Maps the compiled index if it is fresh, otherwise updates `engine`'s
+    entries with the added and removed words. Returns (engine, added, removed).
+    """
+    try:
+        new = _load_compiled_engine()
+        before, after = set(engine.word_map), set(new.word_map)
+        added, removed = len(after - before), len(before - after)
+    except (OSError, ValueError):
+        new, added, removed = engine.with_vocabulary(_load_vocabulary())
+    new.cache = LRUCache(CANDIDATE_CACHE_ENTRIES, CANDIDATE_CACHE_MAX_CANDIDATES)
+    return new, added, removed
+
+
+# --- Lazy singletons ---
+_SINGLETON_LOCK = threading.RLock()
+
+
+def get_engine() -> PhoneticEngine:
+    """The shared engine, loaded on first call (thread-safe)."""
+    engine = globals().get("ENGINE")
+    if engine is None:
+        with _SINGLETON_LOCK:
+            engine = globals().get("ENGINE")
+            if engine is None:
+                engine = globals()["ENGINE"] = _load_engine()
+    return engine
+
+
+def get_scores() -> ScoreTable:
+    """The shared WORD_SCORES, aligned with get_engine(); loaded on first call."""
+    scores = globals().get("WORD_SCORES")
+    if scores is None:
+        with _SINGLETON_LOCK:
+            scores = globals().get("WORD_SCORES")
+            if scores is None:
+                scores = globals()["WORD_SCORES"] = load_scores(get_engine())
+    return scores
+
+
+def loaded() -> bool:
+    return "ENGINE" in globals() and "WORD_SCORES" in globals()
+
+
+def __getattr__(name):
+    # Module attribute fallback (PEP 562): the singletons are plain globals
+    # once loaded, so only the first access lands here
+    if name == "ENGINE":
+        return get_engine()
+    if name == "WORD_SCORES":
+        return get_scores()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# --- Scores ---
+def load_scores(engine: PhoneticEngine) -> ScoreTable:
+    """
+    Scores aligned with `engine`'s word ids: the compiled table if it was
+    built from the current word_scores.json and vocabulary, else the JSON.
+    """
+    try:
+        return ScoreTable(SCORE_TABLE_PATH, engine.word_map, expected_digest=file_digest(SCORES_PATH),
+                          expected_vocabulary_digest=file_digest(VOCABULARY_PATH))
+    except (OSError, ValueError):
+        pass
+    try:
+        import json
+        with open(SCORES_PATH, "r", encoding="utf-8") as f:
+            scores = json.load(f)
+    except Exception:
+        scores = {}
+    return ScoreTable.from_scores(scores, engine.word_map)
+
+
+
+def write_shared_artifacts() -> list:
+    """
+    Write the compiled index and score table from this process's copies if
+    they are missing or stale, so workers started afterwards attach to them
+    instead of each building their own. Returns the paths written.
+    """
+    written = []
+    engine, scores = get_engine(), get_scores()
+    if not isinstance(engine.store, MappedIndex) and os.path.exists(VOCABULARY_PATH):
+        write_index(engine, PHONETIC_INDEX_PATH, file_digest(VOCABULARY_PATH))
+        written.append(PHONETIC_INDEX_PATH)
+    if not scores.mapped and os.path.exists(SCORES_PATH) and os.path.exists(VOCABULARY_PATH):
+        scores.write(SCORE_TABLE_PATH, file_digest(SCORES_PATH), file_digest(VOCABULARY_PATH))
+        written.append(SCORE_TABLE_PATH)
+    return written
+
+
+@register_reload_hook
+def _invalidate_engine_cache(source: str):
+    engine = globals().get("ENGINE")
+    if source in ("vocabulary", "scores") and engine is not None:
+        engine.cache.clear()
@@ -0,0 +1,165 @@
+"""
+Lyrics corpus loading.
+Every usable line is parsed once at startup into a CorpusLine holding the
+features verse search needs, so requests never re-run cleanup, normalization
+or syllable counting on corpus lines.
+"""
+import re
+from collections import Counter, defaultdict, namedtuple
+
+from syllables import RE_NON_WORD, SYLLABLES
+
+CorpusLine = namedtuple('CorpusLine', ['text', 'lower', 'last_word', 'tail_d2', 'tail_d1', 'syllables'])
+
+RE_BRACKETS = re.compile(r'\[.*?\]')
+RE_SKIP = re.compile(r'^\s*$|^\[|^#|^-{3,}|^\(|^Style:|^End|^Fade|^Finish')
+
+
+class SyllableBuckets:
+    """
+    Lines sharing a rhyme key, sub-indexed by syllable count so verse search can
+    expand outward from the input's length. Iterates in corpus order.
+    """
+    __slots__ = ('lines', 'by_syllables', 'min_syllables', 'max_syllables')
+
+    def __init__(self):
+        self.lines = []
+        self.by_syllables = {}
+        self.min_syllables = self.max_syllables = 0
+
+    def append(self, line: CorpusLine):
+        if not self.lines:
+            self.min_syllables = self.max_syllables = line.syllables
+        else:
+            self.min_syllables = min(self.min_syllables, line.syllables)
+            self.max_syllables = max(self.max_syllables, line.syllables)
+        self.lines.append(line)
+        self.by_syllables.setdefault(line.syllables, []).append(line)
+
+    def at_distance(self, syllables: int, distance: int) -> list:
+        """Lines whose syllable count is exactly `distance` away."""
+        if distance == 0:
+            return list(self.by_syllables.get(syllables, ()))
+        return self.by_syllables.get(syllables - distance, []) + self.by_syllables.get(syllables + distance, [])
+
+    def max_distance(self, syllables: int) -> int:
+        if not self.lines:
+            return -1
+        return max(syllables - self.min_syllables, self.max_syllables - syllables)
+
+    def __iter__(self):
+        return iter(self.lines)
+
+    def __len__(self):
+        return len(self.lines)
+
+    def __contains__(self, line):
+        return line in self.by_syllables.get(getattr(line, 'syllables', None), ())
+
+
+def clean_last_word(text: str) -> str:
+    words = text.strip().split()
+    if not words:
+        return ""
+    return RE_NON_WORD.sub('', words[-1].lower())
+
+
+def clean_line(raw_line: str):
+    """Lyric text of a raw corpus line, or None if it is not a usable lyric."""
+    line = raw_line.strip()
+    if not line or RE_SKIP.match(line):
+        return None
+    line_clean = RE_BRACKETS.sub('', line).strip()
+    if not line_clean or len(line_clean) < 10:
+        return None
+    return line_clean
+
+
+def parse_line(raw_line: str, engine):
+    """CorpusLine for one raw corpus line, or None if it is not a usable lyric."""
+    line_clean = clean_line(raw_line)
+    if line_clean is None:
+        return None
+
+    last = clean_last_word(line_clean)
+    if len(last) < 2:
+        return None
+    return make_line(line_clean, engine)
+
+
+def make_line(text: str, engine):
+    """CorpusLine for already-clean text (e.g. a user's seed line), or None without a last word."""
+    last = clean_last_word(text)
+    if not last:
+        return None
+    entry = engine.build_entry(last)
+    return CorpusLine(text, text.lower(), last, entry.tail_d2, entry.tail_d1, SYLLABLES.line(text))
+
+
+def _read_lines(path: str):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.readlines()
+    except FileNotFoundError:
+        print(f"⚠️ Warning: Lyrics corpus not found at {path}")
+        return []
+
+
+def _group(lines):
+    lines_by_d2 = defaultdict(SyllableBuckets)
+    lines_by_word = defaultdict(SyllableBuckets)
+    for line in lines:
+        lines_by_d2[line.tail_d2].append(line)
+        lines_by_word[line.last_word].append(line)
+    return lines_by_d2, lines_by_word
+
+
+def load_lyrics_corpus(path: str, engine):
+    """
+    Returns (lines_by_d2, lines_by_word, all_lines): tail_d2 / last word ->
+    SyllableBuckets, plus the flat list of CorpusLine rows.
+    """
+    all_lines = [line for line in (parse_line(raw, engine) for raw in _read_lines(path)) if line is not None]
+    return (*_group(all_lines), all_lines)
+
+
+def update_lyrics_corpus(path: str, engine, previous):
+    """
+    Reload the corpus against `previous` (a load_lyrics_corpus result) without
+    touching it: unchanged lines reuse their parsed CorpusLine, and only the
+    buckets of keys whose lines were added or removed are rebuilt; the rest
+    are shared with `previous`. Same result as load_lyrics_corpus.
+    Returns ((lines_by_d2, lines_by_word, all_lines), added, removed).
+    """
+    old_by_d2, old_by_word, old_lines = previous
+    known = {line.text: line for line in old_lines}
+
+    all_lines = []
+    for raw in _read_lines(path):
+        text = clean_line(raw)
+        if text is None:
+            continue
+        line = known.get(text) or parse_line(raw, engine)
+        if line is not None:
+            all_lines.append(line)
+
+    old_counts, new_counts = Counter(old_lines), Counter(all_lines)
+    changed = (old_counts - new_counts) + (new_counts - old_counts)
+    added = sum((new_counts - old_counts).values())
+    removed = sum((old_counts - new_counts).values())
+
+    unchanged_order = [line for line in old_lines if line not in changed]
+    if unchanged_order != [line for line in all_lines if line not in changed]:
+        # Lines were moved: bucket order would differ from a fresh load
+        return (*_group(all_lines), all_lines), added, removed
+
+    stale_d2 = {line.tail_d2 for line in changed}
+    stale_words = {line.last_word for line in changed}
+    lines_by_d2 = defaultdict(SyllableBuckets, {k: v for k, v in old_by_d2.items() if k not in stale_d2})
+    lines_by_word = defaultdict(SyllableBuckets, {k: v for k, v in old_by_word.items() if k not in stale_words})
+    for line in all_lines:
+        if line.tail_d2 in stale_d2:
+            lines_by_d2[line.tail_d2].append(line)
+        if line.last_word in stale_words:
+            lines_by_word[line.last_word].append(line)
+    return (lines_by_d2, lines_by_word, all_lines), added, removed
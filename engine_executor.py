@@ -0,0 +1,101 @@
+"""
+Runs CPU-bound engine work away from the asyncio event loop.
+
+    inline   call on the event loop (previous behaviour; one slow request
+             stalls every connection on the worker)
+    thread   ThreadPoolExecutor; the loop stays responsive, engine work still
+             shares the GIL
+    process  ProcessPoolExecutor; true parallelism, but functions and results
+             must pickle and each process keeps its own caches
+
+At most `max_pending` calls may be queued or running; past that `run` raises
+Saturated instead of queueing without bound, and the server answers 503.
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+MODES = ("inline", "thread", "process")
+
+
+class Saturated(Exception):
+    """Every execution slot is taken; retry later."""
+
+
+class EngineExecutor:
+    def __init__(self, mode: str = "thread", workers: int = 4, max_pending: int = 64):
+        if mode not in MODES:
+            raise ValueError(f"Unknown executor mode {mode!r} (expected one of {', '.join(MODES)})")
+        self.mode = mode
+        self.workers = max(workers, 1)
+        self.max_pending = max(max_pending, 1)
+        self.pending = 0
+        self.rejected = 0
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        # Created on first use, so importing the server in a pool process does
+        # not start a pool of its own
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    if self.mode == "process":
+                        # multiprocessing is only imported by servers that use it
+                        from concurrent.futures import ProcessPoolExecutor
+                        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+                    else:
+                        self._pool = ThreadPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def reserve(self):
+        """
+        Take one pending slot, for run() or for engine work driven from
+        elsewhere (a response stream). Returns release(), which may be called
+        more than once; raises Saturated when full.
+        """
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise Saturated()
+            self.pending += 1
+        held = [True]
+
+        def release():
+            with self._lock:
+                if held[0]:
+                    held[0] = False
+                    self.pending -= 1
+        return release
+
+    async def run(self, fn, *args):
+        """Await fn(*args) under the configured mode; raises Saturated when full."""
+        release = self.reserve()
+        try:
+            if self.mode == "inline":
+                return fn(*args)
+            return await asyncio.get_running_loop().run_in_executor(self._get_pool(), fn, *args)
+        finally:
+            release()
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def recycle(self):
+        """
+        Start a fresh pool on the next call; running work finishes on the old
+        one. Process workers are forked with the server's data, so this is
+        how they pick up a reloaded snapshot.
+        """
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode, "workers": self.workers, "pending": self.pending,
+            "max_pending": self.max_pending, "rejected": self.rejected,
+        }
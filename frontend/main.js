@@ -42,6 +42,22 @@ async function fetchWithRetry(url, options, retries = MAX_RETRIES) {
     }
 }
 
+// NDJSON stream from /generate/stream → one callback per event
+async function readEvents(response, onEvent) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    for (;;) {
+        const { done, value } = await reader.read();
+        buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        lines.filter(l => l.trim()).forEach(l => onEvent(JSON.parse(l)));
+        if (done) break;
+    }
+    if (buffer.trim()) onEvent(JSON.parse(buffer));
+}
+
 async function checkBackend() {
     try { await fetch(`${API_URL}/docs`, { method: 'HEAD', mode: 'no-cors' }); }
     catch { showStatus('⚠ Backend offline — start server.py on :8000', 'error'); }
@@ -57,13 +73,22 @@ async function generate() {
     resultsArea.classList.remove('visible');
 
     try {
-        const response = await fetchWithRetry(`${API_URL}/generate`, {
+        const response = await fetchWithRetry(`${API_URL}/generate/stream`, {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({ verse, seen: seenLines })
         });
-        const data = await response.json();
-        data.mode === 'word' ? renderWordMode(data) : renderVerseMode(data);
+        // Word mode arrives tier by tier: render PERFECT before assonance is done
+        const words = {};
+        await readEvents(response, event => {
+            if (event.event === 'tier') {
+                Object.assign(words, event.words);
+                renderWordMode({ words });
+            } else if (event.event === 'result') {
+                const data = event.result;
+                data.mode === 'word' ? renderWordMode(data) : renderVerseMode(data);
+            }
+        });
         showStatus('✓ Hit Generate again for fresh suggestions', 'success');
     } catch (error) {
         console.error(error);
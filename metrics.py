@@ -0,0 +1,135 @@
+"""
+In-process metrics in the Prometheus text format (GET /metrics).
+
+`span(name)` times a block of hot-path work into the SPANS histogram;
+histograms and counters are labelled by one label at most, which is all the
+server needs. Values that already live elsewhere (cache counters, corpus
+sizes) are read at scrape time by collectors registered with
+`register_collector`, so the hot path never updates them twice.
+
+Each process keeps its own registry: with EXECUTOR_MODE=process the engine
+spans are recorded in the pool processes and not exported.
+"""
+import threading
+import time
+from bisect import bisect_left
+
+# Seconds: 50us .. 5s
+TIME_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+                2.5, 5.0)
+COUNT_BUCKETS = (0, 1, 5, 10, 50, 100, 500, 1000, 5000, 10000, 50000)
+
+METRICS = []  # Histogram / Counter, in registration order
+COLLECTORS = []
+
+
+def _format(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs) -> str:
+    body = ",".join(f'{k}="{_escape(v)}"' for k, v in pairs if k)
+    return "{" + body + "}" if body else ""
+
+
+class Histogram:
+    def __init__(self, name: str, doc: str, label: str = "", buckets=TIME_BUCKETS):
+        self.name, self.doc, self.label = name, doc, label
+        self.buckets = tuple(buckets)
+        self._series = {}  # label value -> [count per bucket..., count above all, sum, count]
+        self._lock = threading.Lock()
+        METRICS.append(self)
+
+    def observe(self, value: float, label: str = ""):
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label)
+            if series is None:
+                series = self._series[label] = [0] * (len(self.buckets) + 3)
+            series[i] += 1  # i == len(buckets): only in +Inf
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, label: str = "") -> int:
+        series = self._series.get(label)
+        return series[-1] if series else 0
+
+    def render(self):
+        yield f"# HELP {self.name} {self.doc}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            series = {k: list(v) for k, v in self._series.items()}
+        for value, counts in sorted(series.items()):
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                yield f"{self.name}_bucket{_labels([(self.label, value), ('le', _format(bound))])} {cumulative}"
+            yield f"{self.name}_sum{_labels([(self.label, value)])} {_format(counts[-2])}"
+            yield f"{self.name}_count{_labels([(self.label, value)])} {counts[-1]}"
+
+
+class Counter:
+    def __init__(self, name: str, doc: str, label: str = ""):
+        self.name, self.doc, self.label = name, doc, label
+        self._values = {}
+        self._lock = threading.Lock()
+        METRICS.append(self)
+
+    def inc(self, label: str = "", amount: float = 1):
+        with self._lock:
+            self._values[label] = self._values.get(label, 0) + amount
+
+    def render(self):
+        yield f"# HELP {self.name} {self.doc}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            values = dict(self._values)
+        for value, total in sorted(values.items()):
+            yield f"{self.name}{_labels([(self.label, value)])} {_format(total)}"
+
+
+def register_collector(collect):
+    """
+    `collect()` is called per scrape and yields (name, type, help, samples),
+    samples being ({label: value}, number) pairs.
+    """
+    COLLECTORS.append(collect)
+    return collect
+
+
+def render() -> str:
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    for collect in COLLECTORS:
+        for name, kind, doc, samples in collect():
+            lines.append(f"# HELP {name} {doc}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{_labels(labels.items())} {_format(value)}")
+    return "\n".join(lines) + "\n"
+
+
+SPANS = Histogram("rymowanka_span_seconds", "Time spent per hot-path stage", "span")
+
+
+class span:
+    """`with span("normalize"): ...` records the block's wall time in SPANS."""
+    __slots__ = ("name", "t0")  # a plain class is cheaper per block than @contextmanager
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        SPANS.observe(time.perf_counter() - self.t0, self.name)
@@ -1,36 +1,249 @@
 import re
-from collections import defaultdict, namedtuple
+from array import array
+from bisect import bisect_left
+from heapq import heappush, heapreplace, nsmallest
+from itertools import chain, islice
+
+from word_store import WordEntry, WordStore
 
 # Precompile Regex Patterns
-RE_DZI = re.compile(r'dzi')
-RE_DZ_ZH = re.compile(r'dż|rz')
-RE_CH = re.compile(r'ch')
-RE_SOFTEN = {
-    'ci': re.compile(r'ci(?=[aeąęioóuy])'),
-    'si': re.compile(r'si(?=[aeąęioóuy])'),
-    'zi': re.compile(r'zi(?=[aeąęioóuy])'),
-    'ni': re.compile(r'ni(?=[aeąęioóuy])'),
-}
-RE_NASAL_END_A = re.compile(r'ą$')
-RE_NASAL_END_E = re.compile(r'ę$')
+# normalize() is one regex scan for the multi-letter rules plus one translate
+# table for the single letters. Same output as the former chain (dzi→dź,
+# dż|rz→ż, ch→h, ó→u, y→i, ą$→om, ę$→em, then łńśćźż→lnsczz): no rule can
+# produce another rule's input, so they need no ordering. The old ci/si/zi/ni
+# "softening" passes replaced each match with itself and are gone.
+RE_NORMALIZE = re.compile(r'dzi|dż|rz|ch|[ąę]$')
+# Same rules over "\n"-joined words: $ matches at the end of every word
+RE_NORMALIZE_LINES = re.compile(r'dzi|dż|rz|ch|[ąę]$', re.M)
+NORMALIZE_RULES = {'dzi': 'dz', 'dż': 'z', 'rz': 'z', 'ch': 'h', 'ą': 'om', 'ę': 'em'}
+NORMALIZE_TABLE = str.maketrans('óyłńśćźż', 'uilnsczz')
 RE_NASAL_SZ = re.compile(r'ą(?=[szżźćfwšč])')
 RE_NASAL_EZ = re.compile(r'ę(?=[szżźćfwšč])')
 RE_NON_ALPHANUM = re.compile(r'[^\w]')
 
-WordEntry = namedtuple('WordEntry', ['original', 'normalized', 'vowels', 'tail_d2', 'tail_d1'])
+# Slant rhymes: normalized tails with consonants folded into voicing and
+# nasal classes (b/p, d/t, g/k, w/f, z/s/sz, dz/c, dż/cz, and m/n where no
+# vowel follows), so d/t or om/on swaps share a signature. A softening i
+# (consonant + i + vowel) is j.
+RE_SLANT_DIGRAPHS = re.compile(r'sz|cz|dz|m(?![aeiouąę])')
+SLANT_DIGRAPHS = {'sz': 's', 'cz': 'c', 'dz': 'c', 'm': 'n'}
+SLANT_CLASSES = str.maketrans({'b': 'p', 'd': 't', 'g': 'k', 'w': 'f', 'z': 's', 'ą': 'on', 'ę': 'en'})
+RE_SOFT_I = re.compile(r'(?<=[^aeiou])i(?=[aeiou])')
+RE_VOWEL_RUNS = re.compile(r'([aeiou]+)')
+
+
+def _apply_rule(match):
+    return NORMALIZE_RULES[match.group()]
+
+
+def _slant_digraph(match):
+    return SLANT_DIGRAPHS[match.group()]
+
+
+def slant_key(tail: str) -> tuple:
+    """
+    (vowel skeleton, consonant clusters) of a normalized tail's slant
+    signature: 'woda' / 'kota' -> ('o-a', ('f', 't', '')) / ('o-a', ('k', 't', '')).
+    """
+    signature = RE_SOFT_I.sub('j', RE_SLANT_DIGRAPHS.sub(_slant_digraph, tail).translate(SLANT_CLASSES))
+    parts = RE_VOWEL_RUNS.split(signature)
+    return "-".join(parts[1::2]), tuple(parts[0::2])
+
+
+def levenshtein(a: str, b: str) -> int:
+    if a == b:
+        return 0
+    if len(a) <= 1 or len(b) <= 1:
+        # One side empty or a single letter: the longer side, less a match
+        a, b = (a, b) if len(a) <= len(b) else (b, a)
+        return len(b) - (a != "" and a in b)
+    previous = range(len(b) + 1)
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b):
+            current.append(min(previous[j] + (ca != cb), previous[j + 1] + 1, current[j] + 1))
+        previous = current
+    return previous[-1]
+
+
+def cluster_distance(a: tuple, b: tuple) -> int:
+    # Consonant edits between slant signatures of one vowel skeleton
+    return sum(map(levenshtein, a, b))
+
+
+class _CachedRanking(tuple):
+    """
+    A ranking in PhoneticEngine.cache. It holds the priority table it was
+    ranked with, so the table outlives the entry and its id (part of the
+    cache key) cannot be reused by a new table meanwhile. len() is the
+    candidate count the cache's size bound counts.
+    """
+
+    def __new__(cls, results, priority_by_id):
+        ranking = super().__new__(cls, results)
+        ranking.priority_by_id = priority_by_id
+        return ranking
+
+
+class RankedBuckets:
+    """
+    One index's buckets ordered for a priority_by_id table: per key, runs of
+    word ids by syllable count, each sorted by priority (best first, then by
+    word id, i.e. bucket order) as parallel (priorities, word ids) arrays.
+    Words the table drops (None) are left out. A key is ranked on first use,
+    so only buckets that are actually queried pay for the sort.
+    """
+
+    def __init__(self, index, priority_by_id):
+        self.index = index
+        self.priority_by_id = priority_by_id
+        self._runs = {}
+
+    def runs(self, key) -> dict:
+        runs = self._runs.get(key)
+        if runs is None:
+            priority = self.priority_by_id
+            groups = {}
+            for _, vowels, wid in self.index.candidate_ids(key):
+                boost = priority[wid]
+                if boost is not None:
+                    groups.setdefault(vowels, []).append((-boost, wid))
+            runs = {}
+            for vowels, group in groups.items():
+                group.sort()
+                runs[vowels] = (array("d", [-boost for boost, _ in group]), array("I", [wid for _, wid in group]))
+            self._runs[key] = runs
+        return runs
+
+
+def _shared_prefix(a: str, b: str) -> int:
+    n = min(len(a), len(b))
+    i = 0
+    while i < n and a[i] == b[i]:
+        i += 1
+    return i
+
+
+class SuffixIndex:
+    """
+    Word ids sorted by reversed normalized form. Words sharing a phonetic
+    tail of any length are contiguous, and walking outward from where a
+    word would sort visits the others by how many trailing characters they
+    share with it, longest first.
+    """
+
+    def __init__(self, store):
+        normalized = store.columns()[1]
+        reversed_forms = [norm[::-1] for norm in normalized]
+        self.order = array("I", sorted(range(len(normalized)), key=reversed_forms.__getitem__))
+        self.keys = [reversed_forms[wid] for wid in self.order]
+
+    def nearest(self, normalized: str):
+        """Yield (word id, shared tail length) with non-increasing shared length."""
+        key = normalized[::-1]
+        keys, order = self.keys, self.order
+        hi = bisect_left(keys, key)
+        lo = hi - 1
+        # Shared length only shrinks moving away from `key` on either side
+        lo_shared = _shared_prefix(keys[lo], key) if lo >= 0 else -1
+        hi_shared = _shared_prefix(keys[hi], key) if hi < len(keys) else -1
+        while lo_shared >= 0 or hi_shared >= 0:
+            if hi_shared >= lo_shared:
+                yield order[hi], hi_shared
+                hi += 1
+                hi_shared = _shared_prefix(keys[hi], key) if hi < len(keys) else -1
+            else:
+                yield order[lo], lo_shared
+                lo -= 1
+                lo_shared = _shared_prefix(keys[lo], key) if lo >= 0 else -1
+
+
+class BKTree:
+    """Burkhard-Keller tree: items under an integer metric, searched by radius."""
+
+    def __init__(self, distance, items=()):
+        self.distance = distance
+        self.root = None  # [item, {distance to item: child node}]
+        for item in items:
+            self.add(item)
+
+    def add(self, item):
+        if self.root is None:
+            self.root = [item, {}]
+            return
+        node = self.root
+        while True:
+            d = self.distance(item, node[0])
+            if d == 0:
+                return
+            child = node[1].get(d)
+            if child is None:
+                node[1][d] = [item, {}]
+                return
+            node = child
+
+    def search(self, item, radius: int) -> list:
+        """(distance, item) for every stored item within radius, unordered."""
+        found = []
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            d = self.distance(item, node[0])
+            if d <= radius:
+                found.append((d, node[0]))
+            # Triangle inequality: only subtrees at d +- radius can hold hits
+            stack.extend(child for dist, child in node[1].items() if d - radius <= dist <= d + radius)
+        return found
+
+
+class SlantIndex:
+    """
+    tail_d2 buckets grouped by slant_key: per vowel skeleton, the consonant
+    clusters seen and the tails that have them. Each skeleton gets a BKTree
+    over its clusters on first query, so a lookup compares the target with
+    a few hundred signatures of the same vowels instead of every word.
+    """
+
+    def __init__(self, store):
+        self.groups = {}  # skeleton -> {clusters: [tail_d2, ...]}
+        for tail in store.index_d2:
+            skeleton, clusters = slant_key(tail)
+            self.groups.setdefault(skeleton, {}).setdefault(clusters, []).append(tail)
+        self._trees = {}
+
+    def search(self, tail: str, max_distance: int) -> list:
+        """(distance, tail_d2) for buckets within max_distance consonant edits, nearest first."""
+        skeleton, clusters = slant_key(tail)
+        group = self.groups.get(skeleton)
+        if group is None:
+            return []
+        tree = self._trees.get(skeleton)
+        if tree is None:
+            tree = self._trees[skeleton] = BKTree(cluster_distance, sorted(group))
+        found = sorted(tree.search(clusters, max_distance))
+        return [(d, tail) for d, key in found for tail in group[key]]
+
 
 class PhoneticEngine:
-    def __init__(self, vocabulary=None):
+    # Hits examined per tier by the unranked scans (the ranked top-k path of
+    # find_candidates / iter_tiers needs no cap)
+    NEAR_SCAN_LIMIT = 2000  # words seen so far, including the PERFECT tier
+    ASSONANCE_SCAN_LIMIT = 3000
+
+    def __init__(self, vocabulary=None, cache=None):
         self.vowels = 'aeąęiouóuy'
         self.en_digraphs = {
             'design': 'dizajn', 'business': 'biznes', 'flow': 'floł', 'show': 'szoł',
             'online': 'onlajn', 'deadline': 'dedlajn', 'vibe': 'wajb', 'style': 'stajl'
         }
         
-        self.index_d2 = defaultdict(list)
-        self.index_d1 = defaultdict(list)
-        self.index_vowels = defaultdict(list) # New: Assonance index
-        self.word_map = {} # original -> WordEntry
+        # Optional result_cache.LRUCache for find_candidates / iter_tiers;
+        # cleared whenever the store is replaced
+        self.cache = cache
+
+        # Columnar word table + tail indexes (word_store.py); index_d2, index_d1,
+        # index_vowels and word_map are read-only Mapping views over it
+        self.store = WordStore.from_entries([])
         
         if vocabulary:
             self.build_index(vocabulary)
@@ -38,22 +251,17 @@ class PhoneticEngine:
     def normalize(self, word):
         w = word.lower()
         w = self.en_digraphs.get(w, w)
-        
-        # Table-based/Regex-lite transforms
-        w = RE_DZI.sub('dź', w)
-        w = RE_DZ_ZH.sub('ż', w)
-        w = RE_CH.sub('h', w)
-        
-        for char, reg in RE_SOFTEN.items():
-            w = reg.sub(char[0] + 'i', w)
-            
-        w = w.replace('ó', 'u').replace('y', 'i')
-        w = RE_NASAL_END_A.sub('om', w)
-        w = RE_NASAL_END_E.sub('em', w)
-        
-        # Simplification for indexing
-        w = w.translate(str.maketrans('łńśćźż', 'lnsczz'))
-        return w
+        w = RE_NORMALIZE.sub(_apply_rule, w)
+        return w.translate(NORMALIZE_TABLE)
+
+    def normalize_many(self, words):
+        """normalize() for a list of words, one regex scan and translate per batch."""
+        if any("\n" in w for w in words):
+            return [self.normalize(w) for w in words]
+        lowered = "\n".join(words).lower().split("\n")
+        lowered = map(self.en_digraphs.get, lowered, lowered)
+        joined = RE_NORMALIZE_LINES.sub(_apply_rule, "\n".join(lowered))
+        return joined.translate(NORMALIZE_TABLE).split("\n") if words else []
 
     def get_vowel_positions(self, word):
         """
@@ -83,90 +291,447 @@ class PhoneticEngine:
         if len(vowel_seq) > 2:
             vowel_seq = vowel_seq[-2:]
         
-        return WordEntry(word, norm, len(v_pos), tail_d2, tail_d1), vowel_seq
+        return WordEntry(word, norm, len(v_pos), tail_d2, tail_d1, vowel_seq)
+
+    def entry_columns(self, words):
+        """
+        build_entry for a list of words as columns (normalized, vowels,
+        tail_d2, tail_d1, vowel_seq), without a WordEntry per word.
+        """
+        normalized = self.normalize_many(words)
+        vowels, tails_d2, tails_d1, vowel_seqs = [], [], [], []
+        for norm, v_pos in zip(normalized, map(self.get_vowel_positions, normalized)):
+            vowels.append(len(v_pos))
+            if not v_pos:
+                tails_d2.append(norm)
+                tails_d1.append(norm)
+                vowel_seqs.append("")
+                continue
+            last = v_pos[-1]
+            tail_d1 = norm[last:]
+            tails_d1.append(tail_d1)
+            if len(v_pos) >= 2:
+                tails_d2.append(norm[v_pos[-2]:])
+                vowel_seqs.append(norm[v_pos[-2]] + norm[last])
+            else:
+                tails_d2.append(tail_d1)
+                vowel_seqs.append(norm[last])
+        return normalized, vowels, tails_d2, tails_d1, vowel_seqs
+
+    @property
+    def store(self):
+        return self._store
+
+    @store.setter
+    def store(self, store):
+        self._store = store
+        self._ranked_buckets = None  # (priority_by_id, {index name: RankedBuckets})
+        self._suffix_index = None  # SuffixIndex, built by the first find_deep_rhymes
+        self._slant_index = None  # SlantIndex, built by the first find_slant_rhymes
+        if self.cache is not None:
+            self.cache.clear()
+
+    @property
+    def index_d2(self):
+        return self.store.index_d2
+
+    @property
+    def index_d1(self):
+        return self.store.index_d1
+
+    @property
+    def index_vowels(self):
+        # Assonance index; words without vowels are left out
+        return self.store.index_vowels
+
+    @property
+    def word_map(self):
+        # original -> WordEntry
+        return self.store.word_map
 
     def build_index(self, vocabulary):
-        for word in vocabulary:
-            entry, vowel_seq = self.build_entry(word)
-            self.word_map[word] = entry
-            self.index_d2[entry.tail_d2].append(entry)
-            self.index_d1[entry.tail_d1].append(entry)
-            # Only index assonance if we have at least 1 vowel
-            if vowel_seq:
-                self.index_vowels[vowel_seq].append(entry)
-
-    def find_candidates(self, target_word):
-        entry_tuple = self.build_entry(target_word)
-        target = entry_tuple[0]
-        target_vowels = entry_tuple[1]
-        
-        # Tier 1: Multi-syllabic exact match (real rhymes)
-        perfect = self.index_d2.get(target.tail_d2, [])
-        
-        # Filter and score 
+        self.store = WordStore.from_entries(chain(self.store.entries(), self.entries(vocabulary)))
+
+    def entries(self, words, chunk_size=50000):
+        """
+        build_entry for each of `words`, in order. Words are normalized a
+        chunk at a time (entry_columns); only one chunk is held at once, so
+        from_entries can stream them.
+        """
+        words = iter(words)
+        while True:
+            chunk = list(islice(words, chunk_size))
+            if not chunk:
+                return
+            yield from map(WordEntry, chunk, *self.entry_columns(chunk))
+
+    def with_vocabulary(self, vocabulary):
+        """
+        New engine (no cache) indexing exactly `vocabulary`, for hot reloads:
+        entries for words this engine already has are reused, so only added
+        words are normalized. Word order follows `vocabulary`, as a fresh
+        build's would. Returns (engine, words added, words removed).
+        """
+        known = {entry.original: entry for entry in self.store.entries()}
+        words = list(dict.fromkeys(vocabulary))
+        added = [w for w in words if w not in known]
+        known.update(zip(added, self.entries(added)))
+        engine = PhoneticEngine()
+        engine.store = WordStore.from_entries(map(known.__getitem__, words))
+        return engine, len(added), len(self.store) - (len(words) - len(added))
+
+    @property
+    def suffix_index(self):
+        index = self._suffix_index
+        if index is None:
+            index = self._suffix_index = SuffixIndex(self.store)
+        return index
+
+    def find_deep_rhymes(self, target_word, k=15, min_depth=2, priority_by_id=None):
+        """
+        Words sharing the longest phonetic tail with target_word, as (word,
+        depth, shared tail) deepest first; depth counts the target's vowels
+        inside the shared tail (2 = a tail_d2 rhyme, 3+ = multi-syllable),
+        ties by longer tail. Walks the SuffixIndex outward from the target,
+        so a lookup costs about the tail length plus k steps instead of a
+        bucket scan, and stops below min_depth.
+        priority_by_id: optional table indexed by word id; None skips a word.
+        """
+        target = self.build_entry(target_word)
+        norm = target.normalized
+        v_pos = self.get_vowel_positions(norm)
+        if k <= 0 or len(v_pos) < min_depth:
+            return []
+        word = self.word_map.word
         results = []
+        for wid, shared in self.suffix_index.nearest(norm):
+            depth = len(v_pos) - bisect_left(v_pos, len(norm) - shared)
+            if depth < min_depth:
+                break
+            if priority_by_id is not None and priority_by_id[wid] is None:
+                continue
+            original = word(wid)
+            if original == target.original:
+                continue
+            results.append((original, depth, norm[len(norm) - shared:]))
+            if len(results) >= k:
+                break
+        return results
+
+    @property
+    def slant_index(self):
+        index = self._slant_index
+        if index is None:
+            index = self._slant_index = SlantIndex(self.store)
+        return index
+
+    def find_slant_rhymes(self, target_word, k=15, max_distance=1, priority_by_id=None):
+        """
+        Slant rhymes for target_word as (word, distance, tail_d2), nearest
+        first: words whose tail_d2 has the target's vowels and consonants
+        within max_distance edits once voicing and nasal pairs are folded
+        (distance 0: only such swaps, e.g. kot ~ kod, ziemią ~ plemion).
+        The target's own tail_d2 bucket is left out; that is the PERFECT
+        tier of find_candidates. Ties rank by score (slant base times
+        priority) and word id.
+        priority_by_id: optional table indexed by word id; None skips a word.
+        """
+        target = self.build_entry(target_word)
+        if k <= 0:
+            return []
+        results = []
+        hits = []  # (-score, word id, word, distance, tail) at the current distance
+        tiers = self.slant_index.search(target.tail_d2, max_distance)
+        for i, (distance, tail) in enumerate(tiers):
+            if tail != target.tail_d2:
+                for original, vowels, wid in self.index_d2.candidate_ids(tail):
+                    boost = 1.0 if priority_by_id is None else priority_by_id[wid]
+                    if boost is not None:
+                        score = self.score(target.vowels, vowels, 'SLANT') * boost
+                        hits.append((-score, wid, original, distance, tail))
+            if i + 1 == len(tiers) or tiers[i + 1][0] != distance:
+                # A nearer tier always ranks first, so it is cut to what is left of k
+                results.extend(hit[2:] for hit in nsmallest(k - len(results), hits))
+                hits = []
+                if len(results) >= k:
+                    break
+        return results
+
+    def _bucket(self, index, key):
+        # (original, syllable count, word id) triples, decoded a bucket at a time
+        return index.candidate_ids(key)
+
+    def find_candidates(self, target_word, k_per_grade=None, priority=None, priority_by_id=None):
+        """
+        Rhyme candidates as (word, grade, score), best first.
+
+        k_per_grade: keep only the best k of each grade, selected with bounded
+        heaps while scanning instead of sorting every hit.
+        priority(word): optional score multiplier; None drops the word.
+        priority_by_id: the same multipliers as a sequence indexed by word id
+        (e.g. built from a score_store.ScoreTable); used instead of priority.
+        With k_per_grade, it is answered from RankedBuckets: the exact top k
+        of every bucket, with no scan cap.
+        Results go through self.cache unless `priority` is given.
+        """
+        if k_per_grade is not None and k_per_grade <= 0:
+            return []
+        key = self._cache_key(target_word, k_per_grade, priority, priority_by_id)
+        cached = self._cached(key, priority_by_id)
+        if cached is not None:
+            return cached
+        if k_per_grade is not None or priority is not None or priority_by_id is not None:
+            heaps = {}
+            for _ in self._tiers(self.build_entry(target_word), heaps, k_per_grade, priority, priority_by_id):
+                pass
+            results = self._ranked(heaps)
+        else:
+            results = self._find_candidates(target_word)
+        self._remember(key, results, priority_by_id)
+        return results
+
+    def _cache_key(self, target_word, k_per_grade, priority, priority_by_id):
+        # None when the result cannot be cached: no cache, or a priority
+        # callable. Keyed on the word itself rather than its normalized form:
+        # homophones like może/morze share every bucket but each excludes only
+        # itself. The priority table is keyed by identity, so a request still
+        # ranking with a table replaced by a scores reload never serves, nor
+        # is served, the new table's results.
+        if self.cache is None or priority is not None:
+            return None
+        return target_word, k_per_grade, None if priority_by_id is None else id(priority_by_id)
+
+    def _cached(self, key, priority_by_id):
+        cached = None if key is None else self.cache.get(key)
+        if cached is None or cached.priority_by_id is not priority_by_id:
+            return None
+        return list(cached)
+
+    def _remember(self, key, results, priority_by_id):
+        if key is not None:
+            self.cache.put(key, _CachedRanking(results, priority_by_id))
+
+    def _find_candidates(self, target_word):
+        hits = self._scan(self.build_entry(target_word))
+        return [(word, grade, score) for word, grade, score, _ in sorted(hits, key=lambda x: x[2], reverse=True)]
+
+    def iter_tiers(self, target_word, k_per_grade=None, priority=None, priority_by_id=None, counts=None):
+        """
+        find_candidates tier by tier: yields (tier, ranked so far) once each of
+        "PERFECT" (tail_d2), "NEAR" (tail_d1) and "ASSONANCE" is scanned, so
+        exact-tail hits can be sent before the large assonance scan runs. The
+        last ranking equals find_candidates with the same arguments, and is
+        shared with it through self.cache: a cached target yields the final
+        ranking for every tier, with nothing scanned.
+        counts: optional dict, filled with the hits scanned per tier.
+        """
+        key = self._cache_key(target_word, k_per_grade, priority, priority_by_id)
+        cached = self._cached(key, priority_by_id)
+        if cached is not None:
+            for tier in ("PERFECT", "NEAR", "ASSONANCE"):
+                if counts is not None:
+                    counts[tier] = 0
+                yield tier, list(cached)
+            return
+        heaps = {}
+        for tier in self._tiers(self.build_entry(target_word), heaps, k_per_grade, priority, priority_by_id, counts):
+            ranked = self._ranked(heaps)
+            yield tier, ranked
+        self._remember(key, ranked, priority_by_id)
+
+    def _tiers(self, target, heaps, k, priority, priority_by_id, counts=None):
+        # Fills the per-grade heaps tier by tier, yielding each tier's name
+        if k is not None and k > 0 and priority_by_id is not None:
+            yield from self._ranked_tiers(target, heaps, k, priority_by_id, counts)
+            return
         seen = {target.original}
+        seq = 0
+        for tier, scan in (("PERFECT", self._scan_perfect), ("NEAR", self._scan_near),
+                           ("ASSONANCE", self._scan_assonance)):
+            before = seq
+            if k is None or k > 0:
+                seq = self._push(heaps, scan(target, seen), k, priority, seq, priority_by_id)
+            if counts is not None:
+                counts[tier] = before - seq  # _push counts seq down once per hit
+            yield tier
+
+    def _ranked_tiers(self, target, heaps, k, priority_by_id, counts=None):
+        # The same tiers over RankedBuckets runs. A run is walked best first
+        # and left at its first hit that cannot enter the grade's heap, so a
+        # tier costs about k per run instead of a capped alphabetical scan.
+        # Hits get the arrival rank an uncapped scan would give them (tier,
+        # then bucket order, which is word id order), so ties resolve alike.
+        ranked = self._ranked_buckets
+        if ranked is None or ranked[0] is not priority_by_id:
+            ranked = self._ranked_buckets = (priority_by_id, {})
+        buckets = ranked[1]
+        word = self.word_map.word
+        n = len(self.store)
+
+        # Words claimed by an earlier tier (whole buckets, as without caps)
+        excluded = set()
+        target_id = self.word_map.word_id(target.original)
+        if target_id >= 0:
+            excluded.add(target_id)
+
+        seq = 0
+        for tier, name, key in (
+            ("PERFECT", "d2", target.tail_d2),
+            ("NEAR", "d1", target.tail_d1 if len(target.tail_d1) >= 3 else None),
+            ("ASSONANCE", "vowels", target.vowel_seq or None),
+        ):
+            examined = 0
+            if key is not None:
+                index = getattr(self, f"index_{name}")
+                runs = buckets.get(name)
+                if runs is None:
+                    runs = buckets[name] = RankedBuckets(index, priority_by_id)
+                for vowels, (boosts, wids) in runs.runs(key).items():
+                    if tier == "ASSONANCE":
+                        grade, base = self._assonance_grade(target.vowels, vowels)
+                    else:
+                        grade, base = tier, self.score(target.vowels, vowels, tier)
+                    examined += self._push_run(heaps, grade, base, boosts, wids, k, seq, excluded, word)
+                ids = index.word_ids(key)
+                if ids is not None:
+                    excluded.update(ids)
+            seq -= n + 1
+            if counts is not None:
+                counts[tier] = examined
+            yield tier
+
+    @staticmethod
+    def _push_run(heaps, grade, base, boosts, wids, k, seq, excluded, word):
+        # One run of a tier: boosts non-increasing, so scores are too
+        heap = heaps.get(grade)
+        if heap is None:
+            heap = heaps[grade] = []
+        examined = 0
+        for boost, wid in zip(boosts, wids):
+            if wid in excluded:
+                continue
+            examined += 1
+            score = base * boost
+            arrival = seq - 1 - wid
+            if len(heap) < k:
+                heappush(heap, (score, base, arrival, word(wid), grade))
+            elif (score, base, arrival) > heap[0]:
+                heapreplace(heap, (score, base, arrival, word(wid), grade))
+            else:
+                break  # every later hit of this run ranks lower still
+        return examined
+
+    @staticmethod
+    def _push(heaps, hits, k, priority, seq=0, priority_by_id=None):
+        # One min-heap per grade keyed (score, base score, -arrival): the root
+        # is the current k-th best, so most hits are rejected by a single
+        # comparison. Ties resolve exactly like the full stable sort.
+        for word, grade, base, wid in hits:
+            seq -= 1
+            if priority_by_id is not None:
+                boost = priority_by_id[wid]
+                if boost is None:
+                    continue
+                score = base * boost
+            elif priority is None:
+                score = base
+            else:
+                boost = priority(word)
+                if boost is None:
+                    continue
+                score = base * boost
+            heap = heaps.get(grade)
+            if heap is None:
+                heap = heaps[grade] = []
+            if k is None or len(heap) < k:
+                heappush(heap, (score, base, seq, word, grade))
+            elif score >= heap[0][0]:
+                item = (score, base, seq, word, grade)
+                if item > heap[0]:
+                    heapreplace(heap, item)
+        return seq
+
+    @staticmethod
+    def _ranked(heaps):
+        best = sorted(chain.from_iterable(heaps.values()), reverse=True)
+        return [(word, grade, score) for score, _, _, word, grade in best]
+
+    def _scan(self, target):
+        """Yield (word, grade, base score, word id) for every hit, tier by tier."""
+        seen = {target.original}
+        yield from self._scan_perfect(target, seen)
+        yield from self._scan_near(target, seen)
+        yield from self._scan_assonance(target, seen)
+
+    def _scan_perfect(self, target, seen):
+        # Tier 1: Multi-syllabic exact match (real rhymes)
+        perfect = self._bucket(self.index_d2, target.tail_d2)
         
-        for cand in perfect:
-            if cand.original in seen: continue
-            score = self.score(target, cand, 'PERFECT')
-            results.append((cand.original, "PERFECT", score))
-            seen.add(cand.original)
+        # Filter and score 
+        for original, vowels, wid in perfect:
+            if original in seen: continue
+            score = self.score(target.vowels, vowels, 'PERFECT')
+            yield original, "PERFECT", score, wid
+            seen.add(original)
 
+    def _scan_near(self, target, seen):
         # Tier 2: Single-vowel match (Weak Rhymes)
         if len(target.tail_d1) >= 3:
-            near_candidates = self.index_d1.get(target.tail_d1, [])
-            for cand in near_candidates:
-                if cand.original in seen: continue
+            near_candidates = self._bucket(self.index_d1, target.tail_d1)
+            for original, vowels, wid in near_candidates:
+                if original in seen: continue
                 # Limit checking to prevent timeouts on common sounds
                 # (simple heuristic constraint)
-                if len(seen) > 2000: break 
+                if len(seen) > self.NEAR_SCAN_LIMIT: break
                 
-                score = self.score(target, cand, 'NEAR')
+                score = self.score(target.vowels, vowels, 'NEAR')
                 grade = "NEAR"
-                results.append((cand.original, grade, score))
-                seen.add(cand.original)
-        
+                yield original, grade, score, wid
+                seen.add(original)
+
+    def _scan_assonance(self, target, seen):
         # Tier 3: Assonance (Vowel Match) - The "Rap Rhyme"
         # This captures "kawa" ~ "mapa" (aa ~ aa)
+        target_vowels = target.vowel_seq
         if target_vowels:
-            assonance_candidates = self.index_vowels.get(target_vowels, [])
+            assonance_candidates = self._bucket(self.index_vowels, target_vowels)
             # IMPORTANT: Assonance lists can be huge (all words ending in 'a' or 'e')
             # So we must sample or traverse carefully. 
             # We shuffle or just take the first N? The vocab is sorted alphabetically usually.
             # Ideally we'd prefer words with same syllable count.
             
             count = 0
-            for cand in assonance_candidates:
-                if cand.original in seen: continue
+            for original, vowels, wid in assonance_candidates:
+                if original in seen: continue
                 
                 # Soft limit for performance
-                if count > 3000: break
+                if count > self.ASSONANCE_SCAN_LIMIT: break
                 count += 1
 
-                # Heuristic: Match syllable count for better flow
-                is_same_len = (cand.vowels == target.vowels)
-                
-                score = 0.6 # Base score for assonance
-                if is_same_len: score += 0.1
-                
-                # If consonant skeleton matches partially?
-                # For now just classify as DOMINANT if same syll + matched vowels
-                grade = "DOMINANT" if is_same_len else "NEAR"
-                
-                results.append((cand.original, grade, score))
-                seen.add(cand.original)
-            
-        return sorted(results, key=lambda x: x[2], reverse=True)
+                grade, score = self._assonance_grade(target.vowels, vowels)
+                yield original, grade, score, wid
+                seen.add(original)
+
+    @staticmethod
+    def _assonance_grade(target_vowels, cand_vowels):
+        # Heuristic: Match syllable count for better flow
+        is_same_len = (cand_vowels == target_vowels)
+
+        score = 0.6 # Base score for assonance
+        if is_same_len: score += 0.1
+
+        # If consonant skeleton matches partially?
+        # For now just classify as DOMINANT if same syll + matched vowels
+        return ("DOMINANT" if is_same_len else "NEAR"), score
 
-    def score(self, t, c, mode):
+    def score(self, target_vowels, cand_vowels, mode):
         # Base scores
         if mode == 'PERFECT': score = 1.0
         elif mode == 'NEAR': score = 0.7
         else: score = 0.5
         
         # Penalty for syllable count mismatch
-        syll_diff = abs(t.vowels - c.vowels)
+        syll_diff = abs(target_vowels - cand_vowels)
         if syll_diff > 1: score *= 0.8
         elif syll_diff == 1: score *= 0.95
         
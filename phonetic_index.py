@@ -0,0 +1,152 @@
+"""
+Compiled phonetic index.
+
+`python phonetic_index.py` builds the rhyme indexes once and writes the
+engine's WordStore sections (see word_store.py) to a compact binary artifact.
+`load_engine` maps the artifact read-only, so worker startup is a header parse
+and every worker on the host shares the same page-cache copy instead of its
+own heap copy.
+
+Layout (little-endian): MAGIC, sha256 of the source vocabulary file, the
+code_digest of ENGINE_CODE it was built by, a (offset, length) table for
+word_store.SECTIONS, then the 4-byte aligned sections themselves. An index
+built by other normalization or tail rules no longer loads, so it is
+rebuilt like one whose vocabulary changed.
+"""
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from functools import lru_cache
+from typing import Optional
+
+from phonetic_engine import PhoneticEngine
+from word_store import SECTIONS, WordStore
+
+MAGIC = b"RYMIDX03"
+ENGINE_CODE = ("phonetic_engine.py", "word_store.py")  # normalization, tails, word ids, sections
+
+_HEADER = struct.Struct("<8s32s32s")
+_CODE_DIR = os.path.dirname(os.path.abspath(__file__))
+_SECTION = struct.Struct("<QQ")
+
+
+def file_digest(path: str) -> bytes:
+    """sha256 of a source file; stored in the artifact to detect staleness."""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).digest()
+
+
+@lru_cache(maxsize=None)
+def code_digest(*names: str) -> bytes:
+    """
+    sha256 over source files beside this module: the code an artifact was
+    built by. Any edit to them (comments included) makes artifacts stale.
+    """
+    h = hashlib.sha256()
+    for name in names:
+        h.update(file_digest(os.path.join(_CODE_DIR, name)))
+    return h.digest()
+
+
+# --- Writer ---
+
+def write_index(engine: PhoneticEngine, path: str, digest: bytes = b"") -> None:
+    """Serialize an engine's WordStore to `path` (atomically)."""
+    sections = engine.store.sections()
+
+    payload = []
+    pos = _HEADER.size + _SECTION.size * len(SECTIONS)
+    table = []
+    for name, _ in SECTIONS:
+        data = _to_le_bytes(sections[name])
+        pad = -pos % 4
+        payload.append(b"\0" * pad + data)
+        pos += pad
+        table.append(_SECTION.pack(pos, len(data)))
+        pos += len(data)
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, digest.ljust(32, b"\0"), code_digest(*ENGINE_CODE)))
+        f.write(b"".join(table))
+        f.write(b"".join(payload))
+    os.replace(tmp, path)
+
+
+def _to_le_bytes(data) -> bytes:
+    if isinstance(data, array) and data.itemsize > 1 and sys.byteorder != "little":
+        data = array(data.typecode, data)
+        data.byteswap()
+    return bytes(data)
+
+
+# --- Reader ---
+
+class MappedIndex(WordStore):
+    """WordStore whose sections are read-only views into a compiled index file."""
+
+    def __init__(self, path: str, expected_digest: Optional[bytes] = None):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mm) < _HEADER.size + _SECTION.size * len(SECTIONS):
+            raise ValueError(f"{path}: truncated phonetic index")
+        magic, digest, code = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a phonetic index")
+        if code != code_digest(*ENGINE_CODE):
+            raise ValueError(f"{path}: stale index (engine code changed)")
+        if expected_digest is not None and digest != expected_digest.ljust(32, b"\0"):
+            raise ValueError(f"{path}: stale index (vocabulary changed)")
+
+        view = memoryview(self._mm)
+        sections = {}
+        for i, (name, fmt) in enumerate(SECTIONS):
+            start, length = _SECTION.unpack_from(self._mm, _HEADER.size + i * _SECTION.size)
+            if start + length > len(self._mm):
+                raise ValueError(f"{path}: truncated phonetic index")
+            sections[name] = _cast(view[start:start + length], fmt)
+        super().__init__(sections)
+
+
+def _cast(raw: memoryview, fmt: str):
+    if fmt == "B" or sys.byteorder == "little":
+        return raw.cast(fmt)
+    data = array(fmt, raw.tobytes())
+    data.byteswap()
+    return data
+
+
+def load_engine(path: str, expected_digest: Optional[bytes] = None) -> PhoneticEngine:
+    """PhoneticEngine backed by a compiled index file instead of a fresh build."""
+    engine = PhoneticEngine()
+    engine.store = MappedIndex(path, expected_digest)
+    return engine
+
+
+def read_vocabulary(path: str) -> list:
+    """Vocabulary file lines as the engine indexes them (3+ chars, lowercased)."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip().lower() for line in f if len(line.strip()) > 2]
+
+
+def compile_index(vocabulary_path: str, output_path: str) -> int:
+    """Offline step: read the vocabulary, build the engine, write the artifact."""
+    engine = PhoneticEngine(read_vocabulary(vocabulary_path))
+    write_index(engine, output_path, file_digest(vocabulary_path))
+    return len(engine.word_map)
+
+
+if __name__ == "__main__":
+    import time
+
+    base = os.path.dirname(os.path.abspath(__file__))
+    vocab_path = sys.argv[1] if len(sys.argv) > 1 else os.getenv("VOCABULARY_PATH", os.path.join(base, "words_pl.txt"))
+    out_path = sys.argv[2] if len(sys.argv) > 2 else os.getenv("PHONETIC_INDEX_PATH", os.path.join(base, "phonetic_index.bin"))
+
+    t0 = time.perf_counter()
+    n = compile_index(vocab_path, out_path)
+    print(f"Compiled {n} words → {out_path} ({os.path.getsize(out_path) / 1024:.0f} KB) in {time.perf_counter() - t0:.2f}s")
@@ -5,24 +5,26 @@ and a RhymeFinder class backed by PhoneticEngine.
 """
 
 import re
-from config import ENGINE
+from itertools import chain
+
+import config
+from phonetic_engine import PhoneticEngine
+from stanza_solver import normalize_scheme
+from syllables import RE_NON_WORD, SYLLABLES
+
+# normalize / get_vowel_positions need no vocabulary: an empty engine keeps
+# this module from loading the shared index until RhymeFinder is used
+_PHONETICS = PhoneticEngine()
 
-# --- Polish vowels for syllable counting ---
-_PL_VOWELS = set('aeęąioóuy')
 
 def count_syllables(word: str) -> int:
-    """Count syllables in a Polish word (= number of vowel groups)."""
-    word = re.sub(r'[^\w]', '', word.lower())
-    count = 0
-    in_vowel = False
-    for ch in word:
-        if ch in _PL_VOWELS:
-            if not in_vowel:
-                count += 1
-                in_vowel = True
-        else:
-            in_vowel = False
-    return max(count, 1) if word else 0
+    """Count syllables in a Polish word (see syllables.py for the rule)."""
+    return SYLLABLES.word(word)
+
+
+def count_line_syllables(lines) -> list:
+    """Syllables per line, for many lines at once."""
+    return SYLLABLES.lines(lines)
 
 
 def get_phonetic_suffix(word: str, depth: int = 2) -> str:
@@ -31,8 +33,8 @@ def get_phonetic_suffix(word: str, depth: int = 2) -> str:
     Uses PhoneticEngine.normalize for consistent representation.
     """
     clean = re.sub(r'[^\w]', '', word.lower())
-    norm = ENGINE.normalize(clean)
-    vowel_positions = ENGINE.get_vowel_positions(norm)
+    norm = _PHONETICS.normalize(clean)
+    vowel_positions = _PHONETICS.get_vowel_positions(norm)
 
     if not vowel_positions:
         return norm
@@ -41,56 +43,75 @@ def get_phonetic_suffix(word: str, depth: int = 2) -> str:
     return norm[start:]
 
 
+def last_word(line: str) -> str:
+    """Last word of a line, lowercased, punctuation stripped ("" for a blank line)."""
+    words = line.rsplit(None, 1)
+    return RE_NON_WORD.sub('', words[-1].lower()) if words else ""
+
+
+def suffix_table(words) -> dict:
+    """word -> (phonetic suffix, tail_d1) for each distinct word, normalized as one batch."""
+    distinct = list(dict.fromkeys(words))
+    _, _, tails_d2, tails_d1, _ = _PHONETICS.entry_columns(distinct)
+    return dict(zip(distinct, zip(tails_d2, tails_d1)))
+
+
+def scheme_matches(tails: list, scheme: str) -> bool:
+    """Lines under one scheme letter share a tail; `tails` has one per scheme letter."""
+    first = {}
+    for tail, letter in zip(tails, scheme):
+        if first.setdefault(letter, tail) != tail:
+            return False
+    return len(tails) == len(scheme)
+
+
+def verify_stanzas(stanzas, scheme="AABB") -> list:
+    """
+    verify_rhyme_scheme for many stanzas: (is_match, suffixes) per stanza.
+    scheme: one for every stanza or a list with one per stanza, each any
+    letters-only string ("AABB", "ABABCC", "AABBA"...). Each distinct last word
+    is normalized once per call, all of them in a single batch.
+    """
+    schemes = [scheme] * len(stanzas) if isinstance(scheme, str) else list(scheme)
+    if len(schemes) != len(stanzas):
+        raise ValueError("One scheme per stanza")
+    patterns = {s: normalize_scheme(s) for s in set(schemes)}
+    words = [[last_word(line) for line in stanza] for stanza in stanzas]
+    table = suffix_table(chain.from_iterable(words))
+    results = []
+    for stanza_words, s in zip(words, schemes):
+        pattern = patterns[s]
+        # Lines past the scheme are not checked
+        tails = [table[w][1] for w in stanza_words[:len(pattern)]]
+        results.append((scheme_matches(tails, pattern), [table[w][0] for w in stanza_words]))
+    return results
+
+
+def song_stanzas(song, size: int) -> list:
+    """
+    A song (text or lines) as consecutive stanzas of `size` lines, blank
+    lines dropped; a shorter last stanza is kept (and fails verification).
+    """
+    lines = song.splitlines() if isinstance(song, str) else list(song)
+    lines = [line for line in lines if line.strip()]
+    return [lines[i:i + size] for i in range(0, len(lines), size)]
+
+
 def verify_rhyme_scheme(stanza: list[str], scheme: str = "AABB") -> tuple[bool, list[str]]:
     """
     Verify that a stanza follows the given rhyme scheme.
     Returns (is_match, list_of_suffixes).
 
-    Supported schemes: AABB, ABAB, ABBA
+    Lines rhyme when they share the last vowel and what follows (tail_d1).
+    Any letters-only scheme works: AABB, ABAB, ABBA, ABABCC...
     """
-    suffixes = []
-    for line in stanza:
-        words = line.strip().split()
-        if not words:
-            suffixes.append("")
-            continue
-        last_word = re.sub(r'[^\w]', '', words[-1])
-        suffixes.append(get_phonetic_suffix(last_word))
-
-    if len(suffixes) < 4:
-        return False, suffixes
-
-    def rhymes(a: str, b: str) -> bool:
-        """Two suffixes rhyme if they share at least the last vowel+tail."""
-        sa = get_phonetic_suffix_raw(a)
-        sb = get_phonetic_suffix_raw(b)
-        return sa == sb or a == b
-
-    # For comparing suffixes directly (already extracted), just compare tail_d1
-    def tail1(s: str) -> str:
-        vp = ENGINE.get_vowel_positions(s)
-        if not vp:
-            return s
-        return s[vp[-1]:]
-
-    t = [tail1(s) for s in suffixes]
-
-    if scheme == "AABB":
-        ok = (t[0] == t[1]) and (t[2] == t[3])
-    elif scheme == "ABAB":
-        ok = (t[0] == t[2]) and (t[1] == t[3])
-    elif scheme == "ABBA":
-        ok = (t[0] == t[3]) and (t[1] == t[2])
-    else:
-        ok = False
-
-    return ok, suffixes
+    return verify_stanzas([stanza], scheme)[0]
 
 
 def get_phonetic_suffix_raw(word: str) -> str:
     """Simplified: return tail_d1 of a normalized word (last vowel + rest)."""
-    norm = ENGINE.normalize(re.sub(r'[^\w]', '', word.lower()))
-    vp = ENGINE.get_vowel_positions(norm)
+    norm = _PHONETICS.normalize(re.sub(r'[^\w]', '', word.lower()))
+    vp = _PHONETICS.get_vowel_positions(norm)
     if not vp:
         return norm
     return norm[vp[-1]:]
@@ -100,7 +121,7 @@ class RhymeFinder:
     """Wrapper around PhoneticEngine for finding rhymes using the shared instance."""
 
     def __init__(self):
-        self.engine = ENGINE
+        self.engine = config.get_engine()
 
     def find_rhymes(self, word: str, limit: int = 10) -> list[str]:
         """Find rhyming words for the given word."""
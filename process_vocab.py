@@ -1,136 +1,291 @@
-import re
+"""
+Vocabulary build: words_freq.txt, lyrics_corrected.txt, data/vulgar.txt and
+data/entities.txt → words_pl.txt, word_scores.json (+ word_scores.bin) and
+phonetic_index.bin.
+
+    python process_vocab.py [--force]
+
+Staged: every source is parsed into an intermediate cached in .vocab_cache/
+under the sha256 of its input, and every later stage is keyed by the
+digests of what it consumes. A rerun only recomputes stages whose inputs
+changed; e.g. a lyrics edit that adds no new word stops after the lyrics
+stage. Published files are rewritten only when their key changed or they
+were modified by hand (their digests are kept in the cache manifest).
+"""
+import hashlib
+import json
 import os
-from collections import Counter
+import re
+import sys
+import time
+from collections import namedtuple
+
+from phonetic_engine import PhoneticEngine
+from phonetic_index import ENGINE_CODE, code_digest, file_digest, write_index
+from score_store import SCORE_CODE, compile_scores
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = ".vocab_cache"
+STAGE_VERSION = 1  # bump when a stage's logic changes to invalidate the cache
 
-def process():
-    # Regex for Polish words: only letters (including polish ones)
-    pl_word_re = re.compile(r'^[a-ząćęłńóśźż]{3,}$')
-    vowels = set("aeiouyąęó")
+# Regex for Polish words: only letters (including polish ones)
+PL_WORD_RE = re.compile(r'^[a-ząćęłńóśźż]{3,}$')
+LYRICS_WORD_RE = re.compile(r'\b[a-ząćęłńóśźż]{3,}\b')
+VOWELS = set("aeiouyąęó")
+HIGH_FREQ = 15000  # top 15k frequency words are "high freq"
 
-    # 1. Load frequency words
+Intermediate = namedtuple("Intermediate", ["name", "path", "digest"])
+
+
+# --- Stages: sources → intermediates ---
+
+def read_freq_words(path: str) -> list:
+    """Frequency-ordered words (most frequent first)."""
     freq_words = []
-    try:
-        with open("words_freq.txt", "r", encoding="utf-8") as f:
-            for line in f:
-                parts = line.strip().split()
-                if parts:
-                    w = parts[0].lower()
-                    if pl_word_re.match(w):
-                        v_count = sum(1 for char in w if char in vowels)
-                        # Filter out things like 'aaaa' or 'bzzzz'
-                        if v_count >= 1:
-                             freq_words.append(w)
-    except FileNotFoundError:
-        print("words_freq.txt not found")
-
-    # 2. Load lyrics words
-    lyrics_words = set()
-    try:
-        with open("lyrics_corrected.txt", "r", encoding="utf-8") as f:
-            text = f.read().lower()
-            # extract words
-            words = re.findall(r'\b[a-ząćęłńóśźż]{3,}\b', text)
-            lyrics_words.update(words)
-    except FileNotFoundError:
-        print("lyrics_corrected.txt not found")
-
-    # 3. Combine
-    # We want lyrics words to definitely be there.
-    # We want common words to be there.
-    # 50k frequency words + all lyrics words
-    combined = set(freq_words) | lyrics_words
-    
-    # 4. Filter out some obvious junk if needed (non-polish letters were already handled in findall)
-    # But freq_words might have some foreign words.
-    
-    # 3. Load Vulgar words
-    vulgar_words = set()
-    try:
-        with open(os.path.join("data", "vulgar.txt"), "r", encoding="utf-8") as f:
-            for line in f:
-                w = line.strip().lower()
-                if w: vulgar_words.add(w)
-    except FileNotFoundError:
-        print("data/vulgar.txt not found")
-
-    # 4. Load Entities
-    # Format: Name|Inflection1,Inflection2|tag
-    entity_map = {} # word -> {"tag": tag, "base": base_name}
-    try:
-        with open(os.path.join("data", "entities.txt"), "r", encoding="utf-8") as f:
-            for line in f:
-                parts = line.strip().split("|")
-                if len(parts) >= 3:
-                    base_name = parts[0]
-                    inflections = parts[1].split(",")
-                    tag = parts[2]
-                    
-                    # Add base name parts if single word
-                    if " " not in base_name:
-                         w = base_name.lower()
-                         entity_map[w] = {"tag": tag, "base": base_name}
-                    
-                    # Add inflections
-                    for infl in inflections:
-                        w = infl.strip().lower()
-                        if w:
-                            entity_map[w] = {"tag": tag, "base": base_name}
-    except FileNotFoundError:
-        print("data/entities.txt not found")
-
-    # 5. Combine everything
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            parts = line.strip().split()
+            if parts:
+                w = parts[0].lower()
+                # Filter out things like 'bzzzz'
+                if PL_WORD_RE.match(w) and any(char in VOWELS for char in w):
+                    freq_words.append(w)
+    return freq_words
+
+
+def read_lyrics_words(path: str) -> list:
+    with open(path, "r", encoding="utf-8") as f:
+        return sorted(set(LYRICS_WORD_RE.findall(f.read().lower())))
+
+
+def read_vulgar_words(path: str) -> list:
+    with open(path, "r", encoding="utf-8") as f:
+        return sorted({line.strip().lower() for line in f if line.strip()})
+
+
+def read_entities(path: str) -> dict:
+    """
+    word -> {"tag": tag, "base": base_name}
+    Format: Name|Inflection1,Inflection2|tag
+    """
+    entity_map = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            parts = line.strip().split("|")
+            if len(parts) >= 3:
+                base_name, inflections, tag = parts[0], parts[1].split(","), parts[2]
+                # Add base name if single word
+                if " " not in base_name:
+                    entity_map[base_name.lower()] = {"tag": tag, "base": base_name}
+                for infl in inflections:
+                    w = infl.strip().lower()
+                    if w:
+                        entity_map[w] = {"tag": tag, "base": base_name}
+    return entity_map
+
+
+def merge_vocabulary(freq_words: list, lyrics_words: list, vulgar_words: list, entity_map: dict) -> list:
     # 50k freq + lyrics + vulgar + entities
-    combined = set(freq_words) | lyrics_words | vulgar_words | set(entity_map.keys())
-    
-    # 6. Sort
-    sorted_words = sorted(list(combined))
-    
-    with open("words_pl.txt", "w", encoding="utf-8") as f:
-        for w in sorted_words:
-            f.write(w + "\n")
+    return sorted(set(freq_words) | set(lyrics_words) | set(vulgar_words) | set(entity_map))
 
-    # 7. Create scores & metadata mapping
-    # Schema: "word": {"score": float, "flags": [str]}
+
+def score_words(words: list, freq_words: list, lyrics_words: list, vulgar_words: list, entity_map: dict) -> dict:
+    """word -> {"s": score, "f": [flags]} (flags omitted when empty)."""
+    lyrics_set, vulgar_set = set(lyrics_words), set(vulgar_words)
+    freq_set = set(freq_words[:HIGH_FREQ])
     metadata = {}
-    lyrics_set = set(lyrics_words)
-    freq_set = set(freq_words[:15000]) # top 15k are "high freq"
-    
-    for w in sorted_words:
+    for w in words:
         score = 0.5
         flags = []
-        
-        # Base scoring
-        if w in freq_set: score += 0.5
-        if w in lyrics_set: score += 1.0
-        
-        # Entity logic
+        if w in freq_set:
+            score += 0.5
+        if w in lyrics_set:
+            score += 1.0
         if w in entity_map:
-            ent = entity_map[w]
-            score += 2.0 # Huge boost for matching an entity
+            score += 2.0  # Huge boost for matching an entity
             flags.append("entity")
-            flags.append(ent["tag"]) # e.g. "rapper", "city"
-            
-        # Vulgar logic
-        if w in vulgar_words:
-            # Maybe slight boost to ensure they appear if requested, but not too high
-            # Actually user said "highlight", not "hide".
-            # Let's give them good visibility.
-            if score < 1.0: score = 1.0
+            flags.append(entity_map[w]["tag"])  # e.g. "rapper", "city"
+        if w in vulgar_set:
+            # Highlighted, not hidden: make sure they are visible
+            if score < 1.0:
+                score = 1.0
             flags.append("vulgar")
 
-        # Save compact if interesting, else just score
-        # For backward compatibility or size, we can just save the dict object
         match_data = {"s": round(score, 2)}
         if flags:
             match_data["f"] = flags
-        
         metadata[w] = match_data
+    return metadata
+
+
+# --- Stages: intermediates → published artifacts ---
+
+def write_vocabulary(words: list, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for w in words:
+            f.write(w + "\n")
+
 
-    import json
-    with open("word_scores.json", "w", encoding="utf-8") as f:
+def write_word_scores(metadata: dict, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
         json.dump(metadata, f)
-            
-    print(f"Vocab updated: {len(sorted_words)} words. Metadata saved.")
+
+
+def write_phonetic_index(words: list, vocabulary_path: str, path: str) -> None:
+    # Same rows as config's PhoneticEngine(words_pl.txt); stamped with the
+    # words_pl.txt digest so the server maps it instead of normalizing at boot
+    engine = PhoneticEngine()
+    engine.build_index(w.strip().lower() for w in words if len(w.strip()) > 2)
+    write_index(engine, path, file_digest(vocabulary_path))
+
+
+# --- Cache ---
+
+def _atomic_write(path: str, data: bytes) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class Pipeline:
+    """
+    Content-hash cache for the stages above. `intermediate` caches a stage's
+    JSON-able result; `publish` runs a writer only when its key or its
+    output files changed. `ran` / `cached` list stage names per outcome.
+    """
+
+    def __init__(self, cache_dir: str, force: bool = False):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self.manifest_path = os.path.join(cache_dir, "manifest.json")
+        self.manifest = {}
+        if not force:
+            try:
+                with open(self.manifest_path, "r", encoding="utf-8") as f:
+                    self.manifest = json.load(f)
+            except (OSError, ValueError):
+                pass
+        self.force = force
+        self.ran, self.cached, self.timings = [], [], {}
+        self._values = {}
+
+    @staticmethod
+    def key(name: str, digests) -> str:
+        h = hashlib.sha256(f"{name}:{STAGE_VERSION}".encode())
+        for digest in digests:
+            h.update(digest)
+        return h.hexdigest()
+
+    @staticmethod
+    def source(path: str) -> bytes:
+        """Digest of a source file; a missing file hashes like an empty one."""
+        try:
+            return file_digest(path)
+        except FileNotFoundError:
+            return hashlib.sha256(b"").digest()
+
+    def _run(self, name: str, fn):
+        t0 = time.perf_counter()
+        result = fn()
+        self.timings[name] = time.perf_counter() - t0
+        self.ran.append(name)
+        return result
+
+    def intermediate(self, name: str, digests, compute) -> Intermediate:
+        path = os.path.join(self.cache_dir, f"{name}.{self.key(name, digests)[:16]}.json")
+        if self.force or not os.path.exists(path):
+            value = self._run(name, compute)
+            _atomic_write(path, json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+            self._values[path] = value
+        else:
+            self.cached.append(name)
+        return Intermediate(name, path, file_digest(path))
+
+    def load(self, item: Intermediate):
+        if item.path not in self._values:
+            with open(item.path, "r", encoding="utf-8") as f:
+                self._values[item.path] = json.load(f)
+        return self._values[item.path]
+
+    def publish(self, name: str, digests, outputs: list, write) -> bool:
+        """Run `write()` unless `outputs` are what the same key produced last time."""
+        key = self.key(name, digests)
+        entry = self.manifest.get(name)
+        if not self.force and entry and entry["key"] == key and all(
+            os.path.exists(p) and file_digest(p).hex() == entry["outputs"].get(p) for p in outputs
+        ):
+            self.cached.append(name)
+            return False
+        self._run(name, write)
+        self.manifest[name] = {"key": key, "outputs": {p: file_digest(p).hex() for p in outputs}}
+        _atomic_write(self.manifest_path, json.dumps(self.manifest, indent=1).encode("utf-8"))
+        return True
+
+    def prune(self, keep) -> None:
+        """Drop cached intermediates not produced by this run."""
+        keep = {os.path.basename(item.path) for item in keep} | {"manifest.json"}
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".json") and name not in keep:
+                os.remove(os.path.join(self.cache_dir, name))
+
+
+def process(base_dir: str = BASE_DIR, force: bool = False, cache_dir: str = None,
+            vocabulary_path: str = None, scores_path: str = None,
+            score_table_path: str = None, index_path: str = None) -> Pipeline:
+    env = os.getenv
+    vocabulary_path = vocabulary_path or env("VOCABULARY_PATH", os.path.join(base_dir, "words_pl.txt"))
+    scores_path = scores_path or env("SCORES_PATH", os.path.join(base_dir, "word_scores.json"))
+    score_table_path = score_table_path or env("SCORE_TABLE_PATH", os.path.join(base_dir, "word_scores.bin"))
+    index_path = index_path or env("PHONETIC_INDEX_PATH", os.path.join(base_dir, "phonetic_index.bin"))
+    pipeline = Pipeline(cache_dir or os.path.join(base_dir, CACHE_DIR), force)
+
+    def parse(name, rel_path, reader, empty):
+        path = os.path.join(base_dir, rel_path)
+
+        def compute():
+            try:
+                return reader(path)
+            except FileNotFoundError:
+                print(f"{rel_path} not found")
+                return empty
+        return pipeline.intermediate(name, [pipeline.source(path)], compute)
+
+    # 1. Sources
+    sources = [
+        parse("freq_words", "words_freq.txt", read_freq_words, []),
+        parse("lyrics_words", "lyrics_corrected.txt", read_lyrics_words, []),
+        parse("vulgar_words", os.path.join("data", "vulgar.txt"), read_vulgar_words, []),
+        parse("entities", os.path.join("data", "entities.txt"), read_entities, {}),
+    ]
+    digests = [item.digest for item in sources]
+    values = lambda: [pipeline.load(item) for item in sources]  # noqa: E731
+
+    # 2. Vocabulary and scores
+    vocabulary = pipeline.intermediate("vocabulary", digests, lambda: merge_vocabulary(*values()))
+    pipeline.publish("words_pl", [vocabulary.digest], [vocabulary_path],
+                     lambda: write_vocabulary(pipeline.load(vocabulary), vocabulary_path))
+    scores = pipeline.intermediate("scores", [vocabulary.digest] + digests,
+                                   lambda: score_words(pipeline.load(vocabulary), *values()))
+    pipeline.publish("word_scores", [scores.digest], [scores_path],
+                     lambda: write_word_scores(pipeline.load(scores), scores_path))
+
+    # 3. Serving artifacts, keyed by the published files they are stamped with
+    pipeline.publish("score_table", [file_digest(scores_path), file_digest(vocabulary_path), code_digest(*SCORE_CODE)],
+                     [score_table_path],
+                     lambda: compile_scores(scores_path, vocabulary_path, score_table_path))
+    pipeline.publish("phonetic_index", [file_digest(vocabulary_path), code_digest(*ENGINE_CODE)], [index_path],
+                     lambda: write_phonetic_index(pipeline.load(vocabulary), vocabulary_path, index_path))
+
+    pipeline.prune(sources + [vocabulary, scores])
+    return pipeline
+
 
 if __name__ == "__main__":
-    process()
+    t0 = time.perf_counter()
+    result = process(force="--force" in sys.argv[1:])
+    for name in result.ran:
+        print(f"  ran    {name:15} {result.timings[name]:6.2f}s")
+    for name in result.cached:
+        print(f"  cached {name}")
+    print(f"Vocab pipeline done in {time.perf_counter() - t0:.2f}s")
@@ -0,0 +1,162 @@
+"""
+Token-bucket rate limiting per client key (IP).
+
+Each key holds one (tokens, stamp) pair: the bucket refills continuously at
+`per_minute / 60` tokens per second up to `per_minute`, and a request takes
+one token. A key left alone for a full refill (60s) is indistinguishable
+from a new one, so sweeping drops it; memory is bounded by the keys seen in
+the last minute instead of every key ever seen.
+
+Backends hold the buckets:
+    memory  per process, an insertion-ordered dict: least recently used
+            keys sit at the front, so a sweep pops idle keys in O(evicted)
+    sqlite  one table in a local file shared by every worker on the host,
+            so the limit holds across uvicorn workers
+"""
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+BACKENDS = ("memory", "sqlite")
+
+
+def refill(tokens: float, elapsed: float, capacity: float, rate: float):
+    """Take one token from a bucket: (tokens left, seconds to wait; 0 = admitted)."""
+    tokens = min(capacity, tokens + elapsed * rate)
+    if tokens >= 1.0:
+        return tokens - 1.0, 0.0
+    return tokens, (1.0 - tokens) / rate
+
+
+class MemoryBackend:
+    blocking = False  # a dict behind a lock: cheap enough for the event loop
+
+    def __init__(self, sweep_interval: float = 60.0):
+        self.sweep_interval = sweep_interval
+        self._buckets = OrderedDict()  # key -> (tokens, stamp), least recently used first
+        self._lock = threading.Lock()
+        self._next_sweep = 0.0
+
+    def take(self, key: str, now: float, capacity: float, rate: float) -> float:
+        with self._lock:
+            buckets = self._buckets
+            state = buckets.get(key)
+            if state is None:
+                tokens, wait = refill(capacity, 0.0, capacity, rate)
+            else:
+                tokens, wait = refill(state[0], now - state[1], capacity, rate)
+                buckets.move_to_end(key)
+            buckets[key] = (tokens, now)
+            if now >= self._next_sweep:
+                self._sweep(now - capacity / rate)
+                self._next_sweep = now + self.sweep_interval
+            return wait
+
+    def _sweep(self, idle_before: float):
+        buckets = self._buckets
+        while buckets:
+            key, (_, stamp) = next(iter(buckets.items()))
+            if stamp > idle_before:
+                break
+            del buckets[key]
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class SQLiteBackend:
+    """Buckets in a WAL-mode SQLite file; each thread gets its own connection."""
+
+    blocking = True  # file I/O, and up to `timeout` waiting on another worker's lock
+
+    def __init__(self, path: str, sweep_interval: float = 60.0, timeout: float = 0.05):
+        self.path = path
+        self.sweep_interval = sweep_interval
+        self.timeout = timeout
+        self.errors = 0
+        self._local = threading.local()
+        self._next_sweep = 0.0
+        self._conn()  # create the table up front
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")  # losing a few buckets on a crash is harmless
+            conn.execute("CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL, stamp REAL)")
+            self._local.conn = conn
+        return conn
+
+    def take(self, key: str, now: float, capacity: float, rate: float) -> float:
+        conn = self._conn()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT tokens, stamp FROM buckets WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    tokens, wait = refill(capacity, 0.0, capacity, rate)
+                else:
+                    tokens, wait = refill(row[0], now - row[1], capacity, rate)
+                conn.execute("INSERT OR REPLACE INTO buckets VALUES (?, ?, ?)", (key, tokens, now))
+                if now >= self._next_sweep:
+                    conn.execute("DELETE FROM buckets WHERE stamp <= ?", (now - capacity / rate,))
+                    self._next_sweep = now + self.sweep_interval
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.OperationalError:
+            # Locked past `timeout` by other workers: let the request through
+            # rather than hold it up
+            self.errors += 1
+            return 0.0
+        return wait
+
+    def __len__(self):
+        return self._conn().execute("SELECT COUNT(*) FROM buckets").fetchone()[0]
+
+    def reset(self):
+        self._conn().execute("DELETE FROM buckets")
+
+
+class RateLimiter:
+    """`per_minute` requests per key per minute, in bursts of up to `per_minute`."""
+
+    def __init__(self, per_minute: float, backend=None, clock=time.time):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.backend = backend if backend is not None else MemoryBackend()
+        # Wall clock: the sqlite backend compares stamps across processes
+        self.clock = clock
+
+    @property
+    def blocking(self) -> bool:
+        """Whether allow() may block (callers on an event loop run it in a thread)."""
+        return self.rate > 0 and self.backend.blocking
+
+    def allow(self, key: str) -> float:
+        """0.0 if a request from `key` may proceed, else seconds until it may."""
+        if self.rate <= 0:
+            return 0.0
+        return self.backend.take(key, self.clock(), self.capacity, self.rate)
+
+    def reset(self):
+        self.backend.reset()
+
+
+def make_rate_limiter(per_minute: float, backend: str = "memory", path: str = "",
+                      sweep_interval: float = 60.0) -> RateLimiter:
+    if backend == "memory":
+        return RateLimiter(per_minute, MemoryBackend(sweep_interval))
+    if backend == "sqlite":
+        path = path or os.path.join(tempfile.gettempdir(), "rymowanka_rate_limit.sqlite3")
+        return RateLimiter(per_minute, SQLiteBackend(path, sweep_interval))
+    raise ValueError(f"Unknown rate limit backend {backend!r} (expected one of {', '.join(BACKENDS)})")
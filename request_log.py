@@ -0,0 +1,55 @@
+"""
+Sampled, non-blocking per-request logging.
+
+`sample()` decides once per request whether to log it (LOG_SAMPLE_RATE of
+them). Records are handed to a queue as they are, message and arguments
+unformatted; a background QueueListener thread formats them and writes to
+stdout, so a request never waits on the terminal or a log pipe.
+"""
+import logging
+import queue
+import random
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+
+class _DeferredQueueHandler(QueueHandler):
+    def prepare(self, record):
+        # The stock handler formats in the caller; the listener does it here
+        return record
+
+
+class RequestLog:
+    def __init__(self, name: str = "rymowanka.requests", sample_rate: float = 0.01, stream=None):
+        self.sample_rate = sample_rate
+        self.stream = stream
+        self.logger = logging.getLogger(name)
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self._queue = queue.SimpleQueue()
+        self.logger.addHandler(_DeferredQueueHandler(self._queue))
+        self._listener = None
+
+    def sample(self) -> bool:
+        if self.sample_rate >= 1:
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def info(self, msg: str, *args):
+        if self._listener is None:
+            self.start()
+        self.logger.info(msg, *args)
+
+    def start(self):
+        """Start the writer thread (done by the first info() call)."""
+        if self._listener is None:
+            handler = logging.StreamHandler(self.stream or sys.stdout)
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            self._listener = QueueListener(self._queue, handler)
+            self._listener.start()
+
+    def stop(self):
+        """Flush queued records and stop the writer thread."""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
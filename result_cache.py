@@ -0,0 +1,69 @@
+"""
+Bounded, size-aware LRU cache for rhyme results.
+"""
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    LRU cache bounded both by entry count and by total size, where an entry's
+    size is `sizeof(value)` (e.g. the number of candidates it holds).
+    Thread-safe; keeps hit/miss/eviction counters.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_size: int = 0, sizeof=len):
+        self.max_entries = max_entries
+        self.max_size = max_size  # 0 = unbounded by size
+        self.sizeof = sizeof
+        self._data = OrderedDict()  # key -> (value, size)
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key, value):
+        if self.max_entries <= 0:
+            return
+        size = self.sizeof(value)
+        if self.max_size and size > self.max_size:
+            return  # would evict everything else; not worth caching
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._size -= old[1]
+            self._data[key] = (value, size)
+            self._size += size
+            while len(self._data) > self.max_entries or (self.max_size and self._size > self.max_size):
+                _, (_, evicted_size) = self._data.popitem(last=False)
+                self._size -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """Invalidation hook: drop every entry (counters are kept)."""
+        with self._lock:
+            self._data.clear()
+            self._size = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._data), "size": self._size,
+            "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
@@ -0,0 +1,264 @@
+"""
+Columnar word scores, aligned with the engine's word ids.
+
+`python score_store.py` converts word_scores.json to word_scores.bin: a
+float32 score and a uint32 flag bitmask per vocabulary word id, so the hot
+path reads `scores[wid]` instead of hashing words into ~54k small dicts.
+`ScoreTable` maps the file read-only (one page-cache copy shared by every
+uvicorn worker) or builds the same columns in memory from the JSON. It is
+also a Mapping with the JSON's values ({"s": score, "f": [flags]}), so it
+drops in for WORD_SCORES.
+
+Scores are multiples of 0.5 in practice, which float32 holds exactly.
+Vocabulary words without a score hold NaN; scored words outside the
+vocabulary go to a small sorted "extra" section.
+
+Layout (little-endian): MAGIC, sha256 of the source JSON, sha256 of the
+vocabulary file the ids refer to, the phonetic_index.code_digest of
+SCORE_CODE (word ids come from the engine), a (offset, length) table for
+SECTIONS, then the 8-byte aligned sections.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Mapping
+from typing import Optional
+
+from phonetic_index import ENGINE_CODE, _cast, _to_le_bytes, code_digest, file_digest, read_vocabulary
+
+MAGIC = b"RYMSCR03"
+SCORE_CODE = ENGINE_CODE + ("score_store.py",)
+
+SECTIONS = (
+    ("scores", "f"),  # per word id; NaN = no score
+    ("flags", "I"),  # per word id; bit i set = flag_names[i]
+    ("extra_offsets", "I"),  # scored words outside the vocabulary, sorted by utf-8 bytes
+    ("extra_data", "B"),
+    ("extra_scores", "f"),
+    ("extra_flags", "I"),
+    ("flag_names", "B"),  # "\n"-joined
+)
+
+_HEADER = struct.Struct("<8s32s32s32s")
+_SECTION = struct.Struct("<QQ")
+
+DEFAULT_SCORE = 0.5
+MISSING = float("nan")
+
+
+def build_sections(scores: dict, vocabulary) -> dict:
+    """Section buffers for a WORD_SCORES-shaped dict, rows in `vocabulary` order."""
+    # Bits in first-seen order, so decoded lists keep the source's order
+    # ("entity" before its category)
+    flag_names = list(dict.fromkeys(f for meta in scores.values() if isinstance(meta, dict) for f in meta.get("f", [])))
+    if len(flag_names) > 32:
+        raise ValueError(f"Too many distinct flags for a 32-bit mask ({len(flag_names)})")
+    bit = {name: 1 << i for i, name in enumerate(flag_names)}
+
+    def row(meta):
+        if isinstance(meta, (int, float)):  # legacy float-only entries
+            return meta, 0
+        mask = 0
+        for f in meta.get("f", []):
+            mask |= bit[f]
+        return meta.get("s", DEFAULT_SCORE), mask
+
+    values, masks = array("f"), array("I")
+    in_vocabulary = set()
+    for word in vocabulary:
+        meta = scores.get(word)
+        score, mask = row(meta) if meta is not None else (MISSING, 0)
+        values.append(score)
+        masks.append(mask)
+        in_vocabulary.add(word)
+
+    extra_offsets, blob = array("I", [0]), bytearray()
+    extra_values, extra_masks = array("f"), array("I")
+    for raw in sorted(word.encode("utf-8") for word in scores if word not in in_vocabulary):
+        score, mask = row(scores[raw.decode("utf-8")])
+        blob += raw
+        extra_offsets.append(len(blob))
+        extra_values.append(score)
+        extra_masks.append(mask)
+
+    return {
+        "scores": values, "flags": masks, "extra_offsets": extra_offsets, "extra_data": bytes(blob),
+        "extra_scores": extra_values, "extra_flags": extra_masks,
+        "flag_names": "\n".join(flag_names).encode("utf-8"),
+    }
+
+
+def write_sections(sections: dict, path: str, digest: bytes = b"", vocabulary_digest: bytes = b"") -> None:
+    """Serialize score sections to `path` (atomically)."""
+    payload, table = [], []
+    pos = _HEADER.size + _SECTION.size * len(SECTIONS)
+    for name, _ in SECTIONS:
+        data = _to_le_bytes(sections[name])
+        pad = -pos % 8
+        payload.append(b"\0" * pad + data)
+        pos += pad
+        table.append(_SECTION.pack(pos, len(data)))
+        pos += len(data)
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, digest.ljust(32, b"\0"), vocabulary_digest.ljust(32, b"\0"),
+                             code_digest(*SCORE_CODE)))
+        f.write(b"".join(table))
+        f.write(b"".join(payload))
+    os.replace(tmp, path)
+
+
+def write_scores(scores: dict, vocabulary, path: str, digest: bytes = b"", vocabulary_digest: bytes = b"") -> None:
+    write_sections(build_sections(scores, vocabulary), path, digest, vocabulary_digest)
+
+
+def compile_scores(json_path: str, vocabulary_path: str, output_path: str) -> int:
+    """Converter: word_scores.json + the vocabulary it is indexed by → score table."""
+    with open(json_path, "r", encoding="utf-8") as f:
+        scores = json.load(f)
+    # Word ids are vocabulary rows after PhoneticEngine's de-duplication
+    vocabulary = dict.fromkeys(read_vocabulary(vocabulary_path))
+    write_scores(scores, vocabulary, output_path, file_digest(json_path), file_digest(vocabulary_path))
+    return len(scores)
+
+
+class ScoreTable(Mapping):
+    """
+    word -> {"s": score, "f": [flags]}, plus by-id columns `scores` (float32,
+    NaN = unscored) and `flag_masks` for word ids of `vocabulary` (the
+    engine's word_map: word_id(word) and iteration in id order).
+    """
+
+    mapped = False
+
+    def __init__(self, path: str, vocabulary, expected_digest: Optional[bytes] = None,
+                 expected_vocabulary_digest: Optional[bytes] = None):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mm) < _HEADER.size + _SECTION.size * len(SECTIONS):
+            raise ValueError(f"{path}: truncated score table")
+        magic, digest, vocabulary_digest, code = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a score table")
+        if code != code_digest(*SCORE_CODE):
+            raise ValueError(f"{path}: stale score table (engine or score code changed)")
+        if expected_digest is not None and digest != expected_digest.ljust(32, b"\0"):
+            raise ValueError(f"{path}: stale score table (word_scores.json changed)")
+        if expected_vocabulary_digest is not None and vocabulary_digest != expected_vocabulary_digest.ljust(32, b"\0"):
+            raise ValueError(f"{path}: stale score table (vocabulary changed)")
+
+        view = memoryview(self._mm)
+        sections = {}
+        for i, (name, fmt) in enumerate(SECTIONS):
+            start, length = _SECTION.unpack_from(self._mm, _HEADER.size + (i * _SECTION.size))
+            if start + length > len(self._mm):
+                raise ValueError(f"{path}: truncated score table")
+            sections[name] = _cast(view[start:start + length], fmt)
+        if len(sections["scores"]) != len(vocabulary):
+            raise ValueError(f"{path}: score table does not match the vocabulary")
+        self._attach(sections, vocabulary)
+        self.mapped = True
+
+    @classmethod
+    def from_scores(cls, scores: dict, vocabulary) -> "ScoreTable":
+        """In-memory table for a WORD_SCORES-shaped dict."""
+        table = cls.__new__(cls)
+        table._attach(build_sections(scores, vocabulary), vocabulary)
+        return table
+
+    def aligned(self, vocabulary) -> "ScoreTable":
+        """The same scores re-indexed by another vocabulary's word ids."""
+        return ScoreTable.from_scores(dict(self.items()), vocabulary)
+
+    def _attach(self, sections: dict, vocabulary):
+        self.sections = sections
+        self.vocabulary = vocabulary
+        self.scores, self.flag_masks = sections["scores"], sections["flags"]
+        self._extra_offsets, self._extra_data = sections["extra_offsets"], sections["extra_data"]
+        names = str(sections["flag_names"], "utf-8")
+        self.flag_names = names.split("\n") if names else []
+        self._count = sum(1 for s in self.scores if s == s) + len(sections["extra_scores"])
+
+    def write(self, path: str, digest: bytes = b"", vocabulary_digest: bytes = b"") -> None:
+        write_sections(self.sections, path, digest, vocabulary_digest)
+
+    def flags(self, mask: int) -> list:
+        return [name for i, name in enumerate(self.flag_names) if mask >> i & 1]
+
+    def score(self, wid: int) -> float:
+        """Score of a vocabulary word id, DEFAULT_SCORE where unscored."""
+        score = self.scores[wid]
+        return score if score == score else DEFAULT_SCORE
+
+    def _extra(self, i: int) -> bytes:
+        return bytes(self._extra_data[self._extra_offsets[i]:self._extra_offsets[i + 1]])
+
+    def _extra_index(self, word: str) -> int:
+        raw = word.encode("utf-8")
+        lo, hi = 0, len(self._extra_offsets) - 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._extra(mid) < raw:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self._extra_offsets) - 1 and self._extra(lo) == raw:
+            return lo
+        return -1
+
+    def _row(self, word: str):
+        """(score, flag mask) of `word`, or None."""
+        wid = self.vocabulary.word_id(word)
+        if wid >= 0:
+            score = self.scores[wid]
+            if score == score:
+                return score, self.flag_masks[wid]
+            return None
+        i = self._extra_index(word)
+        if i < 0:
+            return None
+        return self.sections["extra_scores"][i], self.sections["extra_flags"][i]
+
+    def meta(self, word: str):
+        """(score, flags) with the defaults for unscored words."""
+        row = self._row(word)
+        if row is None:
+            return DEFAULT_SCORE, []
+        return row[0], self.flags(row[1]) if row[1] else []
+
+    def __getitem__(self, word):
+        row = self._row(word)
+        if row is None:
+            raise KeyError(word)
+        meta = {"s": round(row[0], 4)}  # float32 → the JSON's decimal
+        if row[1]:
+            meta["f"] = self.flags(row[1])
+        return meta
+
+    def __iter__(self):
+        for word, score in zip(self.vocabulary, self.scores):
+            if score == score:
+                yield word
+        for i in range(len(self._extra_offsets) - 1):
+            yield str(self._extra(i), "utf-8")
+
+    def __len__(self):
+        return self._count
+
+
+if __name__ == "__main__":
+    import time
+
+    base = os.path.dirname(os.path.abspath(__file__))
+    json_path = sys.argv[1] if len(sys.argv) > 1 else os.getenv("SCORES_PATH", os.path.join(base, "word_scores.json"))
+    vocab_path = sys.argv[2] if len(sys.argv) > 2 else os.getenv("VOCABULARY_PATH", os.path.join(base, "words_pl.txt"))
+    out_path = sys.argv[3] if len(sys.argv) > 3 else os.getenv("SCORE_TABLE_PATH", os.path.join(base, "word_scores.bin"))
+
+    t0 = time.perf_counter()
+    n = compile_scores(json_path, vocab_path, out_path)
+    print(f"Compiled {n} scores → {out_path} ({os.path.getsize(out_path) / 1024:.0f} KB) in {time.perf_counter() - t0:.2f}s")
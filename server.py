@@ -1,30 +1,94 @@
-from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi import FastAPI, Header, HTTPException, Request, Response
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
 from pydantic import BaseModel
 from typing import List, Dict, Optional
 import uvicorn
+import hmac
+import json
+import math
+import threading
 import time
+import traceback
 import re
 import random
-from collections import defaultdict
+from collections import namedtuple
+from itertools import chain
+from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
-from config import ENGINE, LYRICS_PATH, CORS_ORIGINS, MAX_INPUT_LENGTH, RATE_LIMIT_PER_MINUTE, WORD_SCORES
-
-app = FastAPI(title="Rhyme Architect API")
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.background import BackgroundTask
+import config
+from config import LYRICS_PATH, CORS_ORIGINS, MAX_INPUT_LENGTH, MAX_BATCH_SIZE, RATE_LIMIT_PER_MINUTE
+from config import RATE_LIMIT_BACKEND, RATE_LIMIT_DB_PATH, RATE_LIMIT_SWEEP_INTERVAL
+from config import WORD_MODE_CACHE_ENTRIES, register_reload_hook, run_reload_hooks
+from config import EXECUTOR_MODE, EXECUTOR_WORKERS, EXECUTOR_MAX_PENDING, EXECUTOR_RETRY_AFTER
+from config import ADMIN_TOKEN, RELOAD_WATCH_INTERVAL, VOCABULARY_PATH, SCORES_PATH, WARMUP, LOG_SAMPLE_RATE
+from config import STANZA_BUDGET_MS, MAX_VERIFY_LINES
+from engine_executor import EngineExecutor, Saturated
+import metrics
+from metrics import COUNT_BUCKETS, Counter, Histogram, register_collector, span
+from rate_limiter import make_rate_limiter
+from request_log import RequestLog
+from result_cache import LRUCache
+from source_watcher import SourceWatcher
+from corpus import clean_last_word, load_lyrics_corpus, make_line, update_lyrics_corpus
+from polish_rhyme_util import song_stanzas, verify_stanzas
+from stanza_solver import StanzaSolver, normalize_scheme, parse_scheme
+from syllables import SYLLABLES
+
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # Per serving process (each uvicorn worker), not at import
+    if WARMUP == "eager":
+        await run_in_threadpool(snapshot)
+    elif WARMUP == "background":
+        start_warmup()
+    if RELOAD_WATCH_INTERVAL > 0:
+        SourceWatcher(
+            {"vocabulary": VOCABULARY_PATH, "scores": SCORES_PATH, "lyrics": LYRICS_PATH},
+            RELOAD_WATCH_INTERVAL, reload_sources,
+        ).start()
+    yield
+
+
+app = FastAPI(title="Rhyme Architect API", lifespan=lifespan)
 
 # --- Rate Limiting ---
-RATE_LIMIT_DATA = defaultdict(list)
+RATE_LIMITER = make_rate_limiter(RATE_LIMIT_PER_MINUTE, RATE_LIMIT_BACKEND, RATE_LIMIT_DB_PATH,
+                                 RATE_LIMIT_SWEEP_INTERVAL)
 
 @app.middleware("http")
 async def rate_limit_middleware(request: Request, call_next):
-    client_ip = request.client.host
-    now = time.time()
-    RATE_LIMIT_DATA[client_ip] = [t for t in RATE_LIMIT_DATA[client_ip] if t > now - 60]
-    
-    if len(RATE_LIMIT_DATA[client_ip]) >= RATE_LIMIT_PER_MINUTE:
-         return Response(content="Rate limit exceeded", status_code=429)
-    
-    RATE_LIMIT_DATA[client_ip].append(now)
+    if RATE_LIMITER.blocking:
+        # sqlite backend: keep its file lock waits off the event loop
+        wait = await run_in_threadpool(RATE_LIMITER.allow, request.client.host)
+    else:
+        wait = RATE_LIMITER.allow(request.client.host)
+    if wait:
+        RATE_LIMITED.inc()
+        return Response(content="Rate limit exceeded", status_code=429,
+                        headers={"Retry-After": str(math.ceil(wait))})
+    return await call_next(request)
+
+
+# --- Metrics (metrics.py; GET /metrics) ---
+REQUEST_SECONDS = Histogram("rymowanka_request_seconds", "Time to response headers per route", "route")
+TIER_CANDIDATES = Histogram("rymowanka_tier_candidates", "Hits scanned per find_candidates tier", "tier",
+                            COUNT_BUCKETS)
+RATE_LIMITED = Counter("rymowanka_rate_limited_total", "Requests answered 429")
+# Per-request lines, LOG_SAMPLE_RATE of requests, written off the request path
+REQUEST_LOG = RequestLog(sample_rate=LOG_SAMPLE_RATE)
+
+
+@app.middleware("http")
+async def metrics_middleware(request: Request, call_next):
+    t0 = time.perf_counter()
     response = await call_next(request)
+    # The matched route's template, so labels stay bounded
+    route = request.scope.get("route")
+    REQUEST_SECONDS.observe(time.perf_counter() - t0, route.path if route is not None else "unmatched")
     return response
 
 app.add_middleware(
@@ -37,7 +101,28 @@ app.add_middleware(
 
 @app.get("/")
 async def health_check():
-    return {"status": "online", "engine": "PhoneticEngine", "corpus_size": len(ALL_LINES)}
+    # Never loads anything: answers "warming" until the snapshot exists
+    snap = SNAPSHOT
+    if snap is None:
+        if WARMUP_ERROR is not None and WARMUP_THREAD is None:
+            return JSONResponse(status_code=503, content={
+                "status": "failed", "error": WARMUP_ERROR, "engine": "PhoneticEngine", "executor": EXECUTOR.stats(),
+            })
+        return {"status": "warming" if WARMUP_THREAD is not None else "idle", "engine": "PhoneticEngine",
+                "executor": EXECUTOR.stats()}
+    return {
+        "status": "online", "engine": "PhoneticEngine", "corpus_size": len(snap.all_lines),
+        "snapshot": snap.version,
+        "cache": {"candidates": snap.engine.cache.stats(), "word_mode": snap.word_mode_cache.stats()},
+        "executor": EXECUTOR.stats(),
+    }
+
+WORD_MODE_LIMIT = 15  # per grade; increased limit slightly to show variety
+DEEP_RHYME_MAX_K = 100  # /generate/deep results per request
+SLANT_RHYME_MAX_K = 100  # /generate/slant results per request
+SLANT_MAX_DISTANCE = 3  # consonant edits /generate/slant accepts
+STANZA_MAX_LINES = 12  # scheme length /generate/stanza accepts
+STANZA_MAX_RESULTS = 20
 
 # --- Junk filter for word-mode results ---
 JUNK_RE = re.compile(r'[-.]|^[a-z]{1,3}-|^\w+-\w+$')
@@ -52,62 +137,219 @@ def is_clean_word(w: str) -> bool:
     return True
 
 
-def clean_last_word(text: str) -> str:
-    words = text.strip().split()
-    if not words:
-        return ""
-    return re.sub(r'[^\w]', '', words[-1].lower())
+def word_meta(word: str, scores=None):
+    """(priority, flags) from WORD_SCORES (or the given ScoreTable)."""
+    return (snapshot().scores if scores is None else scores).meta(word)
 
 
-def count_syllables(text: str) -> int:
-    """Count syllables in a line using engine's vowel detection."""
-    total = 0
-    for word in text.split():
-        clean = re.sub(r'[^\w]', '', word.lower())
-        if not clean:
-            continue
-        norm = ENGINE.normalize(clean)
-        total += max(len(ENGINE.get_vowel_positions(norm)), 1)
-    return total
-
-
-def load_lyrics_corpus():
-    lines_by_d2 = defaultdict(list)
-    lines_by_word = defaultdict(list)
-    all_lines = []
+class PriorityTable(dict):
+    """
+    word id -> priority read from a ScoreTable's float32 column (None for
+    junk), filled on first lookup. Passed to find_candidates as
+    priority_by_id, so repeat words cost one C-level dict hit per candidate.
+    """
+
+    def __init__(self, scores):
+        super().__init__()
+        self.scores = scores
+
+    def __missing__(self, wid):
+        value = self.scores.score(wid) if is_clean_word(self.scores.vocabulary.word(wid)) else None
+        self[wid] = value
+        return value
 
+
+def word_flags(word: str, scores=None) -> List[str]:
+    return word_meta(word, scores)[1]
+
+
+def count_syllables(text: str) -> int:
+    """Count syllables in a line (memoized per word, see syllables.py)."""
+    return SYLLABLES.line(text)
+
+
+def new_word_mode_cache() -> LRUCache:
+    # Final word-mode payloads (target word -> GenerationResponse); depends on
+    # both the vocabulary and the scores
+    return LRUCache(WORD_MODE_CACHE_ENTRIES, sizeof=lambda r: sum(len(v) for v in r.words.values()))
+
+
+# --- Serving snapshot ---
+# Everything a request reads, replaced as one reference by reload_sources(),
+# so in-flight requests never mix old and new data: handlers read the
+# snapshot once and pass it down. It is built on first use (or by the
+# WARMUP thread), not at import. The ENGINE / WORD_SCORES / LINES_BY_*
+# module names follow the current snapshot for tools and tests.
+Snapshot = namedtuple('Snapshot', [
+    'engine', 'scores', 'priority', 'word_mode_cache', 'lines_by_d2', 'lines_by_word', 'all_lines', 'version',
+])
+SNAPSHOT_ALIASES = {
+    "ENGINE": "engine", "WORD_SCORES": "scores", "WORD_PRIORITY": "priority", "WORD_MODE_CACHE": "word_mode_cache",
+    "LINES_BY_D2": "lines_by_d2", "LINES_BY_WORD": "lines_by_word", "ALL_LINES": "all_lines",
+}
+SNAPSHOT = None
+WARMUP_THREAD = None
+WARMUP_ERROR = None  # why the last warm-up failed, until a load succeeds
+_SNAPSHOT_LOCK = threading.Lock()
+
+
+def install_snapshot(snap: Snapshot):
+    global SNAPSHOT
+    SNAPSHOT = snap
+    globals().update({alias: getattr(snap, field) for alias, field in SNAPSHOT_ALIASES.items()})
+    config.ENGINE, config.WORD_SCORES = snap.engine, snap.scores
+
+
+def snapshot() -> Snapshot:
+    """The live snapshot; the first call loads the engine, scores and corpus."""
+    snap = SNAPSHOT
+    if snap is None:
+        with _SNAPSHOT_LOCK:
+            snap = SNAPSHOT
+            if snap is None:
+                snap = _load_snapshot()
+    return snap
+
+
+def _load_snapshot() -> Snapshot:
+    t0 = time.perf_counter()
+    engine, scores = config.get_engine(), config.get_scores()
+    # Rows are corpus.CorpusLine (text, lower, last_word, tails, syllables)
+    snap = Snapshot(
+        engine, scores, PriorityTable(scores), new_word_mode_cache(),
+        *load_lyrics_corpus(LYRICS_PATH, engine), version=1,
+    )
+    install_snapshot(snap)
+    # Pool processes forked before this point would each load their own
+    EXECUTOR.recycle()
+    print(f"📚 Corpus: {len(snap.all_lines)} lines, {len(snap.lines_by_d2)} unique rhyme tails "
+          f"(loaded in {time.perf_counter() - t0:.2f}s)")
+    return snap
+
+
+async def loaded_snapshot() -> Snapshot:
+    """snapshot() without blocking the event loop while it is first loaded."""
+    snap = SNAPSHOT
+    if snap is None:
+        snap = await run_in_threadpool(snapshot)
+    return snap
+
+
+def start_warmup():
+    """
+    Load the snapshot on a background thread; `/` reports "warming" meanwhile,
+    and "failed" (503) with the error if loading raised. Requests still load
+    it themselves, so a failed warm-up is retried by the next one.
+    """
+    global WARMUP_THREAD
+    thread = WARMUP_THREAD
+    if SNAPSHOT is None and thread is None:
+        # Returned rather than re-read: a quick failure clears WARMUP_THREAD
+        thread = WARMUP_THREAD = threading.Thread(target=_warmup, name="warmup", daemon=True)
+        thread.start()
+    return thread
+
+
+def _warmup():
+    global WARMUP_THREAD, WARMUP_ERROR
     try:
-        with open(LYRICS_PATH, "r", encoding="utf-8") as f:
-            raw = f.readlines()
-    except FileNotFoundError:
-        print(f"⚠️ Warning: Lyrics corpus not found at {LYRICS_PATH}")
-        return lines_by_d2, lines_by_word, all_lines
+        snapshot()
+        WARMUP_ERROR = None
+    except Exception as e:
+        WARMUP_ERROR = f"{type(e).__name__}: {e}"
+        traceback.print_exc()
+    finally:
+        WARMUP_THREAD = None
+
 
-    skip = re.compile(r'^\s*$|^\[|^#|^-{3,}|^\(|^Style:|^End|^Fade|^Finish')
+def __getattr__(name):
+    # Module attribute fallback (PEP 562) until the first snapshot is installed
+    if name in SNAPSHOT_ALIASES:
+        return getattr(snapshot(), SNAPSHOT_ALIASES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-    for raw_line in raw:
-        line = raw_line.strip()
-        if not line or skip.match(line):
-            continue
-        line_clean = re.sub(r'\[.*?\]', '', line).strip()
-        if not line_clean or len(line_clean) < 10:
-            continue
 
-        last = clean_last_word(line_clean)
-        if len(last) < 2:
-            continue
+# Engine work runs here instead of on the event loop
+EXECUTOR = EngineExecutor(EXECUTOR_MODE, EXECUTOR_WORKERS, EXECUTOR_MAX_PENDING)
 
-        entry = ENGINE.build_entry(last)
-        lines_by_d2[entry.tail_d2].append(line_clean)
-        lines_by_word[last].append(line_clean)
-        all_lines.append(line_clean)
 
-    return lines_by_d2, lines_by_word, all_lines
+def _busy() -> HTTPException:
+    return HTTPException(status_code=503, detail="Server busy, retry shortly",
+                         headers={"Retry-After": str(EXECUTOR_RETRY_AFTER)})
 
 
-# --- Initialize ---
-LINES_BY_D2, LINES_BY_WORD, ALL_LINES = load_lyrics_corpus()
-print(f"📚 Corpus: {len(ALL_LINES)} lines, {len(LINES_BY_D2)} unique rhyme tails")
+async def run_engine(fn, *args):
+    """await fn(*args) on EXECUTOR; 503 + Retry-After when it is saturated."""
+    try:
+        return await EXECUTOR.run(fn, *args)
+    except Saturated:
+        raise _busy()
+
+
+def reserve_engine():
+    """An EXECUTOR slot for engine work run elsewhere; release() frees it. 503 when saturated."""
+    try:
+        return EXECUTOR.reserve()
+    except Saturated:
+        raise _busy()
+
+
+@register_reload_hook
+def _invalidate_word_mode_cache(source: str):
+    snap = SNAPSHOT
+    if source in ("vocabulary", "scores") and snap is not None:
+        snap.word_mode_cache.clear()
+        snap.priority.clear()
+
+
+# --- Hot reload ---
+RELOAD_SOURCES = ("vocabulary", "scores", "lyrics")
+_RELOAD_LOCK = threading.Lock()
+
+
+def reload_sources(sources=RELOAD_SOURCES) -> dict:
+    """
+    Re-read the given sources and install a new snapshot in one assignment.
+    The vocabulary and lyrics are diffed against the live snapshot, so only
+    added words are normalized and only the corpus buckets of added or
+    removed lines are rebuilt. Returns what changed per source.
+    """
+    unknown = set(sources) - set(RELOAD_SOURCES)
+    if unknown:
+        raise ValueError(f"Unknown sources: {', '.join(sorted(unknown))}")
+
+    with _RELOAD_LOCK:
+        old = snapshot()
+        engine, scores, priority = old.engine, old.scores, old.priority
+        lyrics = (old.lines_by_d2, old.lines_by_word, old.all_lines)
+        report = {}
+        if "vocabulary" in sources:
+            engine, added, removed = config.reload_engine(old.engine)
+            report["vocabulary"] = {"added": added, "removed": removed, "words": len(engine.word_map)}
+        if "scores" in sources:
+            scores = config.load_scores(engine)
+            report["scores"] = {"words": len(scores)}
+        elif "vocabulary" in sources:
+            # Score columns are indexed by word id
+            scores = scores.aligned(engine.word_map)
+        if "vocabulary" in sources or "scores" in sources:
+            priority = PriorityTable(scores)
+        if "lyrics" in sources:
+            lyrics, added, removed = update_lyrics_corpus(LYRICS_PATH, engine, lyrics)
+            report["lyrics"] = {"added": added, "removed": removed, "lines": len(lyrics[2])}
+        word_mode_cache = old.word_mode_cache
+        if "vocabulary" in sources or "scores" in sources:
+            word_mode_cache = new_word_mode_cache()
+
+        install_snapshot(Snapshot(engine, scores, priority, word_mode_cache, *lyrics, version=old.version + 1))
+
+    # Pool processes hold a copy of the old snapshot
+    EXECUTOR.recycle()
+    for source in sources:
+        run_reload_hooks(source)
+    print(f"♻️ Reloaded {', '.join(sources)}: {report}")
+    return report
+
 
 
 # --- Models ---
@@ -135,110 +377,377 @@ class GenerationResponse(BaseModel):
     words: Optional[Dict[str, List[WordSuggestion]]] = None
     verses: Optional[List[VerseSuggestion]] = None
 
+class BatchGenerationRequest(BaseModel):
+    verses: List[str]
+    seen: Optional[List[str]] = []  # shared by every line
 
-def find_rhyming_verses(target_word: str, target_entry, seen_set: set,
-                        input_lower: str, input_syllables: int, limit: int = 5):
-    """Find corpus lines that genuinely rhyme. Sorted by quality + syllable match."""
-    results = []
+class BatchItem(BaseModel):
+    result: Optional[GenerationResponse] = None
+    error: Optional[str] = None
 
-    # Strategy 1: Direct d2 corpus lookup
-    d2_candidates = list(LINES_BY_D2.get(target_entry.tail_d2, []))
-    random.shuffle(d2_candidates)
-
-    for line in d2_candidates:
-        if line.lower().strip() == input_lower or line in seen_set:
-            continue
-        rw = clean_last_word(line)
-        if rw == target_word:
-            continue
-        syl = count_syllables(line)
-        syl_diff = abs(syl - input_syllables)
-        # Score: base 1.0, penalize syllable mismatch
-        score = max(1.0 - (syl_diff * 0.08), 0.5)
-        results.append(VerseSuggestion(line=line, rhyme_word=rw, score=score, syllables=syl))
-
-    # Strategy 2: Dictionary rhyme words → corpus lines
-    rhyming_words = ENGINE.find_candidates(target_word)
-    perfect_words = [w for w, grade, sc in rhyming_words if grade == "PERFECT"]
-    random.shuffle(perfect_words)
-
-    existing_lines = {r.line for r in results}
-    for rw in perfect_words:
-        for line in LINES_BY_WORD.get(rw, []):
-            if line in existing_lines or line.lower().strip() == input_lower or line in seen_set:
-                continue
-            syl = count_syllables(line)
-            syl_diff = abs(syl - input_syllables)
-            score = max(0.9 - (syl_diff * 0.08), 0.4)
-            results.append(VerseSuggestion(line=line, rhyme_word=rw, score=score, syllables=syl))
-            existing_lines.add(line)
-
-    # Sort: best rhyme + closest syllable count first
-    results.sort(key=lambda r: r.score, reverse=True)
-    return results[:limit]
+class BatchGenerationResponse(BaseModel):
+    results: List[BatchItem]
 
+class DeepRhymeRequest(BaseModel):
+    verse: str
+    k: int = WORD_MODE_LIMIT
+    min_depth: int = 2  # shared vowels; 3+ for multi-syllable rhymes only
 
-@app.post("/generate", response_model=GenerationResponse)
-async def generate_rhymes(request: GenerationRequest):
-    if len(request.verse) > MAX_INPUT_LENGTH:
+class DeepRhyme(BaseModel):
+    word: str
+    depth: int  # vowels of the input's last word inside the shared tail
+    tail: str  # the shared tail, normalized
+    score: float
+    flags: List[str] = []
+
+class DeepRhymeResponse(BaseModel):
+    original_word: str
+    rhyme_tail: str
+    rhymes: List[DeepRhyme]
+
+class SlantRhymeRequest(BaseModel):
+    verse: str
+    k: int = WORD_MODE_LIMIT
+    max_distance: int = 1  # consonant edits after voicing / nasal folding
+
+class SlantRhyme(BaseModel):
+    word: str
+    distance: int
+    tail: str  # the word's tail_d2
+    score: float
+    flags: List[str] = []
+
+class SlantRhymeResponse(BaseModel):
+    original_word: str
+    rhyme_tail: str
+    rhymes: List[SlantRhyme]
+
+class StanzaRequest(BaseModel):
+    scheme: str = "AABB"
+    syllables: Optional[int] = None  # per line; default: the seeds' mean, else any
+    tolerance: int = 2  # syllables off target a line may be
+    seed: List[str] = []  # fixed first lines
+    n: int = 5
+
+class StanzaLine(BaseModel):
+    line: str
+    rhyme_word: str
+    letter: str
+    syllables: int
+    seed: bool = False
+
+class Stanza(BaseModel):
+    score: float
+    lines: List[StanzaLine]
+
+class StanzaResponse(BaseModel):
+    scheme: str
+    syllables: Optional[int]
+    stanzas: List[Stanza]
+    complete: bool  # False: the time budget ran out, results are the best found so far
+
+class VerifyRequest(BaseModel):
+    stanzas: List[List[str]] = []
+    songs: List[str] = []  # whole texts, split into stanzas of len(scheme) lines
+    scheme: str = "AABB"
+
+class VerifyResult(BaseModel):
+    match: bool
+    suffixes: List[str]  # phonetic suffix of each line's last word
+    syllables: List[int]  # per line
+    song: Optional[int] = None  # index into `songs`; None for `stanzas` items
+
+class VerifyResponse(BaseModel):
+    scheme: str
+    matched: int
+    total: int
+    results: List[VerifyResult]  # `stanzas` in order, then each song's stanzas
+
+class ReloadRequest(BaseModel):
+    sources: List[str] = list(RELOAD_SOURCES)
+
+
+def rhyme_word_lines(tail_d2: str, snap: Optional[Snapshot] = None) -> list:
+    """(dictionary word, its corpus SyllableBuckets) for every word ending in `tail_d2`."""
+    snap = snap or snapshot()
+    lines_by_word = snap.lines_by_word
+    return [(w, lines_by_word[w]) for w, _ in snap.engine.index_d2.candidates(tail_d2) if w in lines_by_word]
+
+
+def find_rhyming_verses(target_word: str, target_entry, seen_set: set,
+                        input_lower: str, input_syllables: int, limit: int = 5,
+                        word_lines: Optional[list] = None, snap: Optional[Snapshot] = None):
+    """
+    Find corpus lines that genuinely rhyme. Sorted by quality + syllable match.
+
+    Both strategies score a line only by its syllable distance from the input,
+    so candidates are visited in score order by expanding outward through the
+    SyllableBuckets of each rhyme key, and the search stops after `limit` hits.
+    Cost depends on `limit`, not on how many lines share the tail.
+
+    word_lines: precomputed rhyme_word_lines(target_entry.tail_d2), shared by
+    every line of a batch that ends in the same tail.
+    """
+    snap = snap or snapshot()
+    # Strategy 1: Direct d2 corpus lookup (base 1.0)
+    d2_lines = snap.lines_by_d2.get(target_entry.tail_d2)
+    # Strategy 2: Dictionary rhyme words → corpus lines (base 0.9). The
+    # PERFECT tier of find_candidates is exactly the tail_d2 bucket
+    if word_lines is None:
+        word_lines = rhyme_word_lines(target_entry.tail_d2, snap)
+    word_lines = [(w, lines) for w, lines in word_lines if w != target_word]
+    random.shuffle(word_lines)
+
+    # Score levels (score, strategy, distance), penalizing syllable mismatch;
+    # on equal scores direct hits come first
+    levels = []
+    if d2_lines:
+        for d in range(d2_lines.max_distance(input_syllables) + 1):
+            levels.append((max(1.0 - (d * 0.08), 0.5), 0, d))
+    max_word_distance = max((lines.max_distance(input_syllables) for _, lines in word_lines), default=-1)
+    for d in range(max_word_distance + 1):
+        levels.append((max(0.9 - (d * 0.08), 0.4), 1, d))
+    levels.sort(key=lambda lv: (-lv[0], lv[1]))
+
+    results = []  # (score, CorpusLine, rhyme word)
+    existing_lines = set()
+    for score, strategy, d in levels:
+        if len(results) >= limit:
+            break
+        if strategy == 0:
+            group = d2_lines.at_distance(input_syllables, d)
+            random.shuffle(group)
+            for line in group:
+                if line.lower == input_lower or line.text in seen_set:
+                    continue
+                if line.last_word == target_word:
+                    continue
+                results.append((score, line, line.last_word))
+                existing_lines.add(line.text)
+        else:
+            for rw, lines in word_lines:
+                for line in lines.at_distance(input_syllables, d):
+                    if line.text in existing_lines or line.lower == input_lower or line.text in seen_set:
+                        continue
+                    results.append((score, line, rw))
+                    existing_lines.add(line.text)
+
+    return [
+        VerseSuggestion(line=line.text, rhyme_word=rw, score=score, syllables=line.syllables)
+        for score, line, rw in results[:limit]
+    ]
+
+
+# Grades whose lists are (re)sent after each find_candidates tier
+TIER_GRADES = {"PERFECT": ("PERFECT",), "NEAR": ("NEAR",), "ASSONANCE": ("DOMINANT", "NEAR")}
+
+
+def word_payload(ranked, grades=("PERFECT", "DOMINANT", "NEAR"), scores=None) -> Dict[str, List[WordSuggestion]]:
+    payload = {grade: [] for grade in grades}
+    with span("score_lookup"):
+        for word, grade, score in ranked:
+            if grade in payload:
+                payload[grade].append(
+                    WordSuggestion(word=word, grade=grade, score=score, flags=word_flags(word, scores))
+                )
+    return payload
+
+
+def word_mode_tiers(target_word: str, target_entry, snap: Optional[Snapshot] = None):
+    """
+    Word mode as it is computed: yields (tier, {grade: suggestions so far})
+    after each find_candidates tier, then (None, final GenerationResponse).
+    A cached target yields only the final response.
+    """
+    snap = snap or snapshot()
+    cached = snap.word_mode_cache.get(target_word)
+    if cached is not None:
+        yield None, cached
+        return
+
+    # Best 15 per grade by boosted score, selected while scanning
+    ranked = []
+    counts = {}
+    t0 = time.perf_counter()
+    for tier, ranked in snap.engine.iter_tiers(
+        target_word, k_per_grade=WORD_MODE_LIMIT, priority_by_id=snap.priority, counts=counts
+    ):
+        metrics.SPANS.observe(time.perf_counter() - t0, f"find_candidates_{tier.lower()}")
+        TIER_CANDIDATES.observe(counts[tier], tier)
+        yield tier, word_payload(ranked, TIER_GRADES[tier], snap.scores)
+        t0 = time.perf_counter()
+
+    response = GenerationResponse(
+        mode="word", original_word=target_word,
+        rhyme_tail=target_entry.tail_d2, words=word_payload(ranked, scores=snap.scores)
+    )
+    snap.word_mode_cache.put(target_word, response)
+    yield None, response
+
+
+def word_mode_response(target_word: str, target_entry, snap: Optional[Snapshot] = None) -> GenerationResponse:
+    for _, response in word_mode_tiers(target_word, target_entry, snap):
+        pass
+    return response
+
+
+def deep_rhymes(verse: str, k: int = WORD_MODE_LIMIT, min_depth: int = 2,
+                snap: Optional[Snapshot] = None) -> DeepRhymeResponse:
+    """Longest shared phonetic tails for the last word (PhoneticEngine.find_deep_rhymes)."""
+    snap = snap or snapshot()
+    _, target_word, target_entry = parse_input(verse, snap)
+    with span("find_deep_rhymes"):
+        hits = snap.engine.find_deep_rhymes(target_word, k, min_depth, priority_by_id=snap.priority)
+    rhymes = []
+    with span("score_lookup"):
+        for word, depth, tail in hits:
+            score, flags = word_meta(word, snap.scores)
+            rhymes.append(DeepRhyme(word=word, depth=depth, tail=tail, score=score, flags=flags))
+    return DeepRhymeResponse(original_word=target_word, rhyme_tail=target_entry.tail_d2, rhymes=rhymes)
+
+
+def slant_rhymes(verse: str, k: int = WORD_MODE_LIMIT, max_distance: int = 1,
+                 snap: Optional[Snapshot] = None) -> SlantRhymeResponse:
+    """Near-miss tails for the last word (PhoneticEngine.find_slant_rhymes)."""
+    snap = snap or snapshot()
+    _, target_word, target_entry = parse_input(verse, snap)
+    with span("find_slant_rhymes"):
+        hits = snap.engine.find_slant_rhymes(target_word, k, max_distance, priority_by_id=snap.priority)
+    rhymes = []
+    with span("score_lookup"):
+        for word, distance, tail in hits:
+            score, flags = word_meta(word, snap.scores)
+            rhymes.append(SlantRhyme(word=word, distance=distance, tail=tail, score=score, flags=flags))
+    return SlantRhymeResponse(original_word=target_word, rhyme_tail=target_entry.tail_d2, rhymes=rhymes)
+
+
+_STANZA_SOLVER = (None, None)  # (lines_by_d2 it indexes, StanzaSolver)
+
+
+def stanza_solver(snap: Optional[Snapshot] = None) -> StanzaSolver:
+    """The StanzaSolver over the snapshot's LINES_BY_D2, rebuilt after a lyrics reload."""
+    global _STANZA_SOLVER
+    snap = snap or snapshot()
+    lines_by_d2, solver = _STANZA_SOLVER
+    if lines_by_d2 is not snap.lines_by_d2:
+        solver = StanzaSolver(snap.lines_by_d2)
+        _STANZA_SOLVER = (snap.lines_by_d2, solver)
+    return solver
+
+
+def parse_seed_lines(seed: List[str], snap: Optional[Snapshot] = None) -> list:
+    """CorpusLine per seed line; 400 on a line without a usable last word."""
+    snap = snap or snapshot()
+    lines = []
+    for text in seed:
+        if len(text) > MAX_INPUT_LENGTH:
+            raise HTTPException(status_code=400, detail=f"Input too long (max {MAX_INPUT_LENGTH} chars)")
+        line = make_line(text.strip(), snap.engine)
+        if line is None:
+            raise HTTPException(status_code=400, detail="No valid word found")
+        lines.append(line)
+    return lines
+
+
+def generate_stanzas(scheme: str, syllables: Optional[int] = None, tolerance: int = 2, seed: Optional[List[str]] = None,
+                     n: int = 5, budget_ms: float = STANZA_BUDGET_MS,
+                     snap: Optional[Snapshot] = None) -> StanzaResponse:
+    """Top-n corpus stanzas for a rhyme scheme (stanza_solver.py), searched for at most budget_ms."""
+    snap = snap or snapshot()
+    seeds = parse_seed_lines(seed or [], snap)
+    if syllables is None and seeds:
+        syllables = round(sum(line.syllables for line in seeds) / len(seeds))
+    wid = snap.engine.word_map.word_id
+    ranks = {}  # last word -> priority, for this request
+
+    def rank(word):
+        value = ranks.get(word, False)
+        if value is False:
+            i = wid(word)
+            value = ranks[word] = snap.priority[i] if i >= 0 else None
+        return value
+
+    with span("stanza_search"):
+        found, complete = stanza_solver(snap).solve(
+            scheme, syllables, tolerance, seeds, n, time.perf_counter() + budget_ms / 1000, rank,
+        )
+    stanzas = [
+        Stanza(score=score, lines=[
+            StanzaLine(line=line.text, rhyme_word=line.last_word, letter=letter, syllables=line.syllables, seed=is_seed)
+            for line, letter, is_seed in lines
+        ])
+        for score, lines in found
+    ]
+    return StanzaResponse(scheme=scheme.strip().upper(), syllables=syllables, stanzas=stanzas, complete=complete)
+
+
+def verify_batch(stanzas: List[List[str]], songs: List[str], scheme: str = "AABB") -> VerifyResponse:
+    """Rhyme-scheme check of every stanza and song in one verify_stanzas call."""
+    scheme = normalize_scheme(scheme)
+    items = [(stanza, None) for stanza in stanzas]
+    items.extend((stanza, i) for i, song in enumerate(songs) for stanza in song_stanzas(song, len(scheme)))
+    with span("verify"):
+        checked = verify_stanzas([stanza for stanza, _ in items], scheme)
+    with span("syllables"):
+        counts = iter(SYLLABLES.lines([line for stanza, _ in items for line in stanza]))
+    results = [VerifyResult(match=match, suffixes=suffixes, syllables=[next(counts) for _ in stanza], song=song)
+               for (match, suffixes), (stanza, song) in zip(checked, items)]
+    return VerifyResponse(scheme=scheme, matched=sum(r.match for r in results), total=len(results), results=results)
+
+
+def parse_input(verse: str, snap: Optional[Snapshot] = None):
+    """(stripped text, target word, its WordEntry); 400 on unusable input."""
+    if len(verse) > MAX_INPUT_LENGTH:
          raise HTTPException(status_code=400, detail=f"Input too long (max {MAX_INPUT_LENGTH} chars)")
 
-    text = request.verse.strip()
+    text = verse.strip()
     if not text:
         raise HTTPException(status_code=400, detail="Empty input")
 
-    seen_set = set(request.seen or [])
     target_word = clean_last_word(text)
     if not target_word:
         raise HTTPException(status_code=400, detail="No valid word found")
 
-    target_entry = ENGINE.build_entry(target_word)
+    with span("normalize"):
+        entry = (snap or snapshot()).engine.build_entry(target_word)
+    return text, target_word, entry
+
+
+def generate(verse: str, seen_set: set, memo: Optional[dict] = None,
+             snap: Optional[Snapshot] = None) -> GenerationResponse:
+    """
+    Word or verse mode for one input. `memo` deduplicates work across a batch:
+    word-mode payloads by target word, dictionary rhyme lines by tail.
+    """
+    snap = snap or snapshot()
+    text, target_word, target_entry = parse_input(verse, snap)
+    memo = {} if memo is None else memo
     is_single_word = len(text.split()) == 1
 
-    print(f"🔍 '{text}' → word='{target_word}' tail='{target_entry.tail_d2}' mode={'word' if is_single_word else 'verse'}")
+    logged = REQUEST_LOG.sample()
+    if logged:
+        REQUEST_LOG.info("🔍 '%s' → word='%s' tail='%s' mode=%s", text, target_word, target_entry.tail_d2,
+                         "word" if is_single_word else "verse")
 
     if is_single_word:
-        raw_results = ENGINE.find_candidates(target_word)
-        # Apply prioritization scores
-        processed = []
-        for word, grade, base_score in raw_results:
-            if not is_clean_word(word):
-                continue
-            
-            # Boost score based on our quality mapping
-            meta = WORD_SCORES.get(word, {})
-            # Handle both old float format (if any legacy cache) and new dict format
-            if isinstance(meta, float):
-                priority = meta
-                flags = []
-            else:
-                priority = meta.get("s", 0.5)
-                flags = meta.get("f", [])
-
-            final_score = base_score * priority
-            processed.append((word, grade, final_score, flags))
-            
-        # Sort by grade first, then by the boosted score
-        processed.sort(key=lambda x: (x[1] != "PERFECT", x[1] != "DOMINANT", -x[2]))
-
-        payload = {"PERFECT": [], "DOMINANT": [], "NEAR": []}
-        for word, grade, score, flags in processed:
-            if len(payload[grade]) < 15: # Increased limit slightly to show variety
-                payload[grade].append(WordSuggestion(word=word, grade=grade, score=score, flags=flags))
-        
-        return GenerationResponse(
-            mode="word", original_word=target_word,
-            rhyme_tail=target_entry.tail_d2, words=payload
-        )
+        key = ("word", target_word)
+        if key not in memo:
+            memo[key] = word_mode_response(target_word, target_entry, snap)
+        return memo[key]
     else:
-        input_syl = count_syllables(text)
-        verses = find_rhyming_verses(
-            target_word, target_entry, seen_set, text.lower().strip(), input_syl
-        )
-        for v in verses:
-            print(f"   ✅ [{v.syllables}syl] {v.line}")
-        if not verses:
-            print(f"   ❌ No rhyming verses found")
+        with span("syllables"):
+            input_syl = count_syllables(text)
+        with span("corpus_lookup"):
+            key = ("tail", target_entry.tail_d2)
+            if key not in memo:
+                memo[key] = rhyme_word_lines(target_entry.tail_d2, snap)
+            verses = find_rhyming_verses(
+                target_word, target_entry, seen_set, text.lower().strip(), input_syl,
+                word_lines=memo[key], snap=snap,
+            )
+        if logged:
+            REQUEST_LOG.info("%s", "\n".join(f"   ✅ [{v.syllables}syl] {v.line}" for v in verses)
+                             or "   ❌ No rhyming verses found")
 
         return GenerationResponse(
             mode="verse", original_word=target_word,
@@ -247,6 +756,207 @@ async def generate_rhymes(request: GenerationRequest):
         )
 
 
+def generate_batch(verses: List[str], seen: List[str]) -> BatchGenerationResponse:
+    """One result per input verse, in order; lines sharing a tail share work."""
+    seen_set = set(seen)
+    memo = {}
+    snap = snapshot()
+    results = []
+    for verse in verses:
+        try:
+            results.append(BatchItem(result=generate(verse, seen_set, memo, snap)))
+        except HTTPException as e:
+            results.append(BatchItem(error=e.detail))
+    return BatchGenerationResponse(results=results)
+
+
+def json_response(model: BaseModel) -> Response:
+    """Serialize a response model once, timed (FastAPI would re-validate it first)."""
+    with span("serialize"):
+        body = model.model_dump_json()
+    return Response(content=body, media_type="application/json")
+
+
+@app.post("/generate", response_model=GenerationResponse)
+async def generate_rhymes(request: GenerationRequest):
+    # Validate here: HTTPException does not survive the trip back from a
+    # process pool
+    parse_input(request.verse, await loaded_snapshot())
+    return json_response(await run_engine(generate, request.verse, set(request.seen or [])))
+
+
+@app.post("/generate/batch", response_model=BatchGenerationResponse)
+async def generate_rhymes_batch(request: BatchGenerationRequest):
+    if len(request.verses) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"Too many verses (max {MAX_BATCH_SIZE})")
+    await loaded_snapshot()
+    return json_response(await run_engine(generate_batch, request.verses, request.seen or []))
+
+
+@app.post("/generate/deep", response_model=DeepRhymeResponse)
+async def generate_deep_rhymes(request: DeepRhymeRequest):
+    """Multi-syllable rhymes for the last word, deepest shared tail first."""
+    if not 1 <= request.k <= DEEP_RHYME_MAX_K:
+        raise HTTPException(status_code=400, detail=f"k must be between 1 and {DEEP_RHYME_MAX_K}")
+    if request.min_depth < 1:
+        raise HTTPException(status_code=400, detail="min_depth must be at least 1")
+    parse_input(request.verse, await loaded_snapshot())
+    return json_response(await run_engine(deep_rhymes, request.verse, request.k, request.min_depth))
+
+
+@app.post("/generate/slant", response_model=SlantRhymeResponse)
+async def generate_slant_rhymes(request: SlantRhymeRequest):
+    """Slant rhymes for the last word: same vowels, consonants within max_distance edits."""
+    if not 1 <= request.k <= SLANT_RHYME_MAX_K:
+        raise HTTPException(status_code=400, detail=f"k must be between 1 and {SLANT_RHYME_MAX_K}")
+    if not 0 <= request.max_distance <= SLANT_MAX_DISTANCE:
+        raise HTTPException(status_code=400, detail=f"max_distance must be between 0 and {SLANT_MAX_DISTANCE}")
+    parse_input(request.verse, await loaded_snapshot())
+    return json_response(await run_engine(slant_rhymes, request.verse, request.k, request.max_distance))
+
+
+@app.post("/generate/stanza", response_model=StanzaResponse)
+async def generate_stanza(request: StanzaRequest):
+    """Whole corpus stanzas fitting a rhyme scheme, optionally continuing seed lines."""
+    try:
+        size = sum(map(len, parse_scheme(request.scheme).values()))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if size > STANZA_MAX_LINES:
+        raise HTTPException(status_code=400, detail=f"Scheme too long (max {STANZA_MAX_LINES} lines)")
+    if len(request.seed) >= size:
+        raise HTTPException(status_code=400, detail="Seed lines must leave at least one line to fill")
+    if not 1 <= request.n <= STANZA_MAX_RESULTS:
+        raise HTTPException(status_code=400, detail=f"n must be between 1 and {STANZA_MAX_RESULTS}")
+    if request.tolerance < 0:
+        raise HTTPException(status_code=400, detail="tolerance must not be negative")
+    parse_seed_lines(request.seed, await loaded_snapshot())
+    return json_response(await run_engine(generate_stanzas, request.scheme, request.syllables, request.tolerance,
+                                          request.seed, request.n))
+
+
+@app.post("/verify", response_model=VerifyResponse)
+async def verify(request: VerifyRequest):
+    """Check many stanzas and whole songs against a rhyme scheme."""
+    try:
+        normalize_scheme(request.scheme)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    lines = sum(map(len, request.stanzas)) + sum(song.count("\n") + 1 for song in request.songs)
+    if lines > MAX_VERIFY_LINES:
+        raise HTTPException(status_code=400, detail=f"Too many lines (max {MAX_VERIFY_LINES})")
+    song_lines = (line for song in request.songs for line in song.splitlines())
+    if any(len(line) > MAX_INPUT_LENGTH for line in chain(chain.from_iterable(request.stanzas), song_lines)):
+        raise HTTPException(status_code=400, detail=f"Line too long (max {MAX_INPUT_LENGTH} chars)")
+    return json_response(await run_engine(verify_batch, request.stanzas, request.songs, request.scheme))
+
+
+@app.post("/generate/stream")
+async def generate_rhymes_stream(request: GenerationRequest, http_request: Request):
+    """
+    /generate as a stream of events, NDJSON by default or server-sent events
+    when the client accepts text/event-stream:
+
+        {"event": "tier", "tier": "PERFECT", "words": {"PERFECT": [...]}}
+        {"event": "tier", "tier": "NEAR", "words": {"NEAR": [...]}}
+        {"event": "tier", "tier": "ASSONANCE", "words": {"DOMINANT": [...], "NEAR": [...]}}
+        {"event": "result", "result": <GenerationResponse>}
+
+    Each tier event replaces the lists it names (NEAR is re-sent once
+    assonance hits compete for it). Verse mode and cached words send only the
+    result event.
+    """
+    snap = await loaded_snapshot()
+    text, target_word, target_entry = parse_input(request.verse, snap)
+    sse = "text/event-stream" in http_request.headers.get("accept", "")
+
+    def encode(event: str, data: dict) -> str:
+        body = json.dumps({"event": event, **data}, ensure_ascii=False)
+        return f"event: {event}\ndata: {body}\n\n" if sse else body + "\n"
+
+    def events():
+        if len(text.split()) == 1:
+            for tier, update in word_mode_tiers(target_word, target_entry, snap):
+                with span("serialize"):
+                    if tier is None:
+                        chunk = encode("result", {"result": update.model_dump()})
+                    else:
+                        words = {grade: [w.model_dump() for w in ws] for grade, ws in update.items()}
+                        chunk = encode("tier", {"tier": tier, "words": words})
+                yield chunk
+        else:
+            result = generate(request.verse, set(request.seen or []), snap=snap)
+            with span("serialize"):
+                chunk = encode("result", {"result": result.model_dump()})
+            yield chunk
+
+    # Generators and their tier state cannot move to a pool process, so the
+    # scans run in Starlette's threadpool, off the event loop, whatever
+    # EXECUTOR_MODE is. An open stream holds an EXECUTOR slot instead, so
+    # streams share EXECUTOR_MAX_PENDING (and its 503) with the other routes.
+    release = reserve_engine()
+
+    async def stream():
+        try:
+            async for chunk in iterate_in_threadpool(events()):
+                yield chunk
+        finally:
+            release()
+
+    # The background task frees the slot if the body is never iterated
+    return StreamingResponse(stream(), media_type="text/event-stream" if sse else "application/x-ndjson",
+                             background=BackgroundTask(release))
+
+
+@register_collector
+def _collect_metrics():
+    """Scrape-time values: caches, executor and corpus of the live snapshot."""
+    executor = EXECUTOR.stats()
+    yield ("rymowanka_executor_pending", "gauge", "Engine jobs queued or running", [({}, executor["pending"])])
+    yield ("rymowanka_executor_rejected_total", "counter", "Engine jobs answered 503",
+           [({}, executor["rejected"])])
+    snap = SNAPSHOT
+    if snap is None:
+        return
+    caches = {"candidates": snap.engine.cache.stats(), "word_mode": snap.word_mode_cache.stats(),
+              "syllables": SYLLABLES.stats()}
+    for stat, kind, doc in (("hits", "counter", "Cache hits"), ("misses", "counter", "Cache misses"),
+                            ("evictions", "counter", "Cache evictions"), ("entries", "gauge", "Cached entries"),
+                            ("hit_rate", "gauge", "Cache hits / lookups")):
+        name = f"rymowanka_cache_{stat}_total" if kind == "counter" else f"rymowanka_cache_{stat}"
+        yield name, kind, doc, [({"cache": cache}, stats[stat]) for cache, stats in caches.items()]
+    yield ("rymowanka_snapshot_version", "gauge", "Serving snapshot version", [({}, snap.version)])
+    yield ("rymowanka_corpus_lines", "gauge", "Usable lyrics lines", [({}, len(snap.all_lines))])
+    buckets = {"d2": snap.lines_by_d2, "word": snap.lines_by_word}
+    yield ("rymowanka_corpus_buckets", "gauge", "Corpus rhyme buckets per index",
+           [({"index": index}, len(b)) for index, b in buckets.items()])
+    yield ("rymowanka_corpus_bucket_max_lines", "gauge", "Lines in the largest corpus bucket per index",
+           [({"index": index}, max(map(len, b.values()), default=0)) for index, b in buckets.items()])
+
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Prometheus text exposition of metrics.py's registry."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.post("/admin/reload")
+async def admin_reload(request: ReloadRequest, x_admin_token: Optional[str] = Header(None)):
+    """Reload sources in place (off the event loop); disabled unless ADMIN_TOKEN is set."""
+    if not ADMIN_TOKEN or not hmac.compare_digest(x_admin_token or "", ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Forbidden")
+    try:
+        return {"reloaded": await run_in_threadpool(reload_sources, request.sources)}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 if __name__ == "__main__":
-    from config import PORT
-    uvicorn.run(app, host="0.0.0.0", port=PORT)
+    from config import PORT, WORKERS, write_shared_artifacts
+    if WORKERS > 1:
+        # Build once here; workers mmap the artifacts instead of rebuilding
+        for path in write_shared_artifacts():
+            print(f"📦 Wrote {path}")
+        uvicorn.run("server:app", host="0.0.0.0", port=PORT, workers=WORKERS)
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=PORT)
@@ -0,0 +1,208 @@
+"""
+Stanza generation for a rhyme scheme: the generating side of
+polish_rhyme_util.verify_rhyme_scheme.
+
+Lines rhyme when their last words share tail_d1, which is what
+verify_rhyme_scheme checks; a letter whose lines also share tail_d2 rhymes
+fully and scores higher. The corpus's LINES_BY_D2 buckets are grouped by
+tail_d1 into rhyme classes. For every scheme letter, each class offers its
+best lines for the target syllable count, taken by walking the buckets'
+SyllableBuckets outward from the target. Classes without enough lines in
+range drop out here. Whole stanzas are then searched letter by letter with
+a bound, so an assignment is only expanded while it can still enter the
+top N.
+"""
+import re
+import time
+from heapq import heappush, heapreplace
+from itertools import chain, count
+
+RE_SCHEME = re.compile(r'^[A-Z]+$')
+SYLLABLE_STEP = 0.08  # score lost per syllable off target, as in verse search
+MIN_LINE_SCORE = 0.5
+NEAR_FACTOR = 0.9  # a letter's lines share tail_d1 but not tail_d2
+
+
+def normalize_scheme(scheme: str) -> str:
+    """The scheme stripped and uppercased ("abab" works as "ABAB"); ValueError unless letters only."""
+    scheme = scheme.strip().upper()
+    if not RE_SCHEME.match(scheme):
+        raise ValueError("A rhyme scheme is letters only, e.g. AABB")
+    return scheme
+
+
+def parse_scheme(scheme: str) -> dict:
+    """Letter -> line positions, in order of first use."""
+    positions = {}
+    for i, letter in enumerate(normalize_scheme(scheme)):
+        positions.setdefault(letter, []).append(i)
+    return positions
+
+
+def line_score(syllables: int, target) -> float:
+    if target is None:
+        return 1.0
+    return max(1.0 - abs(syllables - target) * SYLLABLE_STEP, MIN_LINE_SCORE)
+
+
+class StanzaSolver:
+    def __init__(self, lines_by_d2):
+        self.lines_by_d2 = lines_by_d2
+        self.classes = {}  # tail_d1 -> [tail_d2, ...]; one tail_d2 always has one tail_d1
+        for tail, bucket in lines_by_d2.items():
+            if bucket.lines:
+                self.classes.setdefault(bucket.lines[0].tail_d1, []).append(tail)
+
+    def solve(self, scheme: str, syllables=None, tolerance: int = 2, seeds=(), n: int = 5, deadline=None,
+              priority=None):
+        """
+        Up to n stanzas as (score, lines), best first, plus whether the search
+        finished before `deadline` (a time.perf_counter() value). `lines` holds
+        (CorpusLine, letter, is seed) per position; the score is the mean over
+        generated lines of line_score times NEAR_FACTOR for letters rhyming on
+        tail_d1 only.
+        syllables: target per line (None: any length); lines more than
+        `tolerance` off are never used.
+        seeds: CorpusLine rows fixed at the first positions.
+        priority(word): optional rank among equally long lines (None ranks last).
+        """
+        positions = parse_scheme(scheme)
+        size = sum(map(len, positions.values()))
+        if len(seeds) >= size:
+            raise ValueError("Seeds must leave at least one line to fill")
+        seeded = {letter: [seeds[i] for i in at if i < len(seeds)] for letter, at in positions.items()}
+        letters, options = [], []
+        for letter, at in positions.items():
+            letter_options = self._options(seeded[letter], len(at) - len(seeded[letter]), syllables, tolerance,
+                                           priority, deadline)
+            if letter_options is None:
+                return [], False  # out of time before the search could start
+            if not letter_options:
+                return [], True
+            letters.append(letter)
+            options.append(letter_options)
+
+        # Seeded letters have one class; letters with fewest choices go first
+        order = sorted(range(len(letters)), key=lambda i: len(options[i]))
+        letters = [letters[i] for i in order]
+        options = [options[i] for i in order]
+        best_rest = [0.0] * (len(options) + 1)
+        for i in range(len(options) - 1, -1, -1):
+            best_rest[i] = best_rest[i + 1] + options[i][0][0]
+
+        top = []  # min-heap of (total, -arrival, choice per letter)
+        arrival = count()
+        found = set()  # line sets already in `top`: ABAB with A and B swapped is the same stanza
+        complete = True
+
+        def search(i, total, used, chosen):
+            nonlocal complete
+            if i == len(options):
+                lines = frozenset(map(id, chain.from_iterable(chosen)))
+                if lines in found:
+                    return
+                found.add(lines)
+                item = (total, -next(arrival), list(chosen))
+                if len(top) < n:
+                    heappush(top, item)
+                elif item > top[0]:
+                    heapreplace(top, item)
+                return
+            for score, tail_d1, lines in options[i]:
+                if len(top) == n and total + score + best_rest[i + 1] <= top[0][0]:
+                    break  # options are sorted: the rest cannot do better either
+                if deadline is not None and time.perf_counter() > deadline:
+                    complete = False
+                    return
+                if tail_d1 in used:
+                    continue
+                used.add(tail_d1)
+                chosen.append(lines)
+                search(i + 1, total + score, used, chosen)
+                chosen.pop()
+                used.discard(tail_d1)
+
+        search(0, 0.0, set(), [])
+        generated = size - len(seeds)
+        stanzas = []
+        for total, _, chosen in sorted(top, reverse=True):
+            stanza = [(line, self._letter_of(positions, i), True) for i, line in enumerate(seeds)]
+            stanza.extend([None] * generated)
+            for letter, lines in zip(letters, chosen):
+                free = [i for i in positions[letter] if i >= len(seeds)]
+                for i, line in zip(free, lines):
+                    stanza[i] = (line, letter, False)
+            stanzas.append((round(total / generated, 4), stanza))
+        return stanzas, complete
+
+    @staticmethod
+    def _letter_of(positions, index):
+        return next(letter for letter, at in positions.items() if index in at)
+
+    def _options(self, seeds, need, syllables, tolerance, priority, deadline=None):
+        """
+        (summed score, tail_d1, lines) per rhyme class able to fill a letter,
+        best first; None if `deadline` passed before they were all gathered.
+        """
+        if seeds:
+            tail_d1 = seeds[0].tail_d1
+            if any(line.tail_d1 != tail_d1 for line in seeds):
+                return []
+            classes = {tail_d1: self.classes.get(tail_d1, [])}
+        else:
+            classes = self.classes
+        seed_tails = {line.tail_d2 for line in seeds}
+        options = []
+        for tail_d1, tails in classes.items():
+            if need == 0:
+                options.append((0.0, tail_d1, []))
+                continue
+            buckets = [self.lines_by_d2[tail] for tail in tails]
+            if syllables is not None:
+                buckets = [bucket for bucket in buckets if bucket.min_syllables <= syllables + tolerance
+                           and bucket.max_syllables >= syllables - tolerance]
+            # One tail_d2 alone (a full rhyme), or the whole class
+            groups = [[bucket] for bucket in buckets if not seed_tails or seed_tails == {bucket.lines[0].tail_d2}]
+            if len(buckets) > 1:
+                groups.append(buckets)
+            best = None
+            for group in groups:
+                if deadline is not None and time.perf_counter() > deadline:
+                    return None
+                lines = self._pick(group, syllables, tolerance, need, seeds, priority, deadline)
+                if len(lines) < need:
+                    continue
+                factor = 1.0 if len(seed_tails.union(line.tail_d2 for line in lines)) == 1 else NEAR_FACTOR
+                score = factor * sum(line_score(line.syllables, syllables) for line in lines)
+                if best is None or score > best[0]:
+                    best = (score, tail_d1, lines)
+            if best is not None:
+                options.append(best)
+        if deadline is not None and time.perf_counter() > deadline:
+            return None
+        options.sort(key=lambda option: -option[0])
+        return options
+
+    @staticmethod
+    def _pick(buckets, syllables, tolerance, need, seeds, priority, deadline=None):
+        # Up to `need` lines, nearest the target syllable count first; a word
+        # rhymed with itself is no rhyme, so each line needs a new last word.
+        # Past `deadline` the lines so far are returned; _options then gives up
+        if syllables is None:
+            levels = [list(chain.from_iterable(buckets))]
+        else:
+            levels = ([line for bucket in buckets for line in bucket.at_distance(syllables, d)]
+                      for d in range(tolerance + 1))
+        picked, words = [], {line.last_word for line in seeds}
+        for level in levels:
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            if priority is not None:
+                level.sort(key=lambda line: -(priority(line.last_word) or 0.0))  # stable: corpus order on ties
+            for line in level:
+                if line.last_word not in words:
+                    words.add(line.last_word)
+                    picked.append(line)
+                    if len(picked) == need:
+                        return picked
+        return picked
@@ -0,0 +1,111 @@
+"""
+Syllable counts for words and lines: one rule and one memo shared by verse
+search, the corpus loader, the stanza solver, scheme verification and the
+blueprint checks.
+
+A word has as many syllables as it has vowels after PhoneticEngine.normalize,
+a softening i (consonant + i + vowel) not counted: "piosenka" 3, "nauka" 3.
+A word with no vowel counts 1, a token with no letters 0. Counts are kept
+per token as written ("Nocą," and "nocą" are separate entries) in a bounded
+LRU, so lyrics that keep reusing their words are counted once per word.
+"""
+import re
+from collections import OrderedDict
+from itertools import chain
+
+from config import SYLLABLE_CACHE_WORDS
+from phonetic_engine import PhoneticEngine
+
+RE_NON_WORD = re.compile(r'[^\w]')
+
+
+class SyllableCounter:
+    """
+    Memoized syllable counting. The memo is a plain OrderedDict rather than a
+    result_cache.LRUCache: a hit has to stay far below the ~6us a count costs,
+    and the GIL keeps each dict operation atomic (hit/miss counters may drift
+    by a few under threads).
+    """
+
+    def __init__(self, max_words: int = 100000, engine=None):
+        self.max_words = max_words
+        self.engine = engine or PhoneticEngine()  # normalize only: no vocabulary needed
+        self._memo = OrderedDict()  # token -> count, least recently used first
+        self.hits = self.misses = self.evictions = 0
+
+    def word(self, token: str) -> int:
+        count = self._memo.get(token)
+        if count is not None:
+            self.hits += 1
+            self._touch(token)
+            return count
+        self.misses += 1
+        count = self._count([token])[0]
+        self._remember(token, count)
+        return count
+
+    def line(self, text: str) -> int:
+        return sum(map(self.word, text.split()))
+
+    def lines(self, texts) -> list:
+        """line() for many lines; tokens not in the memo are normalized as one batch."""
+        split = [text.split() for text in texts]
+        memo = self._memo
+        counts = {}
+        missing = []
+        for token in chain.from_iterable(split):
+            if token in counts:
+                continue
+            count = counts[token] = memo.get(token)
+            if count is None:
+                missing.append(token)
+            else:
+                self._touch(token)
+        self.hits += len(counts) - len(missing)
+        self.misses += len(missing)
+        for token, count in zip(missing, self._count(missing)):
+            counts[token] = count
+            self._remember(token, count)
+        return [sum(map(counts.__getitem__, tokens)) for tokens in split]
+
+    def _count(self, tokens) -> list:
+        engine = self.engine
+        cleaned = [RE_NON_WORD.sub('', token.lower()) for token in tokens]
+        return [max(len(engine.get_vowel_positions(norm)), 1) if clean else 0
+                for clean, norm in zip(cleaned, engine.normalize_many(cleaned))]
+
+    def _touch(self, token):
+        try:
+            self._memo.move_to_end(token)
+        except KeyError:  # evicted by another thread meanwhile
+            pass
+
+    def _remember(self, token, count):
+        if self.max_words <= 0:
+            return
+        memo = self._memo
+        memo[token] = count
+        while len(memo) > self.max_words:
+            try:
+                memo.popitem(last=False)
+            except KeyError:
+                break
+            self.evictions += 1
+
+    def clear(self):
+        self._memo.clear()
+
+    def __len__(self):
+        return len(self._memo)
+
+    def stats(self) -> dict:
+        # The shape of result_cache.LRUCache.stats(), for the /metrics collector
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._memo), "size": len(self._memo),
+            "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+SYLLABLES = SyllableCounter(SYLLABLE_CACHE_WORDS)
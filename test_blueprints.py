@@ -1,5 +1,5 @@
 import json
-from polish_rhyme_util import count_syllables, verify_rhyme_scheme
+from polish_rhyme_util import count_line_syllables, verify_stanzas
 
 def run_tests():
     try:
@@ -16,13 +16,13 @@ def run_tests():
 
     for mode, stanzas in blueprints.items():
         print(f"\nMode: {mode}")
-        for i, stanza in enumerate(stanzas):
+        # Verify Rhyme Scheme (every stanza of the mode in one batch)
+        counts = iter(count_line_syllables([line for stanza in stanzas for line in stanza]))
+        for i, (stanza, (is_match, suffixes)) in enumerate(zip(stanzas, verify_stanzas(stanzas, mode))):
             total_count += 1
-            # Verify Rhyme Scheme
-            is_match, suffixes = verify_rhyme_scheme(stanza, mode)
             
             # Verify Syllable Counts (classic 11, or at least consistent)
-            syllable_counts = [sum(count_syllables(word) for word in line.split()) for line in stanza]
+            syllable_counts = [next(counts) for _ in stanza]
             
             status = "PASS" if is_match else "FAIL RHYME"
             # Optional: check if lines are consistent length
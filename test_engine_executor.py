@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from engine_executor import EngineExecutor, Saturated
+
+
+@pytest.mark.parametrize("mode", ["inline", "thread", "process"])
+def test_modes_return_results(mode):
+    executor = EngineExecutor(mode, workers=1)
+    try:
+        assert asyncio.run(executor.run(pow, 2, 10)) == 1024
+        assert executor.pending == 0
+    finally:
+        executor.shutdown()
+
+
+def test_saturated_rejects_instead_of_queueing():
+    executor = EngineExecutor("thread", workers=1, max_pending=1)
+
+    async def main():
+        release = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        def block():
+            asyncio.run_coroutine_threadsafe(release.wait(), loop).result()
+
+        first = asyncio.ensure_future(executor.run(block))
+        await asyncio.sleep(0.05)
+        with pytest.raises(Saturated):
+            await executor.run(pow, 2, 2)
+        release.set()
+        await first
+
+    try:
+        asyncio.run(main())
+        assert executor.rejected == 1 and executor.pending == 0
+    finally:
+        executor.shutdown()
+
+
+def test_reserve_counts_against_max_pending():
+    executor = EngineExecutor("inline", max_pending=1)
+    release = executor.reserve()
+    with pytest.raises(Saturated):
+        asyncio.run(executor.run(pow, 2, 2))
+    release()
+    release()  # a second call is a no-op
+    assert executor.pending == 0 and executor.rejected == 1
+    assert asyncio.run(executor.run(pow, 2, 2)) == 4
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        EngineExecutor("fibers")
@@ -0,0 +1,35 @@
+import io
+
+from metrics import Counter, Histogram, METRICS, render
+from request_log import RequestLog
+
+
+def test_histogram_renders_cumulative_buckets():
+    hist = Histogram("test_latency_seconds", "Test latency", "stage", buckets=(0.1, 1.0))
+    counter = Counter("test_events_total", "Test events")
+    try:
+        for value in (0.05, 0.5, 0.5, 3.0):
+            hist.observe(value, "parse")
+        counter.inc(amount=2)
+        lines = render().splitlines()
+    finally:
+        METRICS.remove(hist)
+        METRICS.remove(counter)
+    assert "# TYPE test_latency_seconds histogram" in lines
+    assert 'test_latency_seconds_bucket{stage="parse",le="0.1"} 1' in lines
+    assert 'test_latency_seconds_bucket{stage="parse",le="1"} 3' in lines
+    assert 'test_latency_seconds_bucket{stage="parse",le="+Inf"} 4' in lines
+    assert 'test_latency_seconds_sum{stage="parse"} 4.05' in lines
+    assert 'test_latency_seconds_count{stage="parse"} 4' in lines
+    assert "test_events_total 2" in lines
+
+
+def test_request_log_is_sampled_and_written_off_thread():
+    assert not any(RequestLog("test.never", sample_rate=0).sample() for _ in range(100))
+
+    out = io.StringIO()
+    log = RequestLog("test.always", sample_rate=1, stream=out)
+    assert log.sample()
+    log.info("word=%s tail=%s", "kawa", "awa")
+    log.stop()  # drains the queue
+    assert out.getvalue().rstrip().endswith("word=kawa tail=awa")
@@ -1,6 +1,11 @@
+import os
+import re
+
 import pytest
 from phonetic_engine import PhoneticEngine
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
 @pytest.fixture
 def engine():
     # Mini vocabulary for testing
@@ -18,6 +23,31 @@ def test_normalize_digraphs(engine):
     # business -> biznes is in the map
     assert engine.normalize("business") == "biznes" 
 
+def legacy_normalize(engine, word):
+    # The regex chain normalize() replaced, kept as the reference
+    w = word.lower()
+    w = engine.en_digraphs.get(w, w)
+    w = re.sub(r'dzi', 'dź', w)
+    w = re.sub(r'dż|rz', 'ż', w)
+    w = re.sub(r'ch', 'h', w)
+    for char in ('ci', 'si', 'zi', 'ni'):
+        w = re.sub(char + r'(?=[aeąęioóuy])', char[0] + 'i', w)
+    w = w.replace('ó', 'u').replace('y', 'i')
+    w = re.sub(r'ą$', 'om', w)
+    w = re.sub(r'ę$', 'em', w)
+    return w.translate(str.maketrans('łńśćźż', 'lnsczz'))
+
+def test_normalize_matches_legacy_chain(engine):
+    with open(os.path.join(BASE_DIR, "words_pl.txt"), encoding="utf-8") as f:
+        words = f.read().split("\n")
+    with open(os.path.join(BASE_DIR, "lyrics_corrected.txt"), encoding="utf-8") as f:
+        words += f.read().split()
+    words += list(engine.en_digraphs) + [
+        "DŻEM", "drzwi", "dzidzia", "rzdzi", "chrząszcz", "dżdżownica", "mą\n", "idę", "ąę", "",
+    ]
+    mismatches = [w for w in words if engine.normalize(w) != legacy_normalize(engine, w)]
+    assert not mismatches
+
 def test_get_vowel_positions(engine):
     # 'dom' -> 1 vowel at index 1 ('o')
     assert engine.get_vowel_positions("dom") == [1]
@@ -51,3 +81,124 @@ def test_find_candidates_perfect(engine):
     results = engine.find_candidates("krowa")
     words = [r[0] for r in results]
     assert "sowa" in words
+
+def test_index_views(engine):
+    # Columnar store still exposes WordEntry rows through Mapping views
+    assert [e.original for e in engine.index_d2["owa"]] == ["krowa", "sowa"]
+    assert engine.word_map["sowa"] == engine.build_entry("sowa")
+    assert "kot" not in engine.word_map
+
+    # build_index extends the existing store and skips duplicates
+    engine.build_index(["kot", "dom"])
+    assert len(engine.word_map) == 8
+    assert "kot" in engine.word_map
+
+def test_find_candidates_top_k(engine):
+    full = engine.find_candidates("kawa")
+    top = engine.find_candidates("kawa", k_per_grade=1)
+    for grade in {g for _, g, _ in full}:
+        assert [r for r in top if r[1] == grade] == [r for r in full if r[1] == grade][:1]
+
+    # priority multiplies scores and can drop words
+    boosted = engine.find_candidates("krowa", priority={"sowa": 2.0}.get)
+    assert boosted == [("sowa", "PERFECT", 2.0)]
+
+def test_entries_match_build_entry(engine):
+    words = ["krowa", "sowa", "głowa", "dom", "tom", "kawa", "mapa", "bzz", "rzeka", "dziecko", "sowa", "Design"]
+    assert list(engine.entries(words, chunk_size=3)) == list(map(engine.build_entry, words))
+    assert list(engine.entries(iter([]))) == []
+
+
+def test_with_vocabulary_matches_fresh_build():
+    old = PhoneticEngine(["krowa", "sowa", "dom", "kawa"])
+    new, added, removed = old.with_vocabulary(["sowa", "głowa", "kawa", "tom", "sowa"])
+    assert (added, removed) == (2, 2)
+    assert "krowa" in old.word_map  # old engine untouched
+    ref = PhoneticEngine(["sowa", "głowa", "kawa", "tom"])
+    assert list(new.word_map) == list(ref.word_map)
+    for index in ("index_d2", "index_d1", "index_vowels"):
+        assert dict(getattr(new, index).items()) == dict(getattr(ref, index).items())
+
+
+def test_ranked_top_k_is_exact_without_scan_caps():
+    vocab = ["kawa", "mapa", "lama", "trawa", "zabawa", "sala", "rama", "brama", "fala", "papa", "ława",
+             "sowa", "krowa", "głowa", "mowa", "zakawa", "panama", "alfa", "gama", "plama", "wata"]
+    engine = PhoneticEngine(vocab)
+    # Ties, drops (None) and late-alphabet favourites
+    boosts = {"trawa": None, "wata": 3.0, "plama": 2.0, "papa": 2.0}
+    priority = [boosts.get(w, 1.0 + (i % 3) * 0.5) for i, w in enumerate(engine.word_map)]
+    engine.NEAR_SCAN_LIMIT = engine.ASSONANCE_SCAN_LIMIT = 10**9
+
+    def uncapped(word, k):
+        heaps = {}
+        PhoneticEngine._push(heaps, engine._scan(engine.build_entry(word)), k, None, 0, priority)
+        return PhoneticEngine._ranked(heaps)
+
+    for word in ("kawa", "mapa", "krowa", "zabawa", "dom"):
+        for k in (1, 2, 5):
+            assert engine.find_candidates(word, k_per_grade=k, priority_by_id=priority) == uncapped(word, k)
+
+    # With a tight cap the alphabetical scan never reaches "wata"; ranked retrieval does
+    engine.ASSONANCE_SCAN_LIMIT = 3
+    heaps = {}
+    PhoneticEngine._push(heaps, engine._scan(engine.build_entry("kawa")), 1, None, 0, priority)
+    assert PhoneticEngine._ranked(heaps)[0][0] != "wata"
+    ranked = engine.find_candidates("kawa", k_per_grade=1, priority_by_id=priority)
+    assert ("wata", "DOMINANT") in [(w, g) for w, g, _ in ranked]
+
+
+def test_find_deep_rhymes_matches_brute_force():
+    vocab = ["kochanie", "zakochanie", "słuchanie", "granie", "pranie", "śpiewanie", "ogrzewanie", "dywanie",
+             "wołanie", "kawa", "zabawa", "obawa", "przyjaciela", "nieprzyjaciela", "nauczyciela", "dom"]
+    engine = PhoneticEngine(vocab)
+
+    def depth_of(target, word):
+        a, b = engine.normalize(target), engine.normalize(word)
+        shared = 0
+        while shared < min(len(a), len(b)) and a[-1 - shared] == b[-1 - shared]:
+            shared += 1
+        return sum(1 for v in engine.get_vowel_positions(a) if v >= len(a) - shared), shared
+
+    for target in ("kochanie", "śpiewanie", "zabawa", "przyjaciela", "dom", "nieznane"):
+        got = engine.find_deep_rhymes(target, k=len(vocab), min_depth=2)
+        expected = sorted(((w, *depth_of(target, w)) for w in vocab if w != target), key=lambda r: -r[2])
+        expected = [(w, d) for w, d, _ in expected if d >= 2]
+        assert sorted((w, d) for w, d, _ in got) == sorted(expected)
+        assert [d for _, d, _ in got] == sorted((d for _, d, _ in got), reverse=True)
+
+    assert engine.find_deep_rhymes("kochanie", k=1, min_depth=3) == [("zakochanie", 3, "kohanie")]
+    priority = [None if w == "zakochanie" else 1.0 for w in engine.word_map]
+    assert "zakochanie" not in [w for w, _, _ in engine.find_deep_rhymes("kochanie", priority_by_id=priority)]
+
+
+def test_find_slant_rhymes_matches_brute_force():
+    from phonetic_engine import BKTree, cluster_distance, slant_key
+
+    vocab = ["kot", "kod", "pod", "lot", "kort", "most", "woda", "kota", "nota", "moda", "ziemią", "plemion",
+             "ramion", "rzeka", "biega", "szpiega", "serce", "mordercze", "dom", "tom"]
+    engine = PhoneticEngine(vocab)
+    assert slant_key("ota") == slant_key("oda") == ("o-a", ("", "t", ""))
+    assert slant_key("emiom") == slant_key("emion")  # om/on
+
+    for target in ("kot", "woda", "ziemią", "rzeka", "serce", "nieznane"):
+        tail = engine.build_entry(target).tail_d2
+        skeleton, clusters = slant_key(tail)
+        for radius in (0, 1, 2):
+            expected = set()
+            for word in vocab:
+                other = engine.build_entry(word).tail_d2
+                other_skeleton, other_clusters = slant_key(other)
+                distance = cluster_distance(clusters, other_clusters)
+                if other != tail and other_skeleton == skeleton and distance <= radius:
+                    expected.add((word, distance, other))
+            got = engine.find_slant_rhymes(target, k=len(vocab), max_distance=radius)
+            assert set(got) == expected
+            assert [d for _, d, _ in got] == sorted(d for _, d, _ in got)
+
+    assert [w for w, _, _ in engine.find_slant_rhymes("kot", k=2, max_distance=0)] == ["kod", "pod"]
+    priority = [None if w == "pod" else 1.0 for w in engine.word_map]
+    assert "pod" not in [w for w, _, _ in engine.find_slant_rhymes("kot", priority_by_id=priority)]
+
+    tree = BKTree(lambda a, b: abs(a - b), range(0, 100, 7))
+    assert sorted(tree.search(50, 6)) == [(1, 49), (6, 56)]
+    assert tree.search(3, 2) == []
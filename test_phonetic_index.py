@@ -0,0 +1,50 @@
+import pytest
+
+import phonetic_index
+from phonetic_engine import PhoneticEngine
+from phonetic_index import MappedIndex, load_engine, write_index
+
+VOCAB = ["dom", "tom", "krowa", "sowa", "mama", "tata", "design", "kawa", "mapa", "żółw", "rzeka"]
+
+
+@pytest.fixture
+def compiled(tmp_path):
+    engine = PhoneticEngine(VOCAB)
+    path = str(tmp_path / "index.bin")
+    write_index(engine, path, b"digest")
+    return engine, path
+
+
+def test_mapped_engine_matches_in_memory(compiled):
+    engine, path = compiled
+    mapped = load_engine(path, expected_digest=b"digest")
+    for word in VOCAB + ["nocą", "xyz"]:
+        assert mapped.find_candidates(word) == engine.find_candidates(word)
+
+
+def test_mapped_views(compiled):
+    engine, path = compiled
+    index = MappedIndex(path)
+    assert index.word_map["żółw"] == engine.word_map["żółw"]
+    assert "rzeka" in index.word_map and "brak" not in index.word_map
+    assert index.index_d2["owa"] == engine.index_d2["owa"]
+    assert sorted(index.index_vowels) == sorted(engine.index_vowels)
+    assert index.index_d1.get("nieznany") is None
+
+
+def test_stale_or_invalid_index_rejected(compiled, tmp_path):
+    _, path = compiled
+    with pytest.raises(ValueError):
+        MappedIndex(path, expected_digest=b"other")
+    bogus = tmp_path / "bogus.bin"
+    bogus.write_bytes(b"not an index")
+    with pytest.raises(ValueError):
+        MappedIndex(str(bogus))
+
+
+def test_index_from_other_engine_code_rejected(compiled, monkeypatch):
+    # e.g. the normalization rules were edited after the index was compiled
+    _, path = compiled
+    monkeypatch.setattr(phonetic_index, "code_digest", lambda *names: b"\1" * 32)
+    with pytest.raises(ValueError, match="engine code"):
+        MappedIndex(path, expected_digest=b"digest")
@@ -0,0 +1,64 @@
+import json
+import os
+import re
+
+import pytest
+
+import polish_rhyme_util
+from polish_rhyme_util import get_phonetic_suffix, song_stanzas, verify_rhyme_scheme, verify_stanzas
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def legacy_verify(stanza, scheme):
+    # The per-stanza verifier verify_stanzas replaced, kept as the reference
+    suffixes = [get_phonetic_suffix(re.sub(r'[^\w]', '', line.split()[-1])) if line.split() else "" for line in stanza]
+    if len(suffixes) < 4:
+        return False, suffixes
+    t = []
+    for s in suffixes:
+        vp = polish_rhyme_util._PHONETICS.get_vowel_positions(s)
+        t.append(s[vp[-1]:] if vp else s)
+    pairs = {"AABB": ((0, 1), (2, 3)), "ABAB": ((0, 2), (1, 3)), "ABBA": ((0, 3), (1, 2))}.get(scheme)
+    return pairs is not None and all(t[a] == t[b] for a, b in pairs), suffixes
+
+
+@pytest.fixture(scope="module")
+def blueprints():
+    with open(os.path.join(BASE_DIR, "blueprint_tests.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_batch_matches_legacy_verifier(blueprints):
+    stanzas = [stanza for group in blueprints.values() for stanza in group]
+    for scheme in ("AABB", "ABAB", "ABBA"):
+        expected = [legacy_verify(stanza, scheme) for stanza in stanzas]
+        assert verify_stanzas(stanzas, scheme) == expected
+        assert [verify_rhyme_scheme(stanza, scheme) for stanza in stanzas] == expected
+    schemes = [scheme for scheme, group in blueprints.items() for _ in group]
+    assert [match for match, _ in verify_stanzas(stanzas, schemes)] == [
+        legacy_verify(stanza, scheme)[0] for stanza, scheme in zip(stanzas, schemes)
+    ]
+
+
+def test_any_scheme_and_songs(blueprints, monkeypatch):
+    a, b = blueprints["AABB"][0], blueprints["AABB"][1]
+    song = "\n".join(a + [""] + b + ["", a[0]])
+    assert song_stanzas(song, 4) == [a, b, [a[0]]]
+
+    c = blueprints["ABAB"][0]  # ...ite / ...oda
+    suffixes = ["ite", "oda", "ite", "oda", "ite", "oda"]
+    assert verify_stanzas([c + c[:2]] * 3, ["ababab", "ABABBA", "ABABCD"]) == [
+        (True, suffixes), (False, suffixes), (True, suffixes),
+    ]
+    assert verify_stanzas([a[:3]], "AABB")[0][0] is False
+    with pytest.raises(ValueError):
+        verify_stanzas([a], "AA BB")
+
+    # Each distinct last word is normalized once per batch
+    seen = []
+    entry_columns = polish_rhyme_util._PHONETICS.entry_columns
+    monkeypatch.setattr(polish_rhyme_util._PHONETICS, "entry_columns", lambda words: seen.append(words)
+                        or entry_columns(words))
+    verify_stanzas([a, a, b, a + b], "AABB")
+    assert len(seen) == 1 and sorted(seen[0]) == sorted({re.sub(r'[^\w]', '', l.split()[-1].lower()) for l in a + b})
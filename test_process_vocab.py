@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+import process_vocab
+from phonetic_index import file_digest, load_engine
+
+
+@pytest.fixture
+def base(tmp_path):
+    (tmp_path / "data").mkdir()
+    (tmp_path / "words_freq.txt").write_text("nie 100\nkrowa 50\nsowa 40\nbzzz 30\nkawa 20\n", encoding="utf-8")
+    (tmp_path / "lyrics_corrected.txt").write_text("Leci sowa nad głową\nPiję kawę\n", encoding="utf-8")
+    (tmp_path / "data" / "vulgar.txt").write_text("kurde\n", encoding="utf-8")
+    (tmp_path / "data" / "entities.txt").write_text("Mata|Matie,Maty|rapper\n", encoding="utf-8")
+    return tmp_path
+
+
+def run(base):
+    return process_vocab.process(str(base), vocabulary_path=str(base / "words_pl.txt"),
+                                 scores_path=str(base / "word_scores.json"),
+                                 score_table_path=str(base / "word_scores.bin"),
+                                 index_path=str(base / "phonetic_index.bin"))
+
+
+def test_pipeline_outputs(base):
+    run(base)
+    words = (base / "words_pl.txt").read_text(encoding="utf-8").split("\n")[:-1]
+    assert words == sorted(["nie", "krowa", "sowa", "kawa", "leci", "nad", "głową", "piję", "kawę",
+                            "kurde", "mata", "matie", "maty"])
+    scores = json.loads((base / "word_scores.json").read_text(encoding="utf-8"))
+    assert scores["sowa"] == {"s": 2.0}
+    assert scores["mata"] == {"s": 2.5, "f": ["entity", "rapper"]}
+    assert scores["kurde"] == {"s": 1.0, "f": ["vulgar"]}
+    engine = load_engine(str(base / "phonetic_index.bin"), file_digest(str(base / "words_pl.txt")))
+    assert list(engine.word_map) == words
+
+
+def test_pipeline_reruns_only_changed_stages(base):
+    assert not run(base).cached
+    assert not run(base).ran
+
+    # New vulgar word: new vocabulary, everything downstream reruns
+    with open(base / "data" / "vulgar.txt", "a", encoding="utf-8") as f:
+        f.write("cholera\n")
+    assert run(base).cached == ["freq_words", "lyrics_words", "entities"]
+
+    # Reordered lyrics with the same words: parsed again, nothing else
+    (base / "lyrics_corrected.txt").write_text("Piję kawę\nLeci sowa nad głową\n", encoding="utf-8")
+    assert run(base).ran == ["lyrics_words"]
+
+    # Edited engine rules: both serving artifacts are rebuilt, nothing else
+    code_digest = process_vocab.code_digest
+    process_vocab.code_digest = lambda *names: code_digest(*names)[::-1]
+    try:
+        assert run(base).ran == ["score_table", "phonetic_index"]
+    finally:
+        process_vocab.code_digest = code_digest
+    assert run(base).ran == ["score_table", "phonetic_index"]  # and back
+
+    # A hand-edited output is regenerated
+    (base / "word_scores.json").write_text("{}", encoding="utf-8")
+    assert run(base).ran == ["word_scores"]
+    assert json.loads((base / "word_scores.json").read_text(encoding="utf-8"))
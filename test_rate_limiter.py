@@ -0,0 +1,70 @@
+import multiprocessing
+
+import pytest
+
+from rate_limiter import MemoryBackend, RateLimiter, SQLiteBackend
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryBackend(sweep_interval=5)
+    return SQLiteBackend(str(tmp_path / "buckets.sqlite3"), sweep_interval=5)
+
+
+def test_bucket_bursts_then_refills(backend):
+    clock = Clock()
+    limiter = RateLimiter(6, backend, clock=clock)  # 6/min = one token per 10s
+    assert [limiter.allow("a") for _ in range(6)] == [0.0] * 6
+    assert limiter.allow("a") == pytest.approx(10.0)
+    assert limiter.allow("b") == 0.0  # keys are independent
+
+    clock.now += 5
+    assert limiter.allow("a") == pytest.approx(5.0)  # half a token so far
+    clock.now += 5
+    assert limiter.allow("a") == 0.0
+    assert limiter.allow("a") > 0
+
+
+def test_idle_keys_are_swept(backend):
+    clock = Clock()
+    limiter = RateLimiter(30, backend, clock=clock)
+    for i in range(100):
+        limiter.allow(f"10.0.0.{i}")
+    assert len(backend) == 100
+
+    clock.now += 30
+    limiter.allow("10.0.0.1")  # keeps this one fresh
+    clock.now += 31  # the rest idle for a full refill: same as absent
+    limiter.allow("10.0.1.1")
+    assert len(backend) == 2
+
+    limiter.reset()
+    assert len(backend) == 0
+
+
+def _drain(path, out):
+    limiter = RateLimiter(50, SQLiteBackend(path, timeout=5))
+    out.put(sum(limiter.allow("shared") == 0.0 for _ in range(40)))
+
+
+def test_sqlite_limit_holds_across_processes(tmp_path):
+    path = str(tmp_path / "buckets.sqlite3")
+    SQLiteBackend(path)
+    out = multiprocessing.Queue()
+    procs = [multiprocessing.Process(target=_drain, args=(path, out)) for _ in range(3)]
+    for p in procs:
+        p.start()
+    admitted = sum(out.get(timeout=30) for _ in procs)
+    for p in procs:
+        p.join()
+    # 120 attempts against one 50-token bucket (plus a trickle of refill)
+    assert 50 <= admitted <= 52
@@ -0,0 +1,68 @@
+from phonetic_engine import PhoneticEngine
+from result_cache import LRUCache
+
+
+def test_lru_eviction_and_counters():
+    cache = LRUCache(max_entries=2)
+    cache.put("a", [1])
+    cache.put("b", [2])
+    assert cache.get("a") == [1]      # "a" becomes most recent
+    cache.put("c", [3])               # evicts "b"
+    assert "b" not in cache and cache.get("c") == [3]
+    assert cache.get("b") is None
+    assert {**cache.stats(), "hit_rate": 0} == {
+        "entries": 2, "size": 2, "hits": 2, "misses": 1, "evictions": 1, "hit_rate": 0,
+    }
+
+
+def test_lru_size_bound():
+    cache = LRUCache(max_entries=10, max_size=5)
+    cache.put("big", list(range(4)))
+    cache.put("small", [1, 2])        # 6 > 5 -> evicts "big"
+    assert "big" not in cache and "small" in cache
+    cache.put("huge", list(range(6)))  # larger than the whole budget: skipped
+    assert "huge" not in cache and len(cache) == 1
+
+
+def test_engine_cache_invalidated_on_rebuild():
+    engine = PhoneticEngine(["dom", "tom"], cache=LRUCache())
+    assert [w for w, _, _ in engine.find_candidates("dom")] == ["tom"]
+    assert [w for w, _, _ in engine.find_candidates("dom")] == ["tom"]
+    assert engine.cache.hits == 1
+
+    engine.build_index(["złom"])
+    assert len(engine.cache) == 0
+    assert {w for w, _, _ in engine.find_candidates("dom")} == {"tom", "złom"}
+
+
+def test_engine_cache_holds_ranked_results():
+    engine = PhoneticEngine(["dom", "tom", "złom", "kot"], cache=LRUCache())
+    priority = [1.0] * len(engine.word_map)
+    ranked = engine.find_candidates("dom", k_per_grade=2, priority_by_id=priority)
+    tiers = list(engine.iter_tiers("dom", k_per_grade=2, priority_by_id=priority, counts={}))
+    assert engine.cache.hits == 1 and tiers[-1][1] == ranked
+    engine.find_candidates("dom", k_per_grade=1, priority_by_id=priority)  # its own key
+    assert engine.cache.hits == 1 and len(engine.cache) == 2
+
+    counts = {}
+    engine.cache.clear()
+    list(engine.iter_tiers("dom", k_per_grade=2, priority_by_id=priority, counts=counts))
+    assert counts["PERFECT"] > 0 and engine.find_candidates("dom", k_per_grade=2, priority_by_id=priority) == ranked
+    assert engine.cache.hits == 2
+
+    # A new priority table (scores reloaded) never sees results ranked with the
+    # old one, even when a request still on the old table stores them late
+    engine.cache.clear()
+    old = engine.iter_tiers("dom", k_per_grade=2, priority_by_id=priority)
+    next(old)  # keyed before the reload...
+    reloaded = [0.5] * len(priority)
+    fresh = engine.find_candidates("dom", k_per_grade=2, priority_by_id=reloaded)
+    assert fresh != ranked
+    assert list(old)[-1][1] == ranked  # ...stored after it
+    hits = engine.cache.hits
+    assert engine.find_candidates("dom", k_per_grade=2, priority_by_id=reloaded) == fresh
+    assert engine.find_candidates("dom", k_per_grade=2, priority_by_id=priority) == ranked
+    assert engine.cache.hits == hits + 2
+    entries = len(engine.cache)
+    engine.find_candidates("dom", k_per_grade=2, priority={"tom": 2.0}.get)  # a callable is never cached
+    assert len(engine.cache) == entries
@@ -0,0 +1,75 @@
+import math
+
+import pytest
+
+import score_store
+from phonetic_engine import PhoneticEngine
+from score_store import ScoreTable, compile_scores, write_scores
+
+SCORES = {
+    "kawa": {"s": 1.5},
+    "żółw": {"s": 2.0},
+    "2pac": {"s": 2.5, "f": ["entity", "rapper"]},
+    "warszawa": {"s": 3.0, "f": ["entity", "city"]},
+    "kurwa": {"s": 0.5, "f": ["vulgar"]},
+}
+VOCABULARY = ["warszawa", "kawa", "mapa", "żółw", "kurwa"]  # "2pac" only in the scores
+
+
+@pytest.fixture
+def engine():
+    return PhoneticEngine(VOCABULARY)
+
+
+@pytest.fixture
+def table_path(tmp_path, engine):
+    path = str(tmp_path / "scores.bin")
+    write_scores(SCORES, engine.word_map, path, b"digest", b"vocab")
+    return path
+
+
+def test_table_matches_source(table_path, engine):
+    for table in (ScoreTable(table_path, engine.word_map, b"digest", b"vocab"),
+                  ScoreTable.from_scores(SCORES, engine.word_map)):
+        assert dict(table) == SCORES
+        assert table.get("brak", {}) == {} and "mapa" not in table
+        assert "żółw" in table and len(table) == len(SCORES)
+        # Columns are indexed by engine word id
+        assert list(table.scores[:2]) == [3.0, 1.5] and math.isnan(table.scores[2])
+        assert table.score(engine.word_map.word_id("mapa")) == 0.5
+        assert table.flags(table.flag_masks[0]) == ["entity", "city"]
+        assert table.meta("2pac") == (2.5, ["entity", "rapper"])
+
+
+def test_aligned_to_new_vocabulary(engine):
+    table = ScoreTable.from_scores(SCORES, engine.word_map)
+    other = PhoneticEngine(["kurwa", "kawa"])
+    moved = table.aligned(other.word_map)
+    assert dict(moved) == SCORES
+    assert list(moved.scores) == [0.5, 1.5]
+
+
+def test_stale_or_invalid_table_rejected(table_path, tmp_path, engine):
+    with pytest.raises(ValueError):
+        ScoreTable(table_path, engine.word_map, expected_digest=b"other")
+    with pytest.raises(ValueError):
+        ScoreTable(table_path, engine.word_map, expected_vocabulary_digest=b"other")
+    with pytest.raises(ValueError):
+        ScoreTable(table_path, PhoneticEngine(["kawa"]).word_map)
+    with pytest.MonkeyPatch.context() as m:
+        m.setattr(score_store, "code_digest", lambda *names: b"\1" * 32)  # engine or score code edited
+        with pytest.raises(ValueError, match="code changed"):
+            ScoreTable(table_path, engine.word_map, b"digest", b"vocab")
+    bogus = tmp_path / "bogus.bin"
+    bogus.write_bytes(b"not a table")
+    with pytest.raises(ValueError):
+        ScoreTable(str(bogus), engine.word_map)
+
+
+def test_converter_uses_engine_word_ids(tmp_path):
+    (tmp_path / "scores.json").write_text('{"sowa": {"s": 2.0}, "krowa": {"s": 1.0}}', encoding="utf-8")
+    (tmp_path / "words.txt").write_text("krowa\nab\nsowa\nkrowa\n", encoding="utf-8")
+    compile_scores(str(tmp_path / "scores.json"), str(tmp_path / "words.txt"), str(tmp_path / "scores.bin"))
+    engine = PhoneticEngine(["krowa", "sowa"])
+    table = ScoreTable(str(tmp_path / "scores.bin"), engine.word_map)
+    assert list(table.scores) == [1.0, 2.0]
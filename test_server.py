@@ -0,0 +1,330 @@
+import asyncio
+import json
+import sqlite3
+import subprocess
+import sys
+import time
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import config
+import server
+from corpus import load_lyrics_corpus
+from phonetic_engine import PhoneticEngine
+from rate_limiter import RateLimiter, SQLiteBackend
+from config import run_reload_hooks
+
+
+@pytest.fixture
+def client():
+    server.RATE_LIMITER.reset()
+    return TestClient(server.app)
+
+
+def test_word_mode_is_cached(client):
+    server.WORD_MODE_CACHE.clear()
+    first = client.post("/generate", json={"verse": "kawa"})
+    assert first.status_code == 200
+    body = first.json()
+    assert body["mode"] == "word"
+    assert body["words"]["PERFECT"]
+
+    hits = server.WORD_MODE_CACHE.hits
+    second = client.post("/generate", json={"verse": "kawa"})
+    assert second.json() == body
+    assert server.WORD_MODE_CACHE.hits == hits + 1
+
+    # Ranked candidates outlive the word-mode payload
+    server.WORD_MODE_CACHE.clear()
+    hits = server.ENGINE.cache.hits
+    assert client.post("/generate", json={"verse": "kawa"}).json() == body
+    assert server.ENGINE.cache.hits == hits + 1
+
+    run_reload_hooks("scores")
+    assert len(server.WORD_MODE_CACHE) == 0
+
+
+def test_verse_mode(client):
+    r = client.post("/generate", json={"verse": "Idę przez miasto nocą"})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["mode"] == "verse"
+    assert body["input_syllables"] > 0
+
+
+def test_rejects_empty_input(client):
+    assert client.post("/generate", json={"verse": "   "}).status_code == 400
+
+
+def test_corpus_lines_precomputed():
+    line = server.ALL_LINES[0]
+    assert line.lower == line.text.lower()
+    assert line.last_word == server.clean_last_word(line.text)
+    assert line.syllables == server.count_syllables(line.text)
+    assert line in server.LINES_BY_D2[line.tail_d2]
+    assert line in server.LINES_BY_WORD[line.last_word]
+
+
+def test_verse_search_expands_by_syllables(tmp_path):
+    # Early-stopping expansion must return the same score profile as scoring
+    # every line sharing the tail. On a private engine and corpus: the
+    # server's buckets are shared with the other tests.
+    with open(server.LYRICS_PATH, "r", encoding="utf-8") as f:
+        raw = f.readlines()[:600]
+    path = tmp_path / "lyrics.txt"
+    path.write_text("".join(raw), encoding="utf-8")
+    engine = PhoneticEngine(sorted({server.clean_last_word(text) for text in raw if text.strip()}))
+    lines_by_d2, lines_by_word, all_lines = load_lyrics_corpus(str(path), engine)
+    snap = server.Snapshot(engine, None, None, None, lines_by_d2, lines_by_word, all_lines, version=1)
+    assert len(all_lines) > 100
+
+    for line in all_lines[::10]:
+        entry = engine.build_entry(line.last_word)
+        found = server.find_rhyming_verses(line.last_word, entry, set(), "", line.syllables, snap=snap)
+        scores = [max(1.0 - abs(c.syllables - line.syllables) * 0.08, 0.5)
+                  for c in lines_by_d2.get(line.tail_d2, ()) if c.last_word != line.last_word]
+        best = sorted(scores, reverse=True)[:5]
+        assert [v.score for v in found][:len(best)] == best
+        assert [v.score for v in found] == sorted((v.score for v in found), reverse=True)
+    assert set(lines_by_d2) == {line.tail_d2 for line in all_lines}  # no empty buckets were created
+
+
+def test_batch_generate_keeps_order(client):
+    verses = ["Idę przez miasto nocą", "kawa", "", "Płynie rzeka nocą", "kawa"]
+    r = client.post("/generate/batch", json={"verses": verses, "seen": []})
+    assert r.status_code == 200
+    results = r.json()["results"]
+    assert len(results) == len(verses)
+    assert results[0]["result"]["original_word"] == "nocą"
+    assert results[1]["result"]["mode"] == "word"
+    assert results[2] == {"result": None, "error": "Empty input"}
+    assert results[4]["result"] == results[1]["result"]
+
+    single = client.post("/generate", json={"verse": "kawa"}).json()
+    assert results[1]["result"] == single
+
+
+def test_stream_sends_tiers_then_result(client):
+    server.WORD_MODE_CACHE.clear()
+    r = client.post("/generate/stream", json={"verse": "kawa"})
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in r.text.splitlines()]
+    assert [e.get("tier") for e in events] == ["PERFECT", "NEAR", "ASSONANCE", None]
+    assert list(events[0]["words"]) == ["PERFECT"]
+    assert events[-1]["event"] == "result"
+
+    final = client.post("/generate", json={"verse": "kawa"}).json()
+    assert events[-1]["result"] == final
+    assert events[0]["words"]["PERFECT"] == final["words"]["PERFECT"]
+    assert events[2]["words"]["DOMINANT"] == final["words"]["DOMINANT"]
+    assert events[2]["words"]["NEAR"] == final["words"]["NEAR"]
+
+    sse = client.post("/generate/stream", json={"verse": "kawa"}, headers={"Accept": "text/event-stream"})
+    assert sse.headers["content-type"].startswith("text/event-stream")
+    assert sse.text.startswith("event: result\ndata: ")  # cached now
+
+
+def test_engine_tiers_match_find_candidates():
+    for word in ("kawa", "granie", "noce"):
+        tiers = list(server.ENGINE.iter_tiers(word, k_per_grade=15, priority_by_id=server.WORD_PRIORITY))
+        assert [t for t, _ in tiers] == ["PERFECT", "NEAR", "ASSONANCE"]
+        assert tiers[-1][1] == server.ENGINE.find_candidates(
+            word, k_per_grade=15, priority_by_id=server.WORD_PRIORITY)
+
+
+def test_deep_rhymes_endpoint(client):
+    r = client.post("/generate/deep", json={"verse": "Moje kochanie", "k": 5, "min_depth": 3})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["original_word"] == "kochanie"
+    assert body["rhymes"] and all(item["depth"] >= 3 for item in body["rhymes"])
+    assert body["rhymes"][0]["tail"].endswith("anie")
+    assert client.post("/generate/deep", json={"verse": "kochanie", "k": 0}).status_code == 400
+    assert client.post("/generate/deep", json={"verse": "bzz", "min_depth": 0}).status_code == 400
+
+
+def test_slant_rhymes_endpoint(client):
+    r = client.post("/generate/slant", json={"verse": "Mój kot", "k": 10, "max_distance": 1})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["original_word"] == "kot"
+    assert body["rhymes"] and all(item["distance"] <= 1 and item["tail"] != "ot" for item in body["rhymes"])
+    assert "kod" in [item["word"] for item in body["rhymes"]]
+    assert client.post("/generate/slant", json={"verse": "kot", "max_distance": 9}).status_code == 400
+
+
+def test_stanza_endpoint(client):
+    from polish_rhyme_util import verify_rhyme_scheme
+
+    r = client.post("/generate/stanza", json={"scheme": "abab", "syllables": 10, "n": 3})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["scheme"] == "ABAB" and body["complete"]
+    assert len(body["stanzas"]) == 3
+    for stanza in body["stanzas"]:
+        assert verify_rhyme_scheme([line["line"] for line in stanza["lines"]], "ABAB")[0]
+
+    seeded = client.post("/generate/stanza", json={"scheme": "AABB", "seed": ["Idę przez miasto nocą"]}).json()
+    assert seeded["stanzas"] and all(s["lines"][0] == {
+        "line": "Idę przez miasto nocą", "rhyme_word": "nocą", "letter": "A", "syllables": 7, "seed": True,
+    } for s in seeded["stanzas"])
+    assert seeded["syllables"] == 7
+    assert client.post("/generate/stanza", json={"scheme": "A1"}).status_code == 400
+    assert client.post("/generate/stanza", json={"scheme": "AB", "seed": ["a b", "c d"]}).status_code == 400
+
+
+def test_verify_endpoint(client):
+    stanza = ["Kot na kanapie cicho pilnuje", "Myszka pod stołem już to czuje",
+              "Miseczka z mlekiem stoi przy ścianie", "Czeka cierpliwie na swe śniadanie"]
+    r = client.post("/verify", json={"stanzas": [stanza], "songs": ["\n".join(stanza + ["", *stanza[:2]])],
+                                     "scheme": "aabb"})
+    assert r.status_code == 200
+    body = r.json()
+    assert (body["scheme"], body["matched"], body["total"]) == ("AABB", 2, 3)
+    assert [(item["match"], item["song"]) for item in body["results"]] == [(True, None), (True, 0), (False, 0)]
+    assert body["results"][0]["suffixes"] == ["uje", "uje", "anie", "anie"]
+    assert body["results"][0]["syllables"] == [10, 9, 11, 10]
+    assert body["results"][2]["syllables"] == [10, 9]
+    assert client.post("/verify", json={"stanzas": [stanza], "scheme": "A-B"}).status_code == 400
+    long_line = "la " * server.MAX_INPUT_LENGTH
+    assert client.post("/verify", json={"stanzas": [stanza + [long_line]]}).status_code == 400
+    assert client.post("/verify", json={"songs": ["\n".join(stanza[:3] + [long_line])]}).status_code == 400
+
+
+def test_metrics_endpoint_reports_spans_and_caches(client):
+    client.post("/generate", json={"verse": "sowa"})
+    client.post("/generate", json={"verse": "Idę przez miasto nocą"})
+    r = client.get("/metrics")
+    assert r.status_code == 200 and r.headers["content-type"].startswith("text/plain")
+    text = r.text
+    for name in ("normalize", "find_candidates_perfect", "find_candidates_assonance", "score_lookup",
+                 "corpus_lookup", "syllables", "serialize"):
+        assert f'rymowanka_span_seconds_count{{span="{name}"}}' in text
+    assert 'rymowanka_request_seconds_count{route="/generate"}' in text
+    assert 'rymowanka_cache_hits_total{cache="syllables"}' in text
+    assert 'rymowanka_tier_candidates_bucket{tier="PERFECT",le="+Inf"}' in text
+    assert 'rymowanka_cache_hit_rate{cache="word_mode"}' in text
+    assert 'rymowanka_corpus_buckets{index="d2"}' in text
+
+
+def test_saturated_executor_returns_503(client, monkeypatch):
+    busy = server.EngineExecutor("inline", max_pending=1)
+    busy.pending = 1
+    monkeypatch.setattr(server, "EXECUTOR", busy)
+    r = client.post("/generate", json={"verse": "kawa"})
+    assert r.status_code == 503
+    assert r.headers["retry-after"] == str(server.EXECUTOR_RETRY_AFTER)
+    r = client.post("/generate/stream", json={"verse": "kawa"})
+    assert r.status_code == 503 and r.headers["retry-after"] == str(server.EXECUTOR_RETRY_AFTER)
+    assert client.get("/").json()["executor"]["rejected"] == 2
+
+    # A stream holds its slot until the body is sent
+    busy.pending = 0
+    assert client.post("/generate/stream", json={"verse": "kawa"}).status_code == 200
+    assert busy.pending == 0
+
+
+def test_sqlite_rate_limit_waits_off_the_event_loop(tmp_path, monkeypatch):
+    # Another worker holds the bucket file's write lock: every check waits out
+    # the busy timeout, then lets the request through
+    path = str(tmp_path / "buckets.sqlite3")
+    limiter = RateLimiter(60, SQLiteBackend(path, timeout=0.3))
+    monkeypatch.setattr(server, "RATE_LIMITER", limiter)
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+
+    async def burst(n):
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            start = time.perf_counter()
+            responses = await asyncio.gather(*(ac.get("/") for _ in range(n)))
+            return time.perf_counter() - start, responses
+
+    try:
+        elapsed, responses = asyncio.run(burst(4))
+    finally:
+        other.execute("ROLLBACK")
+        other.close()
+    assert [r.status_code for r in responses] == [200] * 4 and limiter.backend.errors == 4
+    assert elapsed < 0.9  # serialized on the event loop: 4 x 0.3s
+
+
+@pytest.fixture
+def sources(tmp_path, monkeypatch):
+    """Small vocabulary / scores / lyrics files; the live snapshot is restored afterwards."""
+    vocab, scores, lyrics = tmp_path / "words.txt", tmp_path / "scores.json", tmp_path / "lyrics.txt"
+    vocab.write_text("krowa\nsowa\nkawa\n", encoding="utf-8")
+    scores.write_text(json.dumps({"sowa": {"s": 2.0, "f": ["rare"]}}), encoding="utf-8")
+    lyrics.write_text("Idzie sobie krowa\nLeci nocą sowa\nPiję rano kawa\n", encoding="utf-8")
+    monkeypatch.setattr(config, "VOCABULARY_PATH", str(vocab))
+    monkeypatch.setattr(config, "PHONETIC_INDEX_PATH", str(tmp_path / "missing.bin"))
+    monkeypatch.setattr(config, "SCORES_PATH", str(scores))
+    monkeypatch.setattr(config, "SCORE_TABLE_PATH", str(tmp_path / "missing.bin"))
+    monkeypatch.setattr(server, "LYRICS_PATH", str(lyrics))
+    live = server.snapshot()
+    yield vocab, scores, lyrics
+    server.install_snapshot(live)
+
+
+def test_reload_swaps_snapshot(sources):
+    vocab, scores, lyrics = sources
+    server.reload_sources()
+    before = server.SNAPSHOT
+    assert set(before.engine.word_map) == {"krowa", "sowa", "kawa"}
+    assert len(before.all_lines) == 3
+
+    vocab.write_text("krowa\nsowa\nkawa\ngłowa\n", encoding="utf-8")
+    lyrics.write_text("Idzie sobie krowa\nPiję rano kawa\nBoli mnie głowa\n", encoding="utf-8")
+    report = server.reload_sources()
+    after = server.SNAPSHOT
+    assert report["vocabulary"]["added"] == 1 and report["lyrics"] == {"added": 1, "removed": 1, "lines": 3}
+    assert after.version == before.version + 1
+
+    # The old snapshot is untouched; the new one matches a fresh load
+    assert "głowa" not in before.engine.word_map and len(before.all_lines) == 3
+    fresh_d2, fresh_word, fresh_lines = server.load_lyrics_corpus(str(lyrics), after.engine)
+    assert after.all_lines == fresh_lines
+    for got, want in ((after.lines_by_d2, fresh_d2), (after.lines_by_word, fresh_word)):
+        assert {k: b.lines for k, b in got.items()} == {k: b.lines for k, b in want.items()}
+    assert {w for w, g, _ in after.engine.find_candidates("krowa") if g == "PERFECT"} == {"głowa", "sowa"}
+    assert server.word_flags("sowa") == ["rare"]
+
+
+def test_admin_reload_requires_token(client, sources, monkeypatch):
+    monkeypatch.setattr(server, "ADMIN_TOKEN", "")
+    assert client.post("/admin/reload", json={}, headers={"X-Admin-Token": ""}).status_code == 403
+    monkeypatch.setattr(server, "ADMIN_TOKEN", "secret")
+    assert client.post("/admin/reload", json={}, headers={"X-Admin-Token": "wrong"}).status_code == 403
+    r = client.post("/admin/reload", json={"sources": ["scores"]}, headers={"X-Admin-Token": "secret"})
+    assert r.status_code == 200
+    assert r.json() == {"reloaded": {"scores": {"words": 1}}}
+    assert client.post("/admin/reload", json={"sources": ["nope"]}, headers={"X-Admin-Token": "secret"}).status_code == 400
+
+
+def test_imports_are_lazy_and_warmup_reports_status():
+    # Fresh interpreter: nothing may be loaded by importing the modules
+    script = """
+import config, polish_rhyme_util, server
+from fastapi.testclient import TestClient
+assert not config.loaded() and server.SNAPSHOT is None
+assert polish_rhyme_util.count_syllables("kochanie") == 3 and not config.loaded()
+client = TestClient(server.app)
+assert client.get("/").json()["status"] == "idle"
+
+# A failed warm-up is reported, then retried
+load = server._load_snapshot
+def broken():
+    raise OSError("no vocabulary")
+server._load_snapshot = broken
+server.start_warmup().join()
+r = client.get("/")
+assert r.status_code == 503 and r.json()["status"] == "failed" and r.json()["error"] == "OSError: no vocabulary"
+server._load_snapshot = load
+server.start_warmup().join()
+assert client.get("/").json()["status"] == "online" and config.loaded()
+assert server.ENGINE is config.ENGINE is server.snapshot().engine
+"""
+    out = subprocess.run([sys.executable, "-c", script], cwd=server.config.BASE_DIR, capture_output=True, text=True)
+    assert out.returncode == 0, out.stderr
@@ -0,0 +1,97 @@
+import json
+import os
+import time
+
+import pytest
+
+from corpus import load_lyrics_corpus, make_line
+from phonetic_engine import PhoneticEngine
+from polish_rhyme_util import verify_rhyme_scheme
+from stanza_solver import StanzaSolver, parse_scheme
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.fixture(scope="module")
+def blueprints():
+    with open(os.path.join(BASE_DIR, "blueprint_tests.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope="module")
+def solver(blueprints, tmp_path_factory):
+    # Every blueprint line as the corpus
+    path = tmp_path_factory.mktemp("stanza") / "lines.txt"
+    path.write_text("\n".join(line for stanzas in blueprints.values() for stanza in stanzas for line in stanza),
+                    encoding="utf-8")
+    lines_by_d2, _, _ = load_lyrics_corpus(str(path), PhoneticEngine())
+    return StanzaSolver(lines_by_d2)
+
+
+def check(stanza, scheme, syllables=None, tolerance=2):
+    texts = [line.text for line, _, _ in stanza]
+    assert verify_rhyme_scheme(texts, scheme)[0]
+    assert "".join(letter for _, letter, _ in stanza) == scheme
+    assert len({line.last_word for line, _, _ in stanza}) == len(stanza)
+    if syllables is not None:
+        assert all(abs(line.syllables - syllables) <= tolerance for line, _, is_seed in stanza if not is_seed)
+
+
+def test_parse_scheme():
+    assert parse_scheme(" abba ") == {"A": [0, 3], "B": [1, 2]}
+    with pytest.raises(ValueError):
+        parse_scheme("AA-BB")
+
+
+def test_solves_blueprint_schemes(solver, blueprints):
+    engine = PhoneticEngine()
+    for scheme, stanzas in blueprints.items():
+        found, complete = solver.solve(scheme, syllables=10, n=5)
+        assert complete and len(found) == 5
+        assert [score for score, _ in found] == sorted((score for score, _ in found), reverse=True)
+        for _, stanza in found:
+            check(stanza, scheme, syllables=10)
+
+        # Continue every blueprint stanza from its first line, then its first two
+        solved = 0
+        for blueprint in stanzas:
+            for n_seeds in (1, 2):
+                seeds = [make_line(text, engine) for text in blueprint[:n_seeds]]
+                t0 = time.perf_counter()
+                found, complete = solver.solve(scheme, seeds=seeds, n=3, deadline=t0 + 0.5)
+                assert complete and time.perf_counter() - t0 < 0.5
+                for _, stanza in found:
+                    assert [line for line, _, _ in stanza[:n_seeds]] == seeds
+                    check(stanza, scheme)
+                solved += bool(found)
+        assert solved >= 0.8 * 2 * len(stanzas)
+
+
+def test_deadline_and_impossible_seeds(solver, blueprints):
+    found, complete = solver.solve("ABAB", n=5, deadline=time.perf_counter() - 1)
+    assert not complete
+    engine = PhoneticEngine()
+    first = make_line(blueprints["AABB"][0][0], engine)
+    # A and B may not share a rhyme
+    assert solver.solve("ABAB", seeds=[first, first]) == ([], True)
+    with pytest.raises(ValueError):
+        solver.solve("AA", seeds=[first, first])
+
+
+def test_tiny_budget_on_a_large_corpus(tmp_path):
+    # 20k lines: gathering every rhyme class's lines takes longer than the budget
+    with open(os.path.join(BASE_DIR, "words_pl.txt"), "r", encoding="utf-8") as f:
+        words = [w.strip() for w in f if len(w.strip()) > 2][:20000]
+    with open(os.path.join(BASE_DIR, "lyrics_corrected.txt"), "r", encoding="utf-8") as f:
+        lyrics = [line.split()[:-1] for line in f if len(line.split()) > 2]
+    path = tmp_path / "lines.txt"
+    path.write_text("\n".join(" ".join(lyrics[i % len(lyrics)] + [w]) for i, w in enumerate(words)),
+                    encoding="utf-8")
+    lines_by_d2, _, _ = load_lyrics_corpus(str(path), PhoneticEngine())
+    solver = StanzaSolver(lines_by_d2)
+
+    found, complete = solver.solve("ABCDEFGH", syllables=10, n=5)
+    assert complete and len(found) == 5
+    t0 = time.perf_counter()
+    assert solver.solve("ABCDEFGH", syllables=10, n=5, deadline=t0 + 0.005) == ([], False)
+    assert time.perf_counter() - t0 < 0.05
@@ -0,0 +1,38 @@
+from phonetic_engine import PhoneticEngine
+from syllables import SyllableCounter
+
+
+def reference(text):
+    # The rule spelled out without the memo
+    engine = PhoneticEngine()
+    total = 0
+    for word in text.split():
+        clean = "".join(ch for ch in word.lower() if ch.isalnum() or ch == "_")
+        if clean:
+            total += max(len(engine.get_vowel_positions(engine.normalize(clean))), 1)
+    return total
+
+
+def test_counts():
+    counter = SyllableCounter()
+    assert [counter.word(w) for w in ("kochanie", "Piosenka,", "nauka", "w", "—", "")] == [3, 3, 3, 1, 0, 0]
+    lines = ["Srebrzysty księżyc płynie po niebie", "Wiatr cicho śpiewa starą piosenkę", "", "... !"]
+    assert counter.lines(lines) == [counter.line(line) for line in lines] == list(map(reference, lines))
+    assert counter.lines([]) == []
+
+
+def test_memo_is_bounded():
+    counter = SyllableCounter(max_words=3)
+    assert counter.lines(["ala ma kota", "ala ma psa"]) == [5, 4]
+    assert (counter.misses, counter.hits, counter.evictions, len(counter)) == (4, 0, 1, 3)
+    assert counter.line("ma psa") == 2  # "ala" was evicted first
+    assert counter.word("ala") == 2  # evicts "kota", the least recently used
+    assert counter.word("kota") == 2
+    stats = counter.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["hit_rate"]) == (2, 6, 3, 0.25)
+    # One batch larger than the memo still counts every line
+    words = [f"słowo{i}" for i in range(10)]
+    assert counter.lines([" ".join(words)] * 2) == [20, 20] and len(counter) == 3
+
+    off = SyllableCounter(max_words=0)
+    assert off.line("ala ma kota") == 5 and len(off) == 0
@@ -1,13 +1,12 @@
 import re
-from polish_rhyme_util import count_syllables, get_phonetic_suffix
+from polish_rhyme_util import count_line_syllables, get_phonetic_suffix
 
 def verify_stanza(lines, target_syllables=11):
     print(f"{'Line':<40} | {'Syllables':<10} | {'Rhyme Suffix'}")
     print("-" * 70)
-    for line in lines:
+    for line, s_count in zip(lines, count_line_syllables(lines)):
         words = line.split()
         last_word = re.sub(r'[^\w\s]', '', words[-1])
-        s_count = sum(count_syllables(w) for w in words)
         rhyme = get_phonetic_suffix(last_word)
         print(f"{line:<40} | {s_count:<10} | {rhyme}")
 
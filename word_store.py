@@ -0,0 +1,250 @@
+"""
+Columnar, interned storage for PhoneticEngine's vocabulary and rhyme indexes.
+
+Instead of one WordEntry namedtuple per word referenced from a dict and three
+dict-of-lists, every word is an integer id into flat arrays:
+
+    strings   uint32 offsets[n + 1] + utf-8 blob (every distinct string once)
+    words     uint32 string ids per column, uint8 syllable counts
+    indexes   per index: sorted key string ids, uint32 offsets, uint32 word ids,
+              plus the bucket's originals ("\\n"-joined) and syllable counts so
+              find_candidates decodes a whole bucket in one call
+
+The same sections back both the in-memory build (`WordStore.from_entries`) and
+the mmap-ed artifact (`phonetic_index.MappedIndex`).
+"""
+from array import array
+from collections import namedtuple
+from collections.abc import Mapping
+from itertools import accumulate
+
+WordEntry = namedtuple('WordEntry', ['original', 'normalized', 'vowels', 'tail_d2', 'tail_d1', 'vowel_seq'])
+
+WORD_COLUMNS = ("original", "normalized", "tail_d2", "tail_d1", "vowel_seq")
+INDEXES = ("d2", "d1", "vowels")
+INDEX_KEY_COLUMNS = {"d2": "tail_d2", "d1": "tail_d1", "vowels": "vowel_seq"}
+
+SECTIONS = (
+    ("str_offsets", "I"),
+    ("str_data", "B"),
+    *((f"word_{col}", "I") for col in WORD_COLUMNS),
+    ("word_vowels", "B"),
+    ("word_order", "I"),  # word ids sorted by original, for word_map lookups
+    *(
+        (f"{name}_{part}", fmt)
+        for name in INDEXES
+        for part, fmt in (
+            ("keys", "I"), ("offsets", "I"), ("postings", "I"),
+            ("text_offsets", "I"), ("text", "B"), ("vowels", "B"),
+        )
+    ),
+)
+
+
+class WordStore:
+    """Word table + tail indexes over flat buffers (arrays or memoryviews)."""
+
+    def __init__(self, sections: dict):
+        for name, _ in SECTIONS:
+            setattr(self, f"_{name}", sections[name])
+        self.word_map = _WordMapView(self)
+        self.index_d2, self.index_d1, self.index_vowels = (_PostingView(self, name) for name in INDEXES)
+
+    @classmethod
+    def from_entries(cls, entries) -> "WordStore":
+        """Build from an iterable of WordEntry rows (streamed, duplicates skipped)."""
+        strings = {}
+        intern = strings.setdefault  # string -> id, new strings numbered in order
+
+        sections = {f"word_{col}": array("I") for col in WORD_COLUMNS}
+        sections["word_vowels"] = array("B")
+        word_original, word_normalized, word_tail_d2, word_tail_d1, word_vowel_seq = (
+            sections[f"word_{col}"] for col in WORD_COLUMNS
+        )
+        syllables = sections["word_vowels"]
+        buckets = {name: {} for name in INDEXES}
+        index_d2, index_d1, index_vowels = (buckets[name] for name in INDEXES)
+        seen = set()
+
+        # Unrolled over the columns and indexes: this loop runs once per word
+        for original, normalized, vowels, tail_d2, tail_d1, vowel_seq in entries:
+            if original in seen:
+                continue
+            seen.add(original)
+            wid = len(syllables)
+            word_original.append(intern(original, len(strings)))
+            word_normalized.append(intern(normalized, len(strings)))
+            word_tail_d2.append(intern(tail_d2, len(strings)))
+            word_tail_d1.append(intern(tail_d1, len(strings)))
+            word_vowel_seq.append(intern(vowel_seq, len(strings)))
+            syllables.append(vowels if vowels < 255 else 255)
+            for index, key in ((index_d2, tail_d2), (index_d1, tail_d1), (index_vowels, vowel_seq)):
+                # Words without vowels have no assonance key
+                if not key and index is index_vowels:
+                    continue
+                bucket = index.get(key)
+                if bucket is None:
+                    bucket = index[key] = array("I")
+                bucket.append(wid)
+        del seen
+
+        string_list = list(strings)  # dicts keep insertion order == string id order
+        originals = list(map(string_list.__getitem__, word_original))
+        sections["word_order"] = array("I", sorted(range(len(originals)), key=originals.__getitem__))
+
+        for name in INDEXES:
+            keys = sorted(buckets[name])
+            offsets, postings = array("I", [0]), array("I")
+            text_offsets, text, vowels = array("I", [0]), bytearray(), array("B")
+            for key in keys:
+                bucket = buckets[name].pop(key)
+                postings.extend(bucket)
+                offsets.append(len(postings))
+                text += "\n".join(map(originals.__getitem__, bucket)).encode("utf-8")
+                text_offsets.append(len(text))
+                vowels.extend(map(syllables.__getitem__, bucket))
+            sections[f"{name}_keys"] = array("I", map(strings.__getitem__, keys))
+            sections[f"{name}_offsets"] = offsets
+            sections[f"{name}_postings"] = postings
+            sections[f"{name}_text_offsets"] = text_offsets
+            sections[f"{name}_text"] = bytes(text)
+            sections[f"{name}_vowels"] = vowels
+
+        str_offsets = array("I", [0])
+        str_offsets.extend(accumulate(map(len, map(str.encode, string_list))))
+        sections["str_offsets"] = str_offsets
+        sections["str_data"] = "".join(string_list).encode("utf-8")
+        return cls(sections)
+
+    def sections(self) -> dict:
+        return {name: getattr(self, f"_{name}") for name, _ in SECTIONS}
+
+    def __len__(self):
+        return len(self._word_original)
+
+    def raw_string(self, sid: int) -> bytes:
+        return bytes(self._str_data[self._str_offsets[sid]:self._str_offsets[sid + 1]])
+
+    def string(self, sid: int) -> str:
+        return str(self._str_data[self._str_offsets[sid]:self._str_offsets[sid + 1]], "utf-8")
+
+    def entry(self, wid: int) -> WordEntry:
+        s = self.string
+        return WordEntry(
+            s(self._word_original[wid]), s(self._word_normalized[wid]), self._word_vowels[wid],
+            s(self._word_tail_d2[wid]), s(self._word_tail_d1[wid]), s(self._word_vowel_seq[wid]),
+        )
+
+    def entries(self):
+        return (self.entry(wid) for wid in range(len(self)))
+
+    def columns(self) -> tuple:
+        """
+        Every row as parallel lists (original, normalized, vowels, tail_d2,
+        tail_d1, vowel_seq); each distinct string is decoded once.
+        """
+        table = list(map(self.string, range(len(self._str_offsets) - 1)))
+        decoded = {col: list(map(table.__getitem__, getattr(self, f"_word_{col}"))) for col in WORD_COLUMNS}
+        return (
+            decoded["original"], decoded["normalized"], list(self._word_vowels),
+            decoded["tail_d2"], decoded["tail_d1"], decoded["vowel_seq"],
+        )
+
+    def find(self, sorted_ids, key: str, key_fn) -> int:
+        """Binary-search `sorted_ids` for `key`; returns the slot or -1."""
+        raw = key.encode("utf-8")
+        lo, hi = 0, len(sorted_ids)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if key_fn(sorted_ids[mid]) < raw:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(sorted_ids) and key_fn(sorted_ids[lo]) == raw:
+            return lo
+        return -1
+
+    def nbytes(self) -> int:
+        """Total size of the backing buffers."""
+        return sum(memoryview(buf).nbytes for buf in self.sections().values())
+
+
+class _PostingView(Mapping):
+    """tail -> list[WordEntry], resolved lazily from the flat arrays."""
+
+    def __init__(self, store: WordStore, name: str):
+        self._store = store
+        self._keys = getattr(store, f"_{name}_keys")
+        self._offsets = getattr(store, f"_{name}_offsets")
+        self._postings = getattr(store, f"_{name}_postings")
+        self._text_offsets = getattr(store, f"_{name}_text_offsets")
+        self._text = getattr(store, f"_{name}_text")
+        self._vowels = getattr(store, f"_{name}_vowels")
+
+    def _slot(self, key: str) -> int:
+        return self._store.find(self._keys, key, self._store.raw_string)
+
+    def word_ids(self, key: str):
+        slot = self._slot(key)
+        if slot < 0:
+            return None
+        return self._postings[self._offsets[slot]:self._offsets[slot + 1]]
+
+    def __getitem__(self, key):
+        ids = self.word_ids(key)
+        if ids is None:
+            raise KeyError(key)
+        return [self._store.entry(wid) for wid in ids]
+
+    def candidates(self, key: str) -> list:
+        """(original, syllable count) pairs for one bucket."""
+        slot = self._slot(key)
+        if slot < 0:
+            return []
+        words = str(self._text[self._text_offsets[slot]:self._text_offsets[slot + 1]], "utf-8").split("\n")
+        vowels = self._vowels[self._offsets[slot]:self._offsets[slot + 1]]
+        return list(zip(words, vowels))
+
+    def candidate_ids(self, key: str) -> list:
+        """(original, syllable count, word id) triples for one bucket."""
+        slot = self._slot(key)
+        if slot < 0:
+            return []
+        start, end = self._offsets[slot], self._offsets[slot + 1]
+        words = str(self._text[self._text_offsets[slot]:self._text_offsets[slot + 1]], "utf-8").split("\n")
+        return list(zip(words, self._vowels[start:end], self._postings[start:end]))
+
+    def __iter__(self):
+        return (self._store.string(sid) for sid in self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+
+class _WordMapView(Mapping):
+    """original -> WordEntry."""
+
+    def __init__(self, store: WordStore):
+        self._store = store
+
+    def _original(self, wid):
+        return self._store.raw_string(self._store._word_original[wid])
+
+    def word(self, wid: int) -> str:
+        return self._store.string(self._store._word_original[wid])
+
+    def word_id(self, word: str) -> int:
+        slot = self._store.find(self._store._word_order, word, self._original)
+        return self._store._word_order[slot] if slot >= 0 else -1
+
+    def __getitem__(self, word):
+        wid = self.word_id(word)
+        if wid < 0:
+            raise KeyError(word)
+        return self._store.entry(wid)
+
+    def __iter__(self):
+        return (self._store.string(sid) for sid in self._store._word_original)
+
+    def __len__(self):
+        return len(self._store)